@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from pathlib import Path
+from kenya_dashboard.buckets import fixed_bins
+from kenya_dashboard.data import levels, load_gt_monthly, load_rtm_monthly
 
 # ──────── CONFIG ────────
 NAVY_BG = "#0F1C2E"
@@ -24,38 +25,25 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-# ──────── FILE PATHS ────────
-GT_PATH = Path("GT_Monthly_Clustered_2_Standardized.csv")
-RTM_PATH = Path("RTM_MONTH DATA.csv")
-
-@st.cache_data
-def load_data(gt_path, rtm_path):
-    gt = pd.read_csv(gt_path)
-    rtm = pd.read_csv(rtm_path)
-    for df in (gt, rtm):
-        for col in ("REGION_NAME", "BRAND", "SKU"):
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.strip()
-    return gt, rtm
-
-gt_df, rtm_df = load_data(GT_PATH, RTM_PATH)
+# ──────── DATA (shared cached loaders) ────────
+gt_df, rtm_df = load_gt_monthly(), load_rtm_monthly()
 
 # ──────── FILTERS ────────
 f1, f2, f3, f4, f5 = st.columns([1, 1, 1, 1, 1])
-markets = sorted(set(gt_df["REGION_NAME"]) | set(rtm_df["REGION_NAME"]))
-brands = sorted(set(gt_df["BRAND"]) | set(rtm_df["BRAND"]))
+markets = sorted(set(levels(gt_df, "REGION_NAME")) | set(levels(rtm_df, "REGION_NAME")))
+brands = sorted(set(levels(gt_df, "BRAND")) | set(levels(rtm_df, "BRAND")))
 
 brand_sel = f2.selectbox("Brand", ["All"] + brands, index=0)
 
 # SKU options depend on brand selected
 if brand_sel == "All":
-    skus = sorted(set(gt_df["SKU"]) | set(rtm_df["SKU"]))
+    skus = sorted(set(levels(gt_df, "SKU")) | set(levels(rtm_df, "SKU")))
 else:
-    skus = sorted(set(gt_df[gt_df["BRAND"] == brand_sel]["SKU"]).union(
-                    set(rtm_df[rtm_df["BRAND"] == brand_sel]["SKU"])))
+    skus = sorted(set(levels(gt_df[gt_df["BRAND"] == brand_sel], "SKU")).union(
+                    levels(rtm_df[rtm_df["BRAND"] == brand_sel], "SKU")))
 
 market_sel = f1.selectbox("Market", ["All"] + markets, index=0)
-clusters = sorted(gt_df["Cluster"].dropna().unique())
+clusters = levels(gt_df, "Cluster")
 cluster_sel = f3.selectbox("Cluster", ["All"] + clusters, index=0)
 sku_sel = f4.selectbox("SKU Variant", ["All"] + skus, index=0)
 period_map = {"1 Month": 12}
@@ -89,7 +77,7 @@ with c1:
     if gt_filt.empty:
         st.info("No GT data for chosen filters.")
     else:
-        vol = gt_filt.groupby("Cluster")["VOLUME"].sum().sort_values()
+        vol = gt_filt.groupby("Cluster", observed=True)["VOLUME"].sum().sort_values()
         pct = (vol / vol.sum() * 100).round(1)
         df_bars = pct.reset_index().rename(columns={"VOLUME": "Percent"})
         fig = px.bar(df_bars, x="Percent", y="Cluster", orientation="h", text="Percent", color_discrete_sequence=["#2BB06C"])
@@ -109,16 +97,16 @@ with c2:
         if prices.empty or prices.nunique() < 2:
             st.info("Not enough variation in price data to generate bins.")
         else:
-            bins = np.linspace(prices.min(), prices.max(), 6)
-            bins = np.unique(bins)
+            idx, bins = fixed_bins(rtm_filt["AVERAGE_BASE_PRICE"].to_numpy(), 5)
             if len(bins) <= 1:
                 st.info("Price range is constant; cannot create bins.")
             else:
                 labels = [f"{int(bins[i])} – {int(bins[i+1])}" for i in range(len(bins) - 1)]
-                rtm_filt["Price-Range"] = pd.cut(prices, bins=bins, labels=labels, include_lowest=True)
-                vol = rtm_filt.groupby("Price-Range")["VOLUME"].sum()
-                pct = (vol / vol.sum() * 100).round(1)
-                df_px = pct.reset_index().rename(columns={"VOLUME": "Percent"})
+                hit = idx >= 0
+                vol = np.bincount(idx[hit], weights=rtm_filt["VOLUME"].to_numpy()[hit],
+                                  minlength=len(labels))
+                df_px = pd.DataFrame({"Price-Range": labels,
+                                      "Percent": (vol / vol.sum() * 100).round(1)})
                 fig = px.bar(df_px, x="Percent", y="Price-Range", orientation="h", text="Percent",
                              color_discrete_sequence=["#F04E4E"])
                 fig.update_traces(texttemplate="%{text:.1f}%")
@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json, re
+
+from kenya_dashboard.data import county_geo_source, levels, load_opportunity, load_point_density
 
 # ── COLOURS ───────────────────────────────────────────
 NAVY_BG  = "#0F1C2E"
@@ -36,54 +36,23 @@ st.markdown(
 
 st.title("📍 Kenya County Opportunity Dashboard")
 
-# ── HELPER ----------------------------------------------------------
-def detect(patterns, cols):
-    norm = {c: re.sub(r"[\s_]", "", c.lower()) for c in cols}
-    for col, slug in norm.items():
-        if any(re.search(p, slug) for p in patterns):
-            return col
-    return None
-
 # ── LOAD DATA -------------------------------------------------------
-@st.cache_data
-def load_counties():
-    df  = pd.read_csv("Merged_Data_with_Opportunity_Score.csv")
-    geo = json.load(open("kenya.geojson", "r", encoding="utf-8"))
-    for f in geo["features"]:
-        nm = f["properties"].get("COUNTY_NAM") or ""
-        f["properties"]["COUNTY_KEY"] = nm.title().strip()
-    return df, geo
-
-@st.cache_data
-def load_points():
-    raw  = pd.read_excel("rtm_lat_log.xlsx")
-    cols = list(raw.columns)
-    lat  = detect([r"^lat"], cols)
-    lon  = detect([r"(lon|lng)"], cols)
-    dist = detect([r"distrib|dealer|partner|outlet"], cols)
-    if None in (lat, lon, dist):
-        st.stop()
-    pts            = raw[[dist, lat, lon]].copy()
-    pts.columns    = ["Distributor", "Latitude", "Longitude"]
-    pts["Latitude"]= pd.to_numeric(pts["Latitude"],  errors="coerce")
-    pts["Longitude"]=pd.to_numeric(pts["Longitude"], errors="coerce")
-    return pts.dropna(subset=["Latitude","Longitude"])
-
-df,  geojson = load_counties()
-pts_df       = load_points()
+df      = load_opportunity()
+geojson = county_geo_source(zoom=5.5)
+dens    = load_point_density(5.5)     # hex-binned outlets
 
 # ── COMPACT FILTER ROW ----------------------------------------------
 f1, f2 = st.columns([1, 5])           # narrow cell for filter
 with f1:
-    brands = ["All"] + sorted(df["BRAND"].dropna().unique())
+    brands = ["All"] + levels(df, "BRAND")
     choose = st.selectbox("Select Brand", brands)
 
 view_df = df if choose == "All" else df[df["BRAND"] == choose]
 
 # ── CHOROPLETH -------------------------------------------------------
-county_avg = (view_df.groupby("County", as_index=False)["AWS"]
+county_avg = (view_df.groupby("COUNTY_KEY", as_index=False, observed=True)["AWS"]
                        .mean()
-                       .assign(County=lambda d: d["County"].str.title().str.strip()))
+                       .rename(columns={"COUNTY_KEY": "County"}))
 
 fig = px.choropleth_mapbox(
     county_avg, geojson=geojson,
@@ -95,8 +64,8 @@ fig = px.choropleth_mapbox(
     opacity=0.9, height=MAP_TABLE_HEIGHT)
 
 fig.add_trace(go.Densitymapbox(
-    lat=pts_df["Latitude"], lon=pts_df["Longitude"],
-    z=[1]*len(pts_df), radius=14, opacity=0.7,
+    lat=dens["Latitude"], lon=dens["Longitude"],
+    z=dens["Intensity"], zmin=0, zmax=dens["Intensity"].max(), radius=14, opacity=0.7,
     colorscale=[[0,"rgba(0,120,255,0.25)"],
                 [0.3,"rgba(0,120,255,0.55)"],
                 [1,"rgba(0,120,255,0.9)"]],
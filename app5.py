@@ -1,6 +1,7 @@
 import re
 import pandas as pd
 import streamlit as st
+from kenya_dashboard.data import load_gt
 
 # ----------------------------------------------------------------------
 # 1️⃣  PAGE CONFIG & GLOBAL STYLES
@@ -77,10 +78,6 @@ USHINDI Laundry Bar is severely underperforming in Nairobi despite a high white
 # ----------------------------------------------------------------------
 # 3️⃣  HELPERS
 # ----------------------------------------------------------------------
-@st.cache_data
-def load_gt_data(path: str = "GT_DATA_122_merged_filled.xlsx") -> pd.DataFrame:
-    return pd.read_excel(path)
-
 def extract_data(markdown_text: str, territory: str):
     sku_clusters = re.findall(r"SKU Cluster\s*[:|]\s*([A-Za-z0-9 ]+)", markdown_text)
     white_space_scores = re.findall(r"White Space Score\s*[:|]?\s*([0-9.]+)", markdown_text)
@@ -108,20 +105,20 @@ def extract_data(markdown_text: str, territory: str):
     return table, meta
 
 def average_white_space(df: pd.DataFrame, territory: str, brand: str) -> float:
-    subset = df[(df["Markets"] == territory) & (df["brand"] == brand)]
+    subset = df[(df["Territory"] == territory) & (df["Brand"] == brand)]
     return round(subset["White Space Score"].mean(), 2)
 
 # ----------------------------------------------------------------------
 # 4️⃣  DATA & FILTERS
 # ----------------------------------------------------------------------
-GT_DATA = load_gt_data()
+GT_DATA = load_gt()
 
-brand_options = list(GT_DATA["brand"].unique())
-default_brand_idx = brand_options.index("USHINDI BAR") if "USHINDI BAR" in brand_options else 0
+brand_options = list(GT_DATA["Brand"].unique())
+default_brand_idx = brand_options.index("Ushindi Bar") if "Ushindi Bar" in brand_options else 0
 
 with st.sidebar:
     st.header("🔎 Filters")
-    territory = st.selectbox("Territory", GT_DATA["Markets"].unique())
+    territory = st.selectbox("Territory", GT_DATA["Territory"].unique())
     brand = st.selectbox("Brand", brand_options, index=default_brand_idx)
 
 avg_ws = average_white_space(GT_DATA, territory, brand)
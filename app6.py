@@ -1,6 +1,7 @@
 import re
 import pandas as pd
 import streamlit as st
+from kenya_dashboard.data import load_gt
 
 # ---------------------------------------------------------------------
 # 1️⃣  PAGE CONFIG & GLOBAL STYLES
@@ -73,10 +74,6 @@ USHINDI Laundry Bar is severely underperforming in Nairobi despite a high white
 # ---------------------------------------------------------------------
 # 3️⃣  HELPERS
 # ---------------------------------------------------------------------
-@st.cache_data
-def load_gt_data(path="GT_DATA_122_merged_filled.xlsx"):
-    return pd.read_excel(path)
-
 def parse_markdown(md: str):
     """Extract executive summary, insights, white-space scores, etc."""
     # Full executive-summary block
@@ -102,26 +99,26 @@ def parse_markdown(md: str):
     }
 
 def average_white_space(df: pd.DataFrame, terr: str, br: str) -> float:
-    subset = df[(df["Markets"] == terr) & (df["brand"] == br)]
+    subset = df[(df["Territory"] == terr) & (df["Brand"] == br)]
     return round(subset["White Space Score"].mean(), 2)
 
 # ---------------------------------------------------------------------
 # 4️⃣  DATA & FILTERS
 # ---------------------------------------------------------------------
-GT_DATA = load_gt_data()
+GT_DATA = load_gt()
 
 with st.sidebar:
     st.header("🔎 Filters")
 
-    territory_opts = list(GT_DATA["Markets"].unique())
+    territory_opts = list(GT_DATA["Territory"].unique())
     territory = st.selectbox("Territory", territory_opts,
-                             index=territory_opts.index("NAIROBI")
-                                   if "NAIROBI" in territory_opts else 0)
+                             index=territory_opts.index("Nairobi")
+                                   if "Nairobi" in territory_opts else 0)
 
-    brand_opts = list(GT_DATA["brand"].unique())
+    brand_opts = list(GT_DATA["Brand"].unique())
     brand = st.selectbox("Brand", brand_opts,
-                         index=brand_opts.index("USHINDI BAR")
-                               if "USHINDI BAR" in brand_opts else 0)
+                         index=brand_opts.index("Ushindi Bar")
+                               if "Ushindi Bar" in brand_opts else 0)
 
 meta = parse_markdown(TEXT)
 avg_ws = average_white_space(GT_DATA, territory, brand)
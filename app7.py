@@ -1,6 +1,7 @@
 import re
 import pandas as pd
 import streamlit as st
+from kenya_dashboard.data import load_gt
 
 # -----------------------------------------------------------------------------
 # 1️⃣ PAGE CONFIG & GLOBAL STYLES
@@ -105,10 +106,6 @@ USHINDI Laundry Bar is severely underperforming in Nairobi despite a high white
 # -----------------------------------------------------------------------------
 # 3️⃣ HELPER FUNCTIONS
 # -----------------------------------------------------------------------------
-@st.cache_data
-def load_gt_data(path="GT_DATA_122_merged_filled.xlsx"):
-    return pd.read_excel(path)
-
 def parse_markdown(md: str):
     # Extract Executive Summary snippet before "Key metrics comparison"
     exec_match = re.search(r"## Executive Summary\s*(.*?)\n", md, re.DOTALL)
@@ -135,23 +132,23 @@ def parse_markdown(md: str):
     }
 
 def average_white_space(df: pd.DataFrame, territory: str, brand: str) -> float:
-    subset = df[(df["Markets"] == territory) & (df["brand"] == brand)]
+    subset = df[(df["Territory"] == territory) & (df["Brand"] == brand)]
     return round(subset["White Space Score"].mean(), 2)
 
 # -----------------------------------------------------------------------------
 # 4️⃣ FILTERS
 # -----------------------------------------------------------------------------
-GT_DATA = load_gt_data()
+GT_DATA = load_gt()
 
 with st.sidebar:
     st.header("🔎 Filters")
 
-    territory_opts = list(GT_DATA["Markets"].unique())
-    default_territory_idx = territory_opts.index("NAIROBI") if "NAIROBI" in territory_opts else 0
+    territory_opts = list(GT_DATA["Territory"].unique())
+    default_territory_idx = territory_opts.index("Nairobi") if "Nairobi" in territory_opts else 0
     territory = st.selectbox("Territory", territory_opts, index=default_territory_idx)
 
-    brand_opts = list(GT_DATA["brand"].unique())
-    default_brand_idx = brand_opts.index("USHINDI BAR") if "USHINDI BAR" in brand_opts else 0
+    brand_opts = list(GT_DATA["Brand"].unique())
+    default_brand_idx = brand_opts.index("Ushindi Bar") if "Ushindi Bar" in brand_opts else 0
     brand = st.selectbox("Brand", brand_opts, index=default_brand_idx)
 
 meta = parse_markdown(TEXT)
@@ -6,12 +6,23 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 import json, re
 from pathlib import Path
 import importlib.util
-from sklearn.cluster import KMeans
+from kenya_dashboard.filecache import download_data
+from kenya_dashboard.lazy import lazy
+from kenya_dashboard.report_builder import request_report
+from kenya_dashboard.data import (
+    brand_white_space, by_region, county_geo_source, feature_keys, kpi_cell, levels,
+    load_centroids,
+    load_comp, load_comp_text, load_county_geo, load_gt, load_kpi_cube,
+    load_mt, load_opportunity, load_point_density, load_population_pct, load_report,
+    load_rtm, load_rtm_monthly, load_sku_gt, load_territory_geo, load_top_locations,
+    price_buckets, reason_cards, select, territory_geo_source, warm_price_buckets)
+
+# page-specific heavy module, imported on first use (README never loads it)
+px = lazy("plotly.express")
 
 # ╭─────────────────────────  GLOBAL CONFIG  ─────────────────────────╮
 st.set_page_config(page_title="Pwani Dashboards",
@@ -48,57 +59,15 @@ st.markdown(
 # -------------------------------------------------------------------
 #  • uses GT_DF / TERR_GEO / RTM_DF / COUNTY_GEO / COMP_DF
 # -------------------------------------------------------------------
-GT_FILE   = "GT_DATA_122_merged_filled.xlsx"
-RTM_FILE  = "rtm_std_follow_GT_final (1).csv"
-COUNTY_GJ = "kenya.geojson"
-TERR_GJ   = "kenya_territories (1).geojson"
-COMP_FILE = "PWANI_COMP_STD_final_confirmed.xlsx"
-
 if importlib.util.find_spec("openpyxl") is None:
     st.error("⚠️  Missing dependency →  pip install openpyxl")
     st.stop()
 
-@st.cache_data(show_spinner="Loading GT + territory data …")
-def load_gt_terr():
-    gt = (
-        pd.read_excel(GT_FILE)
-        .rename(columns=str.strip)
-        .rename(columns={"brand": "Brand", "Markets": "Territory"})
-    )
-    gt["Territory"] = gt["Territory"].str.title().str.strip()
-    gt["Brand"]     = gt["Brand"].str.title().str.strip()
-    gt["TERR_KEY"]  = gt["Territory"]
-
-    terr = json.loads(Path(TERR_GJ).read_text("utf-8"))
-    for f in terr["features"]:
-        f["properties"]["TERR_KEY"] = f["properties"]["TERRITORY"].title().strip()
-    return gt, terr
-
-@st.cache_data(show_spinner="Loading ALL datasets …")
-def load_all_main():
-    gt, terr = load_gt_terr()
-
-    rtm = pd.read_csv(RTM_FILE)
-    rtm.columns = rtm.columns.str.strip().str.title()
-    rtm[["Territory", "County", "Brand"]] = rtm[["Territory", "County", "Brand"]].apply(
-        lambda s: s.str.title().str.strip())
-
-    county = json.loads(Path(COUNTY_GJ).read_text("utf-8"))
-    for f in county["features"]:
-        f["properties"]["COUNTY_KEY"] = (
-            f["properties"].get("COUNTY_NAM") or f["properties"].get("NAME", "")
-        ).title().strip()
-
-    comp_df = pd.read_excel(COMP_FILE)
-    comp_df.columns = comp_df.columns.str.strip()
-    comp_df.rename(columns={"Market": "Territory"}, inplace=True)
-    comp_df["Territory"]  = comp_df["Territory"].str.title().str.strip()
-    comp_df["BRAND"]      = comp_df["BRAND"].str.title().str.strip()
-    comp_df["Competitor"] = comp_df["Competitor"].str.title().str.strip()
-
-    return rtm
-
-RTM_DF= load_all_main()
+# canonical cached loaders – see kenya_dashboard.data
+GT_DF    = load_gt()
+TERR_GEO = load_territory_geo(zoom=5.5)
+RTM_DF   = load_rtm()
+COMP_DF  = load_comp()
 
 SALES   = "ERP GT Sales Coverage"
 CS      = "Client Market Share"
@@ -137,28 +106,27 @@ def page_main_dashboard():
     )
 
     if src.startswith("GT"):
-        df        = GT_DF.copy()
-        geo       = TERR_GEO
+        df        = GT_DF
+        level     = "territory"
+        geo_src   = territory_geo_source(zoom=5.5)
         region    = "Territory"
         key_col   = "TERR_KEY"
         centre    = {"lat": 0.23, "lon": 37.9}
     else:
-        df        = MT_DF.copy()
-        geo       = COUNTY_GEO
+        df        = MT_DF
+        level     = "county"
+        geo_src   = county_geo_source(zoom=5.5)
         region    = "County"
         key_col   = "COUNTY_KEY"
         centre    = {"lat": 0.23, "lon": 37.9}
 
     # ── FILTERS ──────────────────────────────────────────────────────
     f1, f2, _ = st.columns([1, 1, 6])
-    brand_sel  = f1.selectbox("Brand",  ["All"] + sorted(df["Brand"].unique()))
-    region_sel = f2.selectbox(region,   ["All"] + sorted(df[region].unique()))
+    brand_sel  = f1.selectbox("Brand",  ["All"] + levels(df, "Brand"))
+    region_sel = f2.selectbox(region,   ["All"] + levels(df, region))
 
-    view = df.copy()
-    if brand_sel  != "All": view = view[view["Brand"]  == brand_sel]
-    if region_sel != "All": view = view[view[region]   == region_sel]
-
-    pct = lambda s: (s*100 if s.max() <= 1 else s).round(2)
+    cube = load_kpi_cube("GT" if src.startswith("GT") else "MT")
+    cell = kpi_cell(cube, brand_sel, region_sel)
 
     # ── KPI CARDS ────────────────────────────────────────────────────
     k1, k2, k3 = st.columns(3)
@@ -169,9 +137,9 @@ def page_main_dashboard():
             f"<h5 style='margin:0;color:#fff'>{title}</h5>"
             f"<p style='font-size:1.3rem;color:#fff'>{value}</p></div>",
             unsafe_allow_html=True)
-    kpi(k1, "White Space Score",     f"{view['White Space Score'].mean():.0f}")
-    kpi(k2, "Client Market Share",   f"{pct(view['Client Market Share']).mean():.1f}%")
-    kpi(k3, "Competitor Strength",   f"{pct(view['Competitor Strength']).mean():.1f}%")
+    kpi(k1, "White Space Score",     f"{cell['White Space Score']:.0f}")
+    kpi(k2, "Client Market Share",   f"{cell['Client Market Share']:.1f}%")
+    kpi(k3, "Competitor Strength",   f"{cell['Competitor Strength']:.1f}%")
 
     st.markdown("<div style='height:30px'></div>", unsafe_allow_html=True)
 
@@ -180,9 +148,9 @@ def page_main_dashboard():
 
     # —— Choropleth MAP —— -------------------------------------------
     with left:
-        base   = df if brand_sel == "All" else df[df["Brand"] == brand_sel]
-        agg_ws = base.groupby(key_col, as_index=False)["White Space Score"].mean()
-        keys   = [f["properties"][key_col] for f in geo["features"]]
+        agg_ws = (by_region(cube, brand_sel)[[region, "White Space Score"]]
+                  .rename(columns={region: key_col}))
+        keys   = feature_keys(level, zoom=5.5)
         mdf    = pd.DataFrame({key_col: keys}).merge(agg_ws, how="left").fillna({"White Space Score": 0})
 
         mdf["plot_ws"] = mdf["White Space Score"]
@@ -190,7 +158,7 @@ def page_main_dashboard():
             mdf.loc[mdf[key_col] != region_sel, "plot_ws"] = 0
 
         fig_map = px.choropleth_mapbox(
-            mdf, geojson=geo, locations=key_col, featureidkey=f"properties.{key_col}",
+            mdf, geojson=geo_src, locations=key_col, featureidkey=f"properties.{key_col}",
             color="plot_ws", color_continuous_scale="YlOrRd",
             range_color=(0, 60),
             mapbox_style="carto-darkmatter",
@@ -211,10 +179,7 @@ def page_main_dashboard():
 
     # —— RIGHT-HAND BARS —— ------------------------------------------
     with right:
-        comp = (df if brand_sel=="All" else df[df["Brand"]==brand_sel]) \
-               .groupby(region, as_index=False)[["Client Market Share","Competitor Strength"]].mean()
-        comp["Client Market Share"]  = pct(comp["Client Market Share"])
-        comp["Competitor Strength"]  = pct(comp["Competitor Strength"])
+        comp = by_region(cube, brand_sel)
         op   = [1 if (region_sel=="All" or r==region_sel) else .3 for r in comp[region]]
 
         fig_stack = go.Figure()
@@ -230,8 +195,7 @@ def page_main_dashboard():
                         yanchor="bottom", y=-.25))
         st.plotly_chart(fig_stack, use_container_width=True)
 
-        sales = (df if brand_sel=="All" else df[df["Brand"]==brand_sel]) \
-                .groupby(region, as_index=False)["ERP GT Sales Coverage"].sum()
+        sales = comp
         s_op  = [1 if (region_sel=="All" or r==region_sel) else .3 for r in sales[region]]
         fig_sales = go.Figure(go.Bar(x=sales[region], y=sales["ERP GT Sales Coverage"],
                                      marker_opacity=s_op, marker_color="#48CAE4"))
@@ -258,23 +222,6 @@ def page_main_dashboard():
 def page_territory_deep_dive():
 
     # ── COMPETITOR TEXT ANALYSIS  (Reasons for outperformance) ──────────
-    TEXT_CSV = "all_brands_competitive_analysis_20250530_140609.csv"
-
-    @st.cache_data(show_spinner="Loading competitor-analysis text …")
-    def load_comp_text():
-        df = pd.read_csv(TEXT_CSV)
-        # Normalise naming
-        df.columns = df.columns.str.strip()
-        df["Brand"]      = df["Brand"].astype(str).str.title().str.strip()
-        df["Competitor"] = df["Competitor"].astype(str).str.title().str.strip()
-        df["Territory"]  = df["Territory"].astype(str).str.title().str.strip()
-        # make % numeric helper
-        for col in ["Brand_Market_Share", "Competitor_Market_Share"]:
-            if col in df.columns:
-                df[col+"_num"] = (df[col].str.replace("%","").astype(float)
-                                            .round(2).fillna(0))
-        return df
-
     COMP_TXT_DF = load_comp_text()
 
     # --------------------------------------------------------------------- #
@@ -285,8 +232,8 @@ def page_territory_deep_dive():
 
     # ── FILTERS & KPI METRICS ─────────────────────────────────────────────
     c1, c2, c3, c4, c5, c6 = st.columns([1, 1, 1, 1, 1, 1])
-    territory = c1.selectbox("Territory", sorted(GT_DF["Territory"].unique()))
-    brand     = c2.selectbox("Brand", ["All"] + sorted(GT_DF["Brand"].unique()))
+    territory = c1.selectbox("Territory", levels(GT_DF, "Territory"))
+    brand     = c2.selectbox("Brand", ["All"] + levels(GT_DF, "Brand"))
 
     sub_df = GT_DF[GT_DF["Territory"] == territory]
     if brand != "All":
@@ -323,13 +270,7 @@ def page_territory_deep_dive():
             .fillna({AWS: 0})
         )
 
-        county_sub = {
-            "type": "FeatureCollection",
-            "features": [
-                f for f in COUNTY_GEO["features"]
-                if f["properties"]["COUNTY_KEY"] in counties
-            ]
-        }
+        county_sub = county_geo_source(zoom=6, keys=counties)
 
         mfig = px.choropleth_mapbox(
             map_df,
@@ -346,10 +287,7 @@ def page_territory_deep_dive():
         )
 
         # Territory outline (white border)
-        terr_poly = next(
-            f for f in TERR_GEO["features"]
-            if f["properties"]["TERR_KEY"] == territory
-        )
+        terr_poly = territory_geo_source(zoom=6, keys=[territory])
         mfig.add_trace(
             go.Choroplethmapbox(
                 geojson=terr_poly,
@@ -418,7 +356,6 @@ def page_territory_deep_dive():
     # ──────────────────────────────────────────────────────────────────────────
 #  BEAUTIFIED  Key Competitor Analysis  · full replacement panel
 # ──────────────────────────────────────────────────────────────────────────
-    import re, html
 
     # 1️⃣  GLOBAL CSS (inject once – put at top of your app only once)
     st.markdown("""
@@ -453,32 +390,6 @@ def page_territory_deep_dive():
     </style>
     """, unsafe_allow_html=True)
 
-    # 2️⃣  helper: bullet detector + HTML builder
-    _bullet_pat = re.compile(r"^\s*(?:-|\•|\d+\)|\d+\.)\s+(.*)$")
-
-    def _build_reason_html(territory:str, raw:str)->str:
-        """Turn raw multi-line reason text into a styled HTML card."""
-        raw = (raw or "").strip()
-        paras, bullets = [], []
-
-        for ln in raw.splitlines():
-            ln = ln.strip()
-            if not ln:
-                continue
-            m = _bullet_pat.match(ln)
-            if m:
-                bullets.append(html.escape(m.group(1)))
-            else:
-                paras.append(html.escape(ln))
-
-        h  = [f"<div class='reason-card'><h5>{html.escape(territory)}</h5>"]
-        if paras:
-            h.append("<p>" + " ".join(paras) + "</p>")
-        if bullets:
-            h.append("<ul>" + "".join(f"<li>{b}</li>" for b in bullets) + "</ul>")
-        h.append("</div>")
-        return "".join(h)
-
     # 3️⃣  FULL PANEL  (replace your old container)
     with st.container():
         st.markdown("### Key Competitor Analysis")
@@ -495,7 +406,7 @@ def page_territory_deep_dive():
                 sel_comp = None
             else:
                 sel_comp = st.selectbox("Select Competitor",
-                                        sorted(comp_rows["Competitor"].unique()))
+                                        levels(comp_rows, "Competitor"))
                 row = comp_rows[comp_rows["Competitor"] == sel_comp].iloc[0]
                 client_val = row["Pwani Market Share (%)"]
                 comp_val   = row["Competitor Market Share (%)"]
@@ -519,21 +430,14 @@ def page_territory_deep_dive():
                     font=dict(color="#e3e8ef"), showlegend=False)
                 st.plotly_chart(fig_strip, use_container_width=True)
 
-        # ── narrative cards pulled from COMP_TXT_DF ────────────────────────
+        # ── narrative cards (pre-rendered with COMP_TXT_DF) ───────────────
         if sel_comp:
-            txt_rows = COMP_TXT_DF[(COMP_TXT_DF["Brand"]      == brand) &
-                                (COMP_TXT_DF["Competitor"] == sel_comp)]
-            if txt_rows.empty:
+            cards = reason_cards(brand, sel_comp)
+            if not cards:
                 st.info("No narrative analysis found for this competitor.")
             else:
                 st.markdown("#### Territory-wise Reasons")
-                # loop through each territory row & render prettily
-                for _, r in txt_rows.iterrows():
-                    terr   = r["Territory"]
-                    reason = (r.get("Reasons_Outperformance") or
-                            r.get("Reason") or "")
-                    st.markdown(_build_reason_html(terr, reason),
-                                unsafe_allow_html=True)
+                st.markdown(cards, unsafe_allow_html=True)
 
 
                
@@ -547,19 +451,7 @@ def page_territory_deep_dive():
 # Page 3 – SKU Cluster Dashboard
 # Brand-aware SKU filter (affects price bucket panel only)
 
-import streamlit as st
-import pandas as pd
-import geopandas as gpd
-import plotly.express as px
-import plotly.graph_objs as go
-import json
-from pathlib import Path
-from sklearn.cluster import KMeans
-
-# ───────── paths
-GT_FILE  = Path("GT_DATA_122_merged_filled.xlsx")
-RTM_FILE = Path("RTM_MONTH DATA.csv")
-GEO_FILE = Path("kenya_territories (1).geojson")
+# (streamlit / pandas / go / json / Path imported above; px lazy)
 
 # ───────── theme + colour helpers
 PANEL_BG = "#0e1b2c"
@@ -572,59 +464,15 @@ def colour_for(cluster: str) -> str:
     first = str(cluster).split()[0].upper()
     return BASE_COLOURS.get(first, "#95A5A6")
 
-def ensure_str_col(df: pd.DataFrame, name: str, *src):
-    """Guarantee df[name] exists as string Series; pull from first src col."""
-    for c in src:
-        if c in df.columns:
-            df[name] = df[c].astype(str)
-            break
-    if name not in df.columns:
-        df[name] = pd.Series([""] * len(df), dtype=str)
-    df[name] = df[name].str.upper().str.strip()
-
-# ───────── load GT
-@st.cache_data(show_spinner="Loading GT …")
-def load_gt():
-    df = pd.read_excel(GT_FILE)
-    df = df.rename(columns={
-        "Markets": "MARKET", "SKU_CLUSTER": "CLUSTER",
-        "Market_Share": "SHARE_PCT", "Total_brand": "SALES_VAL",
-        "avg_price": "AVG_PRICE",
-    })
-    ensure_str_col(df, "MARKET")
-    ensure_str_col(df, "CLUSTER")
-    ensure_str_col(df, "BRAND", "brand", "Brand")
-    ensure_str_col(df, "SKU",   "SKU")
-    df["SHARE_PCT"] = pd.to_numeric(df["SHARE_PCT"], errors="coerce").fillna(0)
-    df["BUBBLE_SIZE"] = (df["SHARE_PCT"]*100).clip(lower=1)*20
-    df["SHARE_LABEL"] = (df["SHARE_PCT"]*100).round(1).astype(str) + "%"
-    return df
-
-# ───────── load RTM
-@st.cache_data(show_spinner="Loading RTM …")
-def load_rtm():
-    rtm = pd.read_csv(RTM_FILE)
-    ensure_str_col(rtm, "MARKET", "REGION_NAME", "Markets")
-    ensure_str_col(rtm, "BRAND",  "Brand")
-    ensure_str_col(rtm, "SKU",    "SKU")
-    if "Volume" in rtm.columns and "VOLUME" not in rtm.columns:
-        rtm = rtm.rename(columns={"Volume": "VOLUME"})
-    return rtm
-
-# ───────── load map
-@st.cache_data(show_spinner="Loading map …")
+# ───────── load map  (centroids prebuilt in geo_centroids.csv)
 def load_map():
-    poly = gpd.read_file(GEO_FILE).rename(
-        columns={"TERRITORY": "MARKET", "REGION_NAME": "MARKET"})
-    poly["MARKET"] = poly["MARKET"].str.upper()
-    poly = poly.to_crs(3857); poly["geometry"] = poly.geometry.centroid
-    poly = poly.to_crs(4326)
-    poly["lon"] = poly.geometry.x; poly["lat"] = poly.geometry.y
-    cent = poly[["MARKET","lon","lat"]].copy()
-    return cent, poly
+    terr = load_centroids("territory")
+    cent = pd.DataFrame({"MARKET": terr["TERR_KEY"].str.upper(),
+                         "lon": terr["lon"], "lat": terr["lat"]})
+    return cent, terr["TERR_KEY"]
 
 # ───────── bubble map
-def draw_cluster_map(df, cent, poly):
+def draw_cluster_map(df, cent, terr_keys):
     grid = (
         df[["MARKET","CLUSTER","SHARE_PCT","BUBBLE_SIZE","SHARE_LABEL"]]
         .drop_duplicates()
@@ -632,8 +480,9 @@ def draw_cluster_map(df, cent, poly):
     )
     colour_map = {c: colour_for(c) for c in grid["CLUSTER"].unique()}
     outline = go.Choroplethmapbox(
-        geojson=json.loads(poly.to_json()), locations=poly["MARKET"],
-        z=[0]*len(poly), showscale=False,
+        geojson=territory_geo_source(zoom=5.4), featureidkey="properties.TERR_KEY",
+        locations=terr_keys, z=[0]*len(terr_keys), showscale=False,
+        colorscale=[[0, "rgba(0,0,0,0)"], [1, "rgba(0,0,0,0)"]],
         marker=dict(line=dict(color="rgba(200,200,200,0.4)", width=0.5)))
     px_fig = px.scatter_mapbox(
         grid, lat="lat", lon="lon",
@@ -652,39 +501,32 @@ def draw_cluster_map(df, cent, poly):
 def page_sku_dashboard():
     st.title("SKU-Cluster Dashboard")
 
-    gt  = load_gt()
-    rtm = load_rtm()
-    cent, poly = load_map()
+    gt  = load_sku_gt()
+    rtm = load_rtm_monthly()
+    warm_price_buckets()
+    cent, terr_keys = load_map()
 
     # FILTERS
     f = st.columns(5)
-    market_sel  = f[0].selectbox("Market", ["ALL"]+sorted(gt["MARKET"].unique()))
-    brand_sel   = f[1].selectbox("Brand",  ["ALL"]+sorted(gt["BRAND"].unique()))
+    market_sel  = f[0].selectbox("Market", ["ALL"]+levels(gt, "MARKET"))
+    brand_sel   = f[1].selectbox("Brand",  ["ALL"]+levels(gt, "BRAND"))
     cluster_sel = f[2].selectbox(
         "Cluster",
-        ["ALL"] + sorted(gt["CLUSTER"].dropna().astype(str).unique()))
+        ["ALL"] + levels(gt, "CLUSTER"))
     # SKU list from RTM after market & brand filter
-    rtm_pool = rtm.copy()
-    if market_sel != "ALL": rtm_pool = rtm_pool[rtm_pool["MARKET"] == market_sel]
-    if brand_sel  != "ALL": rtm_pool = rtm_pool[rtm_pool["BRAND"]  == brand_sel]
+    rtm_pool = select(rtm, REGION_NAME=market_sel, BRAND=brand_sel)
     sku_sel = f[3].selectbox("SKU (price panel only)",
-                             ["ALL"]+sorted(rtm_pool["SKU"].dropna().unique()))
+                             ["ALL"]+levels(rtm_pool, "SKU"))
 
     period_sel = f[4].selectbox("Period", ["LAST 12 MONTHS"])
 
     # GT filters (SKU not applied)
-    gt_filt = gt.copy()
-    if market_sel  != "ALL": gt_filt = gt_filt[gt_filt["MARKET"]  == market_sel]
-    if brand_sel   != "ALL": gt_filt = gt_filt[gt_filt["BRAND"]   == brand_sel]
-    if cluster_sel != "ALL": gt_filt = gt_filt[gt_filt["CLUSTER"] == cluster_sel]
+    gt_filt = select(gt, MARKET=market_sel, BRAND=brand_sel, CLUSTER=cluster_sel)
     if gt_filt.empty:
         st.warning("No GT rows for filters."); return
 
     # RTM filters (includes SKU)
-    rtm_filt = rtm.copy()
-    if market_sel != "ALL": rtm_filt = rtm_filt[rtm_filt["MARKET"] == market_sel]
-    if brand_sel  != "ALL": rtm_filt = rtm_filt[rtm_filt["BRAND"]  == brand_sel]
-    if sku_sel    != "ALL": rtm_filt = rtm_filt[rtm_filt["SKU"]    == sku_sel]
+    rtm_filt = select(rtm_pool, SKU=sku_sel)
 
     # Layout panels
     c1,c2 = st.columns(2); c3,c4 = st.columns(2)
@@ -692,7 +534,7 @@ def page_sku_dashboard():
     # 1 Cluster share
     with c1:
         st.subheader("Cluster Share")
-        share = gt_filt.groupby("CLUSTER")["SHARE_PCT"].sum().reset_index()
+        share = gt_filt.groupby("CLUSTER", observed=True)["SHARE_PCT"].sum().reset_index()
         share["Percent"] = (share["SHARE_PCT"] / share["SHARE_PCT"].sum()*100).round(1)
         fig = px.bar(share, x="Percent", y="CLUSTER", orientation="h",
                      text="Percent",
@@ -707,15 +549,8 @@ def page_sku_dashboard():
     with c2:
         st.subheader("Price Buckets (RTM)")
         if {"AVERAGE_BASE_PRICE","VOLUME"}.issubset(rtm_filt.columns):
-            tmp = rtm_filt.dropna(subset=["AVERAGE_BASE_PRICE","VOLUME"])
-            if tmp["AVERAGE_BASE_PRICE"].nunique() >= 4:
-                km = KMeans(n_clusters=4,n_init="auto").fit(
-                    tmp[["AVERAGE_BASE_PRICE"]], sample_weight=tmp["VOLUME"])
-                tmp["Bucket"] = km.labels_
-                centers = km.cluster_centers_.flatten()
-                vol = tmp.groupby("Bucket")["VOLUME"].sum()
-                bars = pd.DataFrame({"Center":centers,"Volume":vol}).sort_values("Volume")
-                bars["Label"]="₹"+bars["Center"].round().astype(int).astype(str)
+            bars = price_buckets(market_sel, brand_sel, sku_sel)   # memoised, pre-warmed
+            if bars is not None:
                 fig = px.bar(bars,y="Label",x="Volume",orientation="h",
                              color_discrete_sequence=["#F04E4E"])
                 fig.update_layout(height=260,paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
@@ -748,7 +583,7 @@ def page_sku_dashboard():
     # 4 Map (SKU ignored)
     with c4:
         st.subheader("Territory Bubble Map")
-        draw_cluster_map(gt_filt, cent, poly)
+        draw_cluster_map(gt_filt, cent, terr_keys)
 
 
 
@@ -769,56 +604,31 @@ def page_sku_dashboard():
 def page_opportunity_dashboard():
     import re, pandas as pd, streamlit as st, pathlib
 
-    # ── data loads (identical) ───────────────────────────────────────────
-    gt_data         = pd.read_excel('data_files/GT_DATA_122_merged_filled.xlsx')
-    percentage_data = pd.read_excel('data_files/Province Percentage 250410 (1) (1).xlsx')
-    top_location_data = pd.read_csv('data_files/Top_3_Brand_Locations.csv')
-
-    # --- helper functions (unchanged) ------------------------------------
-    def executive_summary_retirver(text):
-        m = re.search(r'## 1. Executive Summary\s*(.*?)(?=\n##|\Z)', text, re.DOTALL)
-        return m.group(1).strip() if m else ""
-
-    def extract_territory_block(text, territory_name):
-        m = re.search(rf"### {territory_name}\n(.*?)(?=\n### [A-Z ]+|\Z)", text, re.DOTALL)
-        return m.group(0).strip() if m else None
-
-    def extract_data(txt):
-        ws  = re.search(r"\*\*White Space Score\*\*:\s*([\d.]+)", txt)
-        cs  = re.search(r"\*\*Client Share\*\*:\s*([\d.]+)%", txt)
-        ins = re.findall(r'### Insights\s*(.*?)(?=\n###|\n##|\Z)', txt, re.DOTALL)
-        return {
-            "white_space_scores": ws.group(1)+' %' if ws else None,
-            "client_shares": cs.group(1)+' %' if cs else None,
-            "insights": [' '.join(i.strip().split()) for i in ins],
-        }
+    # ── data loads (cached + shared, see kenya_dashboard.data) ───────────
+    percentage_data = load_population_pct()
+    top_locations   = load_top_locations()
+    brand_ws        = brand_white_space()
 
+    # --- helper functions ------------------------------------------------
     def get_top_location(territory, brand):
-        rows = top_location_data[(top_location_data['Territory']==territory) &
-                                 (top_location_data['Brand']==brand)]
-        return ','.join(rows['Top 3 Performing Location'].values)
+        return top_locations.get((territory, brand), "")
 
     def text_extractor(territories, brand):
-        data_dict = {"Territory":[], "White Space Scores":[], "Client Shares":[],
-                     "Summary":[], "High Potential Regions":[]}
-        try:
-            md_path = pathlib.Path(f"md_files/{brand}.md")
-            content = md_path.read_text(encoding='utf-8')
-            exec_sum = executive_summary_retirver(content)
-            for terr in territories:
-                block = extract_territory_block(content, terr)
-                if not block: continue
-                d       = extract_data(block)
-                top_loc = get_top_location(terr, brand)
-                data_dict["Territory"].append(terr)
-                data_dict["White Space Scores"].append(d["white_space_scores"])
-                data_dict["Client Shares"].append(d["client_shares"])
-                data_dict["Summary"].append(' '.join(d["insights"]))
-                data_dict["High Potential Regions"].append(top_loc)
-            return data_dict, exec_sum
-        except FileNotFoundError:
+        report = load_report(brand)            # parsed once, see kenya_dashboard.data.reports
+        if report is None:
             st.error(f"Markdown for {brand} not found.")
             return {}, ""
+        data_dict = {"Territory":[], "White Space Scores":[], "Client Shares":[],
+                     "Summary":[], "High Potential Regions":[]}
+        for terr in territories:
+            d = report["territories"].get(terr)
+            if not d: continue
+            data_dict["Territory"].append(terr)
+            data_dict["White Space Scores"].append(d["white_space"])
+            data_dict["Client Shares"].append(d["client_share"])
+            data_dict["Summary"].append(d["insights"])
+            data_dict["High Potential Regions"].append(get_top_location(terr, brand))
+        return data_dict, report["summary"]
 
     def Population_percentage_per_brand(brand,territory):
         try:    
@@ -849,14 +659,14 @@ def page_opportunity_dashboard():
             return None
 
     def average_ws(brand):
-        return round(gt_data[gt_data['brand']==brand]['White Space Score'].mean(),2)
+        return brand_ws.get(brand)
 
     # ── UI layout identical to original ──────────────────────────────────
     st.title("Export and Report Section")
 
     col1, col2, col3 = st.columns([1.5,1.5,3])
     with col1:
-        brands = sorted(gt_data['brand'].unique())
+        brands = list(brand_ws.index)
         default_index = brands.index("USHINDI BAR") if "USHINDI BAR" in brands else 0
         brand = st.selectbox("Brand", brands, index=default_index)
         
@@ -909,12 +719,13 @@ def page_opportunity_dashboard():
     choice = st.selectbox("Report list", ["Select"]+list(report_map.keys()))
     if choice != "Select":
         loc = report_map[choice]
-        path = pathlib.Path(f"Reports/{brand} {loc}.pdf")
-        if path.exists():
-            st.download_button("Download PDF Report", data=path.read_bytes(),
-                               file_name=path.name, mime="application/pdf")
+        path = request_report(brand, loc)   # None while it renders in the background
+        if path is None:
+            st.info("Building this report … it takes a few seconds.")
+            st.button("Refresh")
         else:
-            st.error(f"⚠️ Report file not found: {path}")
+            st.download_button("Download PDF Report", data=download_data(path),
+                               file_name=path.name, mime="application/pdf")
 
 
 
@@ -924,46 +735,23 @@ def page_opportunity_dashboard():
 MAP_TABLE_HEIGHT = 760
 MAP_TABLE_RATIO  = [5, 3]
 
-@st.cache_data
-def load_counties():
-    df  = pd.read_csv("Merged_Data_with_Opportunity_Score.csv")
-    geo = json.load(open("kenya.geojson", "r", encoding="utf-8"))
-    for f in geo["features"]:
-        nm = f["properties"].get("COUNTY_NAM") or ""
-        f["properties"]["COUNTY_KEY"] = nm.title().strip()
-    return df, geo
-
-@st.cache_data
-def load_points():
-    raw  = pd.read_excel("rtm_lat_log.xlsx")
-    cols = list(raw.columns)
-    lat  = next((c for c in cols if re.search(r"^lat", c, re.I)), None)
-    lon  = next((c for c in cols if re.search(r"(lon|lng)", c, re.I)), None)
-    dist = next((c for c in cols if re.search(r"distrib|dealer|partner|outlet", c, re.I)), None)
-    if None in (lat, lon, dist):
-        st.stop()
-    pts            = raw[[dist, lat, lon]].copy()
-    pts.columns    = ["Distributor", "Latitude", "Longitude"]
-    pts["Latitude"]= pd.to_numeric(pts["Latitude"],  errors="coerce")
-    pts["Longitude"]=pd.to_numeric(pts["Longitude"], errors="coerce")
-    return pts.dropna(subset=["Latitude","Longitude"])
-
 def page_kenya_dashboard():
     st.markdown("## Kenya County Opportunity Dashboard")
 
-    df,  geojson = load_counties()
-    pts_df       = load_points()
+    df           = load_opportunity()
+    geojson      = county_geo_source(zoom=5.5)
+    dens         = load_point_density(5.5)     # hex-binned outlets
 
     f1, f2 = st.columns([1, 5])
     with f1:
-        brands = ["All"] + sorted(df["BRAND"].dropna().unique())
+        brands = ["All"] + levels(df, "BRAND")
         choose = st.selectbox("Select Brand", brands)
 
     view_df = df if choose == "All" else df[df["BRAND"] == choose]
 
-    county_avg = (view_df.groupby("County", as_index=False)["Opportunity Score"]
+    county_avg = (view_df.groupby("COUNTY_KEY", as_index=False, observed=True)["Opportunity Score"]
                            .mean()
-                           .assign(County=lambda d: d["County"].str.title().str.strip()))
+                           .rename(columns={"COUNTY_KEY": "County"}))
 
     fig = px.choropleth_mapbox(
         county_avg, geojson=geojson,
@@ -975,8 +763,9 @@ def page_kenya_dashboard():
         opacity=0.9, height=MAP_TABLE_HEIGHT)
 
     fig.add_trace(go.Densitymapbox(
-        lat=pts_df["Latitude"], lon=pts_df["Longitude"],
-        z=[1]*len(pts_df), radius=14, opacity=0.7,
+        lat=dens["Latitude"], lon=dens["Longitude"],
+        # log-scaled outlet counts, colour range taken from the data
+        z=dens["Intensity"], zmin=0, zmax=dens["Intensity"].max(), radius=14, opacity=0.7,
         colorscale=[[0,"rgba(0,120,255,0.25)"],
                     [0.3,"rgba(0,120,255,0.55)"],
                     [1,"rgba(0,120,255,0.9)"]],
@@ -1071,57 +860,13 @@ All pages share the same dark theme and respond instantly to filters.
 # ———————————————————
 # Additional constants
 # ———————————————————
-MT_FILE      = "MT_WHITE_SPACE_SCORE_CLEANED.xlsx"   # cleaned file you produced
-COUNTY_GJ    = "kenya.geojson"                       # same file already uploaded
 WS_COL       = "White Space Score"
 CS_COL       = "Client Market Share"
 COMP_COL     = "Competitor Strength"
 SALES_COL    = "ERP GT Sales Coverage"
 
-# ———————————————————
-# Data loaders (cached)
-# ———————————————————
-@st.cache_data(show_spinner="Loading MT White-Space data …")
-def load_mt():
-    if not Path(MT_FILE).exists():
-        st.error(f"❌ {MT_FILE} not found"); st.stop()
-    df = pd.read_excel(MT_FILE)
-
-    # rename / strip
-    df.columns = df.columns.str.strip()
-    df["County"] = df["County"].astype(str).str.title().str.strip()
-    if "Brand" not in df.columns and "BRAND" in df.columns:
-        df.rename(columns={"BRAND": "Brand"}, inplace=True)
-    df["Brand"] = df["Brand"].astype(str).str.title().str.strip()
-
-    # key used by choropleth
-    df["COUNTY_KEY"] = df["County"]
-    # numeric guards
-    for c in [WS_COL, CS_COL, COMP_COL, SALES_COL]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-        else:
-            st.error(f"Column “{c}” missing in {MT_FILE}"); st.stop()
-
-    return df
-
-@st.cache_data(show_spinner="Loading Kenya county GeoJSON …")
-def load_county_geo():
-    if not Path(COUNTY_GJ).exists():
-        st.error(f"❌ {COUNTY_GJ} not found"); st.stop()
-    geo = json.loads(Path(COUNTY_GJ).read_text("utf-8"))
-    # normalise the name field to COUNTY_KEY
-    for feat in geo["features"]:
-        nm = feat["properties"].get("COUNTY_NAM") or feat["properties"].get("NAME", "")
-        feat["properties"]["COUNTY_KEY"] = str(nm).title().strip()
-    return geo
-
-MT_DF   = load_mt()
-COUNTY_GEO = load_county_geo()
-
-# ———————————————————
-# Helper: percent formatter
-percent_fmt = lambda s: (s*100 if s.max() <= 1 else s).round(2)
+MT_DF      = load_mt()
+COUNTY_GEO = load_county_geo(zoom=5.5)
 
 # ———————————————————
 def page_mt_dashboard():
@@ -1129,12 +874,11 @@ def page_mt_dashboard():
 
     # ── FILTERS
     f_brand, f_cnty, _ = st.columns([1, 1, 6])
-    brand_sel = f_brand.selectbox("Brand",  ["All"] + sorted(MT_DF["Brand"].unique()))
-    cnty_sel  = f_cnty.selectbox("County", ["All"] + sorted(MT_DF["County"].unique()))
+    brand_sel = f_brand.selectbox("Brand",  ["All"] + levels(MT_DF, "Brand"))
+    cnty_sel  = f_cnty.selectbox("County", ["All"] + levels(MT_DF, "County"))
 
-    view = MT_DF.copy()
-    if brand_sel != "All": view = view[view["Brand"] == brand_sel]
-    if cnty_sel  != "All": view = view[view["County"] == cnty_sel]
+    cube = load_kpi_cube("MT")
+    kpi  = kpi_cell(cube, brand_sel, cnty_sel)
 
     # ── KPI CARDS
     k1, k2, k3 = st.columns(3)
@@ -1146,9 +890,9 @@ def page_mt_dashboard():
             f"<p style='font-size:1.3rem;color:#fff'>{value}</p></div>",
             unsafe_allow_html=True)
 
-    card(k1, "White Space Score", f"{view[WS_COL].mean():.0f}")
-    card(k2, "Client Market Share", f"{percent_fmt(view[CS_COL]).mean():.1f}%")
-    card(k3, "Competitor Strength", f"{percent_fmt(view[COMP_COL]).mean():.1f}%")
+    card(k1, "White Space Score", f"{kpi[WS_COL]:.0f}")
+    card(k2, "Client Market Share", f"{kpi[CS_COL]:.1f}%")
+    card(k3, "Competitor Strength", f"{kpi[COMP_COL]:.1f}%")
 
     st.markdown("<div style='height:30px'></div>", unsafe_allow_html=True)
 
@@ -1157,16 +901,16 @@ def page_mt_dashboard():
 
     # —— Choropleth map ——
     with left:
-        base      = MT_DF if brand_sel == "All" else MT_DF[MT_DF["Brand"] == brand_sel]
-        agg_ws    = base.groupby("COUNTY_KEY", as_index=False)[WS_COL].mean()
-        keys_full = [f["properties"]["COUNTY_KEY"] for f in COUNTY_GEO["features"]]
+        agg_ws    = (by_region(cube, brand_sel)[["County", WS_COL]]
+                     .rename(columns={"County": "COUNTY_KEY"}))
+        keys_full = feature_keys("county", zoom=5.5)
         mdf = pd.DataFrame({"COUNTY_KEY": keys_full}).merge(agg_ws, how="left").fillna({WS_COL:0})
         mdf["plot_ws"] = mdf[WS_COL]
         if cnty_sel != "All":
             mdf.loc[mdf["COUNTY_KEY"] != cnty_sel, "plot_ws"] = 0
 
         fig_map = px.choropleth_mapbox(
-            mdf, geojson=COUNTY_GEO, locations="COUNTY_KEY",
+            mdf, geojson=county_geo_source(zoom=5.5), locations="COUNTY_KEY",
             featureidkey="properties.COUNTY_KEY",
             color="plot_ws", color_continuous_scale="YlOrRd",
             range_color=(0, 60),
@@ -1189,10 +933,7 @@ def page_mt_dashboard():
 
     # —— Right-hand bar panels ——
     with right:
-        share = (MT_DF if brand_sel=="All" else MT_DF[MT_DF["Brand"]==brand_sel]) \
-                .groupby("County", as_index=False)[[CS_COL, COMP_COL]].mean()
-        share[CS_COL]   = percent_fmt(share[CS_COL])
-        share[COMP_COL] = percent_fmt(share[COMP_COL])
+        share = by_region(cube, brand_sel)
         op = [1 if (cnty_sel=="All" or c==cnty_sel) else .3 for c in share["County"]]
 
         fig_stack = go.Figure()
@@ -1207,8 +948,7 @@ def page_mt_dashboard():
             legend=dict(bgcolor="rgba(0,0,0,0)", orientation="h", yanchor="bottom", y=-.25))
         st.plotly_chart(fig_stack, use_container_width=True)
 
-        sales = (MT_DF if brand_sel=="All" else MT_DF[MT_DF["Brand"]==brand_sel]) \
-                .groupby("County", as_index=False)[SALES_COL].sum()
+        sales = share
         sales_op = [1 if (cnty_sel=="All" or c==cnty_sel) else .3 for c in sales["County"]]
         fig_sales = go.Figure(go.Bar(x=sales["County"], y=sales[SALES_COL],
                                      marker_opacity=sales_op, marker_color="#48CAE4"))
@@ -0,0 +1,7 @@
+"""
+Shared building blocks for the Pwani Kenya Streamlit dashboards.
+
+The app scripts in the repository root (``streamlit_app.py``, ``example.py``,
+the standalone pages …) import from here instead of re-implementing the same
+plumbing in every file.
+"""
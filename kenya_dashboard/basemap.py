@@ -0,0 +1,52 @@
+"""
+Prebuilt base figures for the dashboards' choropleth maps.
+
+Every map render used to go through ``px.choropleth_mapbox`` and re-create
+the same figure: carto-darkmatter style, centre (0.23, 37.9), the full-screen
+blue overlay polygon, margins, colour axis, hover templates … although only
+the values differ between two renders.  A ``BaseMap`` holds that figure once
+per process as plain Plotly JSON; a page only supplies the per-trace arrays:
+
+    base = BaseMap(fig, "ws", "zero")            # fig built once, e.g. by px
+    base.render(("ws",   {"locations": keys, "z": scores}),
+                ("zero", {"locations": empty, "z": [0]*len(empty)}))
+
+``render`` instantiates the stored JSON without re-validating it and applies
+the new arrays in one ``batch_update`` – about 1 ms instead of the ~50 ms a
+``px.choropleth_mapbox`` call costs.  Each trace of the base figure is a
+named *slot*; a render emits the slots it lists, in that order, so maps whose
+trace count varies (one trace per colour bin …) share one base too.
+"""
+from __future__ import annotations
+
+import json
+
+import plotly.graph_objects as go
+
+KENYA_CENTER = dict(lat=0.23, lon=37.9)
+
+# full-screen blue tint under the traces (the dashboards' map look)
+BLUE_OVERLAY = dict(
+    sourcetype="geojson", type="fill", below="traces", color="rgba(0,120,255,0.15)",
+    source={"type": "FeatureCollection", "features": [{"type": "Feature", "geometry": {
+        "type": "Polygon", "coordinates": [[[10, -35], [70, -35], [70, 25], [10, 25], [10, -35]]]}}]})
+
+
+class BaseMap:
+    """Static JSON of a map figure, one named slot per trace."""
+
+    def __init__(self, fig: go.Figure, *slots: str):
+        if len(slots) != len(fig.data):
+            raise ValueError(f"{len(fig.data)} traces but {len(slots)} slot names")
+        spec = json.loads(fig.to_json())
+        self.layout = spec["layout"]
+        self.traces = dict(zip(slots, spec["data"]))
+
+    def render(self, *traces: tuple[str, dict]) -> go.Figure:
+        """The base figure with one trace per ``(slot, values)``, in that order."""
+        fig = go.Figure({"data": [self.traces[slot] for slot, _ in traces],
+                         "layout": self.layout}, _validate=False)
+        with fig.batch_update():
+            for trace, (_, values) in zip(fig.data, traces):
+                trace.update(values)
+        return fig
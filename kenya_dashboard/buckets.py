@@ -0,0 +1,130 @@
+"""
+One-dimensional price segmentation shared by both SKU pages.
+
+* ``kmeans_1d``   – globally optimal weighted k-means (Ckmeans-style).
+  Prices are one-dimensional, so the optimum is ``k`` contiguous runs of
+  the sorted values.  The dynamic programme runs over prefix sums and, since
+  the optimal split point never moves left as the prefix grows, each layer
+  is solved by divide and conquer – O(n log n) per layer, each recursion
+  depth evaluated as a single batched NumPy expression.  No random init:
+  identical input, identical buckets.
+* ``fixed_bins``  – the equal-width ``np.linspace`` bins of ``SKU-Level.py``
+  (``pd.cut(..., include_lowest=True)`` semantics) without building a
+  categorical column.
+* ``bucket_volumes`` – the SKU page's price buckets (centres and volume per
+  bucket) from plain arrays, so the clustering can run in a worker process.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def _collapse(x: np.ndarray, w: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sorted unique values, their summed weights and the inverse index."""
+    ux, inv = np.unique(x, return_inverse=True)
+    uw = np.bincount(inv.ravel(), weights=w, minlength=len(ux))
+    return ux, uw, inv.ravel()
+
+
+def _layer(prev, cur, arg, m, n, sse) -> None:
+    """Fill one DP layer by divide and conquer, one NumPy pass per depth.
+
+    Every pending node ``(jlo, jhi, ilo, ihi)`` solves its middle ``j`` over
+    split candidates ``ilo..min(ihi, j-1)``; all nodes of a depth are batched
+    into one ragged candidate array and reduced per segment.
+    """
+    jlo, jhi = np.array([m + 1]), np.array([n])
+    ilo, ihi = np.array([m]), np.array([n - 1])
+    while len(jlo):
+        j    = (jlo + jhi) // 2
+        size = np.minimum(ihi, j - 1) - ilo + 1
+        offs = np.concatenate([[0], np.cumsum(size)[:-1]])
+        seg  = np.repeat(np.arange(len(j)), size)
+        cand = ilo[seg] + np.arange(size.sum()) - offs[seg]
+        total = prev[cand] + sse(cand, j[seg])
+
+        best  = np.minimum.reduceat(total, offs)
+        first = np.minimum.reduceat(np.where(total == best[seg], np.arange(len(cand)), len(cand)), offs)
+        opt   = cand[first]
+        cur[j], arg[j] = best, opt
+
+        jlo, jhi, ilo, ihi = (np.concatenate(p) for p in (
+            (jlo, j + 1), (j - 1, jhi), (ilo, opt), (opt, ihi)))
+        keep = jlo <= jhi
+        jlo, jhi, ilo, ihi = jlo[keep], jhi[keep], ilo[keep], ihi[keep]
+
+
+def kmeans_1d(x, w=None, k: int = 4) -> tuple[np.ndarray, np.ndarray]:
+    """Globally optimal weighted k-means of ``x``.
+
+    Returns ``(labels, centers)``: ``labels[i]`` is the bucket of ``x[i]``
+    (0 = cheapest), ``centers`` the weighted bucket means in ascending order.
+    """
+    x = np.asarray(x, dtype=float)
+    w = np.ones_like(x) if w is None else np.asarray(w, dtype=float)
+    ux, uw, inv = _collapse(x, w)
+    n = len(ux)
+    k = min(k, n)
+
+    # prefix sums → SSE of the run ux[i:j] in O(1), vectorised over i
+    W  = np.concatenate([[0.0], np.cumsum(uw)])
+    S1 = np.concatenate([[0.0], np.cumsum(uw * ux)])
+    S2 = np.concatenate([[0.0], np.cumsum(uw * ux * ux)])
+
+    def sse(i, j):
+        ww, s1 = W[j] - W[i], S1[j] - S1[i]
+        safe = np.where(ww > 0, ww, 1.0)
+        return np.maximum(S2[j] - S2[i] - np.where(ww > 0, s1 * s1 / safe, 0.0), 0.0)
+
+    # cost[m, j]: best SSE of ux[:j] in m+1 runs;  back[m, j]: start of the last run
+    cost = np.full((k, n + 1), np.inf)
+    back = np.zeros((k, n + 1), dtype=np.intp)
+    cost[0, 1:] = sse(0, np.arange(1, n + 1))
+    for m in range(1, k):
+        _layer(cost[m - 1], cost[m], back[m], m, n, sse)
+
+    bounds = [n]
+    for m in range(k - 1, 0, -1):
+        bounds.append(int(back[m, bounds[-1]]))
+    bounds = np.array([0] + bounds[::-1])
+
+    ulabels = np.repeat(np.arange(k), np.diff(bounds))
+    lo, hi  = bounds[:-1], bounds[1:]
+    wsum    = W[hi] - W[lo]
+    plain   = np.add.reduceat(ux, lo) / (hi - lo)     # zero-weight runs
+    centers = np.where(wsum > 0, (S1[hi] - S1[lo]) / np.where(wsum > 0, wsum, 1.0), plain)
+    return ulabels[inv], centers
+
+
+def bucket_volumes(prices, volumes, k: int = 4) -> tuple[np.ndarray, np.ndarray] | None:
+    """``(centers, volume per bucket)`` of the volume-weighted ``kmeans_1d``.
+
+    ``None`` when there are fewer than ``k`` distinct prices.
+    """
+    x = np.asarray(prices, dtype=float)
+    w = np.asarray(volumes, dtype=float)
+    if len(np.unique(x)) < k:
+        return None
+    labels, centers = kmeans_1d(x, w, k)
+    return centers, np.bincount(labels, weights=w, minlength=k)
+
+
+def bucket_volumes_many(slices, k: int = 4) -> list[tuple[np.ndarray, np.ndarray] | None]:
+    """``bucket_volumes`` of every ``(prices, volumes)`` pair, in one call."""
+    return [bucket_volumes(x, w, k) for x, w in slices]
+
+
+def fixed_bins(x, n_bins: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    """Equal-width bins over ``[min(x), max(x)]``.
+
+    Returns ``(idx, edges)``: ``idx[i]`` is the bin of ``x[i]`` (NaN → -1)
+    and ``edges`` the unique ``np.linspace`` edges.  Bins are right-closed
+    with the lowest edge included, exactly like ``pd.cut(include_lowest=True)``.
+    """
+    x = np.asarray(x, dtype=float)
+    ok = ~np.isnan(x)
+    if not ok.any():
+        return np.full(len(x), -1), np.array([])
+    edges = np.unique(np.linspace(x[ok].min(), x[ok].max(), n_bins + 1))
+    idx = np.clip(np.searchsorted(edges, x, side="left") - 1, 0, max(len(edges) - 2, 0))
+    return np.where(ok, idx, -1), edges
@@ -0,0 +1,65 @@
+"""
+Canonical, cached data access shared by every dashboard page and app.
+
+One loader per dataset, each normalising its names exactly once (behind a
+Parquet snapshot, see ``kenya_dashboard.snapshot``) and cached with
+``st.cache_resource`` so that all sessions and pages of a process share a
+single in-memory copy.  Returned frames / GeoJSON dicts are shared objects:
+filter them, never modify them in place.
+"""
+from .buckets import price_buckets, price_buckets_async, warm_price_buckets
+from .competitors import load_comp, load_comp_text, reason_cards
+from .cube import by_region, kpi_cell, load_kpi_cube
+from .dims import canonical, entity_id
+from .geo import (FeatureCollection, county_geo_source, feature_keys, load_centroids,
+                  load_county_geo, load_territory_geo, territory_geo_source)
+from .gt import load_gt, load_gt_monthly, load_sku_gt
+from .mt import load_mt, load_mt_clusters
+from .reports import (brand_white_space, index_reports, load_population_pct, load_report,
+                      load_top_locations)
+from .rtm import (load_opportunity, load_point_density, load_points, load_rtm,
+                  load_rtm_monthly)
+from .tiles import vector_tiles
+from .version import data_version
+from .views import levels, mask, select
+
+__all__ = [
+    "FeatureCollection",
+    "brand_white_space",
+    "by_region",
+    "canonical",
+    "county_geo_source",
+    "data_version",
+    "entity_id",
+    "feature_keys",
+    "index_reports",
+    "kpi_cell",
+    "levels",
+    "load_centroids",
+    "load_comp",
+    "load_comp_text",
+    "load_county_geo",
+    "load_gt",
+    "load_gt_monthly",
+    "load_kpi_cube",
+    "load_mt",
+    "load_mt_clusters",
+    "load_opportunity",
+    "load_point_density",
+    "load_points",
+    "load_population_pct",
+    "load_report",
+    "load_rtm",
+    "load_rtm_monthly",
+    "load_sku_gt",
+    "load_territory_geo",
+    "load_top_locations",
+    "mask",
+    "price_buckets",
+    "price_buckets_async",
+    "reason_cards",
+    "select",
+    "territory_geo_source",
+    "vector_tiles",
+    "warm_price_buckets",
+]
@@ -0,0 +1,175 @@
+"""
+Price buckets of the SKU page, memoised per (market, brand, SKU).
+
+``price_buckets()`` answers from a process-wide LRU of at most
+``MAX_ENTRIES`` results, keyed by the filters and ``data_version()``, so every
+session shares the result of a filter combination once anyone has asked for
+it.
+
+The k-means runs in ``BUCKET_POOL``, a small process pool sized by
+``KENYA_BUCKET_WORKERS`` (default 2): ``price_buckets_async()`` slices the RTM
+panel on the calling thread, ships only the price / volume arrays to a worker
+and returns a future, so the page can draw its other panels while the
+clustering runs and collect the result last.  Requests for a key that is
+already being computed share its future.  Workers import only
+:mod:`kenya_dashboard.buckets` (NumPy), never Streamlit.
+
+``warm_price_buckets()`` starts a single background thread per process that
+walks all combinations present in the RTM panel after load, most general
+filters first, and fills the LRU ``WARM_BATCH`` combinations per task in a
+separate one-worker pool running at a lower CPU priority, so pre-warming
+never delays a page's own request.  The thread never touches Streamlit: the
+RTM frame and data version are fetched on the script thread and handed over.
+"""
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ..buckets import bucket_volumes, bucket_volumes_many
+from .rtm import load_rtm_monthly
+from .version import data_version
+from .views import select
+
+N_BUCKETS   = 4
+MAX_ENTRIES = 512
+WARM_BATCH  = 32
+ALL         = "ALL"
+
+# forking the threaded Streamlit server is not safe: workers fork from a
+# fork server that has imported the entry script and NumPy once
+_CONTEXT = multiprocessing.get_context("forkserver")
+_CONTEXT.set_forkserver_preload(["__main__", "kenya_dashboard.buckets"])
+BUCKET_POOL = ProcessPoolExecutor(max_workers=int(os.environ.get("KENYA_BUCKET_WORKERS", 2)),
+                                  mp_context=_CONTEXT)
+# background pre-warming, niced so it yields the CPU to page requests
+_WARM_POOL  = ProcessPoolExecutor(max_workers=1, mp_context=_CONTEXT,
+                                  initializer=os.nice, initargs=(10,))
+
+_MEMO: OrderedDict[tuple, pd.DataFrame | None] = OrderedDict()
+_PENDING: dict[tuple, Future] = {}
+_LOCK = threading.Lock()
+
+
+def _priced(rtm: pd.DataFrame) -> bool:
+    return {"AVERAGE_BASE_PRICE", "VOLUME"}.issubset(rtm.columns)
+
+
+def _slice(rtm: pd.DataFrame, market: str, brand: str,
+           sku: str) -> tuple[np.ndarray, np.ndarray]:
+    tmp = (select(rtm, REGION_NAME=market, BRAND=brand, SKU=sku)
+           .dropna(subset=["AVERAGE_BASE_PRICE", "VOLUME"]))
+    return tmp["AVERAGE_BASE_PRICE"].to_numpy(float), tmp["VOLUME"].to_numpy(float)
+
+
+def _bars(result: tuple[np.ndarray, np.ndarray] | None) -> pd.DataFrame | None:
+    if result is None:
+        return None
+    centers, volume = result
+    bars = pd.DataFrame({"Center": centers, "Volume": volume}).sort_values("Volume")
+    bars["Label"] = "₹" + bars["Center"].round().astype(int).astype(str)
+    return bars
+
+
+def _lookup(key: tuple) -> tuple[bool, pd.DataFrame | None]:
+    with _LOCK:
+        if key not in _MEMO:
+            return False, None
+        _MEMO.move_to_end(key)
+        return True, _MEMO[key]
+
+
+def _remember(key: tuple, bars: pd.DataFrame | None) -> None:
+    with _LOCK:
+        _MEMO[key] = bars
+        _MEMO.move_to_end(key)
+        while len(_MEMO) > MAX_ENTRIES:
+            _MEMO.popitem(last=False)
+
+
+def _settle(key: tuple, done: Future, job: Future) -> None:
+    try:
+        bars = _bars(job.result())
+    except BaseException as exc:
+        with _LOCK:
+            _PENDING.pop(key, None)
+        done.set_exception(exc)
+        return
+    _remember(key, bars)
+    with _LOCK:
+        _PENDING.pop(key, None)
+    done.set_result(bars)
+
+
+def price_buckets_async(market: str = ALL, brand: str = ALL, sku: str = ALL,
+                        k: int = N_BUCKETS) -> Future:
+    """Future of ``price_buckets(market, brand, sku, k)``, computed in ``BUCKET_POOL``.
+
+    Already finished when the result is memoised.
+    """
+    rtm = load_rtm_monthly()
+    key = (data_version(), market, brand, sku, k)
+    hit, bars = _lookup(key)
+    if hit or not _priced(rtm):
+        done = Future()
+        done.set_result(bars)
+        return done
+    with _LOCK:
+        if key in _PENDING:
+            return _PENDING[key]
+        done = _PENDING[key] = Future()
+    job = BUCKET_POOL.submit(bucket_volumes, *_slice(rtm, market, brand, sku), k)
+    job.add_done_callback(lambda job: _settle(key, done, job))
+    return done
+
+
+def price_buckets(market: str = ALL, brand: str = ALL, sku: str = ALL,
+                  k: int = N_BUCKETS) -> pd.DataFrame | None:
+    """Volume per optimal price bucket (``Center`` / ``Volume`` / ``Label``).
+
+    ``None`` when the slice has fewer than ``k`` distinct prices.
+    """
+    return price_buckets_async(market, brand, sku, k).result()
+
+
+def _combinations(rtm: pd.DataFrame):
+    keys = rtm[["REGION_NAME", "BRAND", "SKU"]].drop_duplicates()
+    seen = set()
+    # (ALL, ALL, ALL) first, fully specific slices last
+    for mask in sorted(itertools.product((True, False), repeat=3), key=sum, reverse=True):
+        for row in keys.itertuples(index=False):
+            combo = tuple(ALL if generic else val for generic, val in zip(mask, row))
+            if combo not in seen:
+                seen.add(combo)
+                yield combo
+
+
+@st.cache_resource(show_spinner=False)
+def warm_price_buckets() -> threading.Thread:
+    """Precompute ``price_buckets`` for every filter combination (once per process)."""
+    rtm, version = load_rtm_monthly(), data_version()
+
+    def run():
+        if not _priced(rtm):
+            return
+        # no more than the LRU holds: don't evict what we just computed
+        todo = [c for c in itertools.islice(_combinations(rtm), MAX_ENTRIES)
+                if not _lookup((version, *c, N_BUCKETS))[0]]
+        for start in range(0, len(todo), WARM_BATCH):
+            batch = todo[start:start + WARM_BATCH]
+            slices = [_slice(rtm, *combo) for combo in batch]
+            results = _WARM_POOL.submit(bucket_volumes_many, slices, N_BUCKETS).result()
+            for combo, result in zip(batch, results):
+                _remember((version, *combo, N_BUCKETS), _bars(result))
+
+    worker = threading.Thread(target=run, name="price-bucket-warmup", daemon=True)
+    worker.start()
+    return worker
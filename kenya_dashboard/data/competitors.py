@@ -0,0 +1,109 @@
+"""
+Competitor benchmarks: numeric share per (territory, brand, competitor) and
+the narrative "reasons for outperformance" export.
+
+The narrative cards of the Territory Deep Dive are rendered to HTML once,
+when the export is loaded (``Reason_HTML`` column, part of the snapshot);
+``reason_cards()`` then only joins pre-built strings.  Name columns are
+entity categoricals from the ``dims`` registry.
+"""
+from __future__ import annotations
+
+import html
+import re
+
+import pandas as pd
+import streamlit as st
+
+from ..snapshot import snapshot
+from .dims import STYLES, encode, register, styled
+from .paths import COMP_FILE, COMP_TEXT_FILE
+
+COMP_DIMS      = {"Territory": "territory", "BRAND": "brand", "Brand_STD": ("brand", "upper"),
+                  "Competitor": "competitor"}
+COMP_TEXT_DIMS = {"Territory": "territory", "Brand": "brand", "Competitor": "competitor"}
+
+
+def _read_comp() -> pd.DataFrame:
+    comp_df = pd.read_excel(COMP_FILE)
+    comp_df.columns = comp_df.columns.str.strip()
+    comp_df.rename(columns={"Market": "Territory"}, inplace=True)
+    return comp_df
+
+
+def _comp() -> pd.DataFrame:
+    return snapshot("comp", [COMP_FILE], _read_comp, version=1)
+
+
+@st.cache_resource(show_spinner="Loading competitor shares …")
+def load_comp() -> pd.DataFrame:
+    return encode(_comp(), COMP_DIMS)
+
+
+_BULLET = re.compile(r"^\s*(?:-|\•|\d+\)|\d+\.)\s+(.*)$")
+
+
+def reason_card_html(territory: str, raw) -> str:
+    """Raw multi-line reason text as a styled ``reason-card`` HTML block."""
+    raw = raw.strip() if isinstance(raw, str) else ""
+    paras, bullets = [], []
+    for ln in raw.splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        m = _BULLET.match(ln)
+        if m:
+            bullets.append(html.escape(m.group(1)))
+        else:
+            paras.append(html.escape(ln))
+
+    h = [f"<div class='reason-card'><h5>{html.escape(territory)}</h5>"]
+    if paras:
+        h.append("<p>" + " ".join(paras) + "</p>")
+    if bullets:
+        h.append("<ul>" + "".join(f"<li>{b}</li>" for b in bullets) + "</ul>")
+    h.append("</div>")
+    return "".join(h)
+
+
+def _read_comp_text() -> pd.DataFrame:
+    df = pd.read_csv(COMP_TEXT_FILE)
+    df.columns = df.columns.str.strip()
+    for col in ["Brand_Market_Share", "Competitor_Market_Share"]:
+        if col in df.columns:
+            df[col+"_num"] = (df[col].str.replace("%", "").astype(float)
+                                        .round(2).fillna(0))
+    reason = next((c for c in ("Reasons_Outperformance", "Reason") if c in df.columns), None)
+    raw = df[reason] if reason else pd.Series("", index=df.index)
+    df["Reason_HTML"] = [reason_card_html(styled(t, STYLES["territory"]), r)
+                         for t, r in zip(df["Territory"], raw)]
+    return df
+
+
+def _comp_text() -> pd.DataFrame:
+    return snapshot("comp_text", [COMP_TEXT_FILE], _read_comp_text, version=2)
+
+
+@st.cache_resource(show_spinner="Loading competitor-analysis text …")
+def load_comp_text() -> pd.DataFrame:
+    return encode(_comp_text(), COMP_TEXT_DIMS)
+
+
+register([COMP_FILE], COMP_DIMS, _comp)
+register([COMP_TEXT_FILE], COMP_TEXT_DIMS, _comp_text)
+
+
+@st.cache_resource(show_spinner=False)
+def _reason_index() -> dict[tuple, str]:
+    df = load_comp_text()
+    cards: dict[tuple, str] = {}
+    for keys in (["Brand", "Competitor", "Territory"], ["Brand", "Competitor"]):
+        cards |= (df.groupby(keys, observed=True, sort=False)["Reason_HTML"]
+                    .agg("".join).to_dict())
+    return cards
+
+
+def reason_cards(brand: str, competitor: str, territory: str | None = None) -> str:
+    """Concatenated narrative cards for a brand / competitor (one territory or all)."""
+    key = (brand, competitor) if territory is None else (brand, competitor, territory)
+    return _reason_index().get(key, "")
@@ -0,0 +1,98 @@
+"""
+Pre-aggregated KPI cube behind the Main / MT dashboard filters.
+
+Every (brand, region) combination – plus ``"All"`` roll-ups on either axis –
+is aggregated once per process, so a filter change is an index lookup
+instead of a copy → filter → groupby pipeline:
+
+    cube = load_kpi_cube("GT")
+    cube.loc[("Ushindi Bar", "Nairobi")]     # KPI strip for one cell
+    cube.loc["All"].drop("All")              # per-region bars for all brands
+
+Columns: ``White Space Score`` / ``Client Market Share`` /
+``Competitor Strength`` (means) and ``ERP GT Sales Coverage`` (sum).  Means
+are taken over the underlying rows, never averaged from finer cells.
+
+Shares are stored as fractions or percent, whatever the source holds, and
+scaled to percent per *view*, as the pages always did: ``kpi_cell`` scales
+the cell's rows when their maximum is at most 1 (hence the ``… max`` /
+``… %`` / ``… ~`` helper columns), ``by_region`` scales the per-region
+means when theirs is.
+"""
+from __future__ import annotations
+
+from typing import Literal
+
+import pandas as pd
+import streamlit as st
+
+from .gt import load_gt
+from .mt import COMP_COL, CS_COL, SALES_COL, WS_COL, load_mt
+
+ALL = "All"
+REGION_COL = {"GT": "Territory", "MT": "County"}
+_AGG = {WS_COL: "mean", CS_COL: "mean", COMP_COL: "mean", SALES_COL: "sum"}
+SHARES = (CS_COL, COMP_COL)
+KPIS = list(_AGG)
+
+
+def _percent(s: pd.Series) -> pd.Series:
+    return (s*100 if s.max() <= 1 else s).round(2)
+
+
+def _share_aggregates(df: pd.DataFrame) -> tuple[dict[str, pd.Series], dict[str, str]]:
+    """Row-level helper columns that let a cell reproduce ``_percent(rows).mean()``."""
+    cols, agg = {}, {}
+    for c in SHARES:
+        cols |= {f"{c} max": df[c], f"{c} %": (df[c]*100).round(2), f"{c} ~": df[c].round(2)}
+        agg  |= {f"{c} max": "max", f"{c} %": "mean", f"{c} ~": "mean"}
+    return cols, agg
+
+
+def build_kpi_cube(df: pd.DataFrame, region: str) -> pd.DataFrame:
+    """``(Brand, region)``-indexed aggregates of ``df`` incl. ``"All"`` roll-ups."""
+    helpers, helper_agg = _share_aggregates(df)
+    agg  = _AGG | helper_agg
+    d    = df[["Brand", region, *_AGG]].assign(**helpers)
+    both   = d.groupby(["Brand", region], observed=True).agg(agg)
+    brand  = d.groupby("Brand", observed=True).agg(agg).assign(**{region: ALL}).set_index(region, append=True)
+    reg    = (d.groupby(region, observed=True).agg(agg).assign(Brand=ALL)
+               .set_index("Brand", append=True).swaplevel())
+    total  = pd.DataFrame([d.agg(agg)],
+                          index=pd.MultiIndex.from_tuples([(ALL, ALL)], names=["Brand", region]))
+    cube = pd.concat([both, brand, reg, total]).sort_index()
+    cube.index.names = ["Brand", region]
+    return cube
+
+
+def kpi_cell(cube: pd.DataFrame, brand: str = ALL, region: str = ALL) -> pd.Series:
+    """KPI row for one filter combination, shares in percent (all-NaN if no rows)."""
+    try:
+        cell = cube.loc[(brand, region)]
+    except KeyError:
+        return pd.Series(float("nan"), index=KPIS)
+    kpi = cell[KPIS].copy()
+    for c in SHARES:
+        kpi[c] = cell[f"{c} %"] if cell[f"{c} max"] <= 1 else cell[f"{c} ~"]
+    return kpi
+
+
+def by_region(cube: pd.DataFrame, brand: str = ALL) -> pd.DataFrame:
+    """One row per region for ``brand`` (region as a column, roll-up dropped).
+
+    Shares are scaled to percent over these rows; a brand without rows gives
+    an empty frame.
+    """
+    try:
+        view = cube.loc[brand, KPIS]
+    except KeyError:
+        view = cube[KPIS].iloc[:0].droplevel("Brand")
+    view = view.drop(ALL, errors="ignore")
+    return view.assign(**{c: _percent(view[c]) for c in SHARES}).reset_index()
+
+
+@st.cache_resource(show_spinner=False)
+def load_kpi_cube(source: Literal["GT", "MT"]) -> pd.DataFrame:
+    """KPI cube over ``load_gt()`` (by Territory) or ``load_mt()`` (by County)."""
+    df = load_gt() if source == "GT" else load_mt()
+    return build_kpi_cube(df, REGION_COL[source])
@@ -0,0 +1,176 @@
+"""
+Entity registry: one canonical name and integer id per territory, county,
+brand, competitor, SKU, cluster … shared by every frame and the GeoJSON.
+
+Names are matched on a *key* that ignores case, spacing and punctuation, so
+``"TAITA TAVETA"`` / ``"Taita-Taveta"``, ``"Tharaka - Nithi"`` /
+``"Tharaka-Nithi"``, ``"Murang'a"`` / ``"MURANG’A"`` or ``"SAWA  SOAP"`` /
+``"Sawa Soap"`` are the same entity.  Each *dimension* keeps the sorted
+canonical names of its entities; an entity's id is its position in that list.
+There is one dimension per kind of entity: the GT brief's ``Brand`` and the
+RTM panel's upper-case ``BRAND`` are both ``"brand"`` and share its ids; a
+column only chooses how the names are spelt (``("brand", "upper")``).
+
+Frames serve their name columns as pandas categoricals over these lists, so
+the category codes *are* the entity ids:
+
+* ``df["Brand"] == brand`` and ``views.mask`` compare integer codes,
+* dropdown options come straight from the registry (``views.levels``),
+* frames merge / ``isin`` on identical dtypes, i.e. join on ids – a name
+  spelt differently in two files can no longer silently miss,
+* each name is stored once per process instead of once per row.
+
+Loaders declare their columns with ``register()`` and wrap their frame in
+``encode()``, which canonicalises each *distinct* value once.  The registry
+is collected from every registered frame – GeoJSON names first, they win
+the spelling – and kept as a JSON snapshot beside the Parquet ones, rebuilt
+whenever one of the underlying files changes.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+import warnings
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ..snapshot import snapshot_json
+
+Column  = str | tuple[str, str | None]       # dimension, or (dimension, case style)
+Columns = dict[str, Column]                  # column → dimension
+
+# how each dimension spells its canonical names (None = as first seen)
+STYLES: dict[str, str | None] = {
+    "territory": "title", "county": "title", "brand": "title", "competitor": "title",
+    "sku": "upper", "cluster": None, "colour": None, "subcategory": None,
+}
+REGISTRY_VERSION = 2
+
+_FRAMES: list[tuple[bool, tuple[Path, ...], Columns, Callable[[], pd.DataFrame]]] = []
+
+_PUNCT = str.maketrans({"’": "'", "‘": "'", "`": "'", "´": "'", "–": "-", "—": "-", "‐": "-"})
+_SPACE = re.compile(r"\s+")
+_DASH  = re.compile(r"\s*-\s*")
+_WORD  = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+
+def clean(name: str) -> str:
+    """Unicode-, quote-, dash- and whitespace-normalised ``name``."""
+    name = unicodedata.normalize("NFKC", str(name)).translate(_PUNCT)
+    return _DASH.sub("-", _SPACE.sub(" ", name)).strip()
+
+
+def match_key(name: str) -> str:
+    """What two spellings of one entity have in common."""
+    return re.sub(r"[\W_]", "", clean(name).casefold())
+
+
+def styled(name: str, style: str | None) -> str:
+    """``clean(name)`` in a dimension's case style (``Murang'a``, not ``Murang'A``)."""
+    name = clean(name)
+    if style == "upper":
+        return name.upper()
+    if style == "title":
+        return _WORD.sub(lambda m: m.group(0).capitalize(), name.lower())
+    return name
+
+
+def _split(column: Column) -> tuple[str, str | None]:
+    """``(dimension, case style)`` of a column declaration."""
+    return column if isinstance(column, tuple) else (column, STYLES.get(column))
+
+
+def register(sources: Iterable[str | Path], columns: Columns,
+             frame: Callable[[], pd.DataFrame], *, primary: bool = False) -> None:
+    """Declare that ``frame()`` (read from ``sources``) carries ``columns``.
+
+    Names from ``primary`` frames (the GeoJSON) fix the canonical spelling.
+    """
+    _FRAMES.append((primary, tuple(Path(s) for s in sources), columns, frame))
+
+
+def _frames():
+    from . import competitors, geo, gt, mt, rtm  # noqa: F401  (register their frames)
+    return sorted(_FRAMES, key=lambda f: not f[0])
+
+
+def _collect() -> dict[str, list[str]]:
+    names: dict[str, dict[str, str]] = {}            # dim → key → canonical name
+    for _, sources, columns, frame in _frames():
+        if not all(s.exists() for s in sources):
+            continue
+        df = frame()
+        for col, column in columns.items():
+            if col not in df.columns:
+                continue
+            dim  = _split(column)[0]
+            seen = names.setdefault(dim, {})
+            for value in df[col].dropna().unique():
+                key = match_key(value)
+                if key and key not in seen:
+                    seen[key] = styled(value, STYLES.get(dim))
+    return {dim: sorted(seen.values()) for dim, seen in names.items()}
+
+
+class Dimension(NamedTuple):
+    dtype: pd.CategoricalDtype               # categories = canonical names
+    ids:   dict[str, int]                    # match key → entity id (category code)
+
+
+@st.cache_resource(show_spinner=False)
+def load_dimensions() -> dict[str, Dimension]:
+    """The entity registry, one ``Dimension`` per dimension."""
+    sources = sorted({s for _, srcs, _, _ in _frames() for s in srcs if s.exists()})
+    vocab = snapshot_json("dimensions", sources, _collect, version=REGISTRY_VERSION)
+    return {dim: Dimension(pd.CategoricalDtype(names),
+                           {match_key(n): i for i, n in enumerate(names)})
+            for dim, names in vocab.items()}
+
+
+def entity_id(dim: str, name: str) -> int:
+    """Id of ``name`` in dimension ``dim`` under any spelling (``-1`` if unknown)."""
+    d = load_dimensions().get(dim)
+    return -1 if d is None else d.ids.get(match_key(name), -1)
+
+
+def canonical(dim: str, name: str) -> str | None:
+    """Canonical spelling of ``name`` in ``dim`` (``None`` if unknown)."""
+    i = entity_id(dim, name)
+    return None if i < 0 else load_dimensions()[dim].dtype.categories[i]
+
+
+def encode(df: pd.DataFrame, columns: Columns) -> pd.DataFrame:
+    """``df`` with ``columns`` as categoricals over their dimension's entities.
+
+    The codes are the entity ids whatever the column's case style; only the
+    category labels are re-spelt.
+    """
+    dims = load_dimensions()
+    cast = {}
+    for col, column in columns.items():
+        if col not in df.columns:
+            continue
+        dim, style = _split(column)
+        codes, uniques = pd.factorize(df[col])
+        d = dims.get(dim)
+        ids = np.array([-1 if d is None else d.ids.get(match_key(u), -1) for u in uniques],
+                       dtype=np.intp)
+        unknown = [u for u, i in zip(uniques, ids) if i < 0 and match_key(u)]
+        if unknown:
+            warnings.warn(f"'{col}' has names unknown to the '{dim}' registry "
+                          f"({unknown[:3]} …); using a frame-local dictionary", RuntimeWarning)
+            local = {match_key(u): styled(u, style) for u in uniques if match_key(u)}
+            dtype = pd.CategoricalDtype(sorted(set(local.values())))
+            ids = np.array([dtype.categories.get_loc(local[match_key(u)]) if match_key(u) else -1
+                            for u in uniques], dtype=np.intp)
+        elif style == STYLES.get(dim):
+            dtype = d.dtype
+        else:
+            dtype = pd.CategoricalDtype([styled(n, style) for n in d.dtype.categories])
+        ids = np.append(ids, -1)                     # factorize's NaN code -1 → -1
+        cast[col] = pd.Categorical.from_codes(ids[codes], dtype=dtype)
+    return df.assign(**cast)
@@ -0,0 +1,224 @@
+"""
+County / territory GeoJSON with a normalised join key on every feature.
+
+* counties     →  ``properties.COUNTY_KEY``  (canonical ``COUNTY_NAM``)
+* territories  →  ``properties.TERR_KEY``    (canonical ``TERRITORY``)
+
+The GeoJSON names are the primary source of the ``dims`` entity registry, so
+every frame's ``County`` / ``Territory`` is spelt exactly like these keys.
+
+Pass the figure's mapbox ``zoom`` to get the matching pre-simplified level
+(see :mod:`kenya_dashboard.geometry`); without it the full-resolution file is
+returned, which is what geometric calculations (centroids, areas) need.
+
+Figures should take their ``geojson=`` from ``county_geo_source()`` /
+``territory_geo_source()`` instead.  With ``server.enableStaticServing`` on,
+these return the URL of a content-hashed file under ``static/geo/``; Plotly
+fetches it once and keeps it for the rest of the browser session, so reruns
+only ship the per-feature values.  Without static serving they fall back to
+the (simplified, optionally key-filtered) collection itself.
+
+``keys=`` only narrows that embedded fallback.  With static serving (the
+shipped ``.streamlit/config.toml``) every map of a level references the one
+full file – publishing each key set as its own file would make the browser
+download geometry again per zero-score set or territory – so the figure's
+``locations=`` decides what is drawn, and callers passing ``keys`` must pass
+the same keys as ``locations``.  The key-subset memo below therefore only
+serves the fallback.
+
+Each loaded level is indexed once by its key (``COUNTY_KEY`` / ``TERR_KEY``
+→ feature positions).  ``feature_keys()`` returns the per-feature keys as a
+shared tuple, and key-filtered collections (zero-score sets, the counties of
+one territory, a territory outline) are gathered from the index in O(k) and
+memoised per key set, so repeated requests share one cached object.  Index
+and subsets live in ``st.cache_resource`` next to the collections they point
+into: ``st.cache_resource.clear()`` (a data reload) drops them together.
+
+Centroids, bounding boxes and areas come from ``load_centroids()``, which
+reads the prebuilt ``geo_centroids.csv`` (see ``write_centroids``) instead of
+projecting the polygons at runtime.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable, Literal
+
+import pandas as pd
+import streamlit as st
+
+from ..geometry import (GEOMETRY_VERSION, RESOLUTIONS, SHAPE_COLUMNS,
+                        resolution_for_zoom, shape_table, simplify)
+from ..snapshot import snapshot_json, staged
+from .dims import STYLES, encode, register, styled
+from .paths import CENTROIDS_FILE, COUNTY_GJ, STATIC_DIR, TERR_GJ
+
+FeatureCollection = dict[str, Any]
+
+
+def _read_county_geo() -> FeatureCollection:
+    geo = json.loads(COUNTY_GJ.read_text("utf-8"))
+    for f in geo["features"]:
+        nm = f["properties"].get("COUNTY_NAM") or f["properties"].get("NAME", "")
+        f["properties"]["COUNTY_KEY"] = styled(nm, STYLES["county"]) if nm else ""
+    return geo
+
+
+def _read_territory_geo() -> FeatureCollection:
+    terr = json.loads(TERR_GJ.read_text("utf-8"))
+    for f in terr["features"]:
+        f["properties"]["TERR_KEY"] = styled(f["properties"]["TERRITORY"], STYLES["territory"])
+    return terr
+
+
+def _level(name: str, src, read, level: str | None) -> FeatureCollection:
+    if level is None:
+        return read()
+    _, tolerance, decimals = RESOLUTIONS[level]
+    return snapshot_json(f"{name}_{level}", [src],
+                         lambda: simplify(read(), tolerance, decimals),
+                         version=GEOMETRY_VERSION)
+
+
+@st.cache_resource(show_spinner="Loading county GeoJSON …")
+def _county_geo(level: str | None) -> FeatureCollection:
+    if not COUNTY_GJ.exists():
+        st.error(f"❌ {COUNTY_GJ.name} not found"); st.stop()
+    return _level("geo_county", COUNTY_GJ, _read_county_geo, level)
+
+
+@st.cache_resource(show_spinner="Loading territory GeoJSON …")
+def _territory_geo(level: str | None) -> FeatureCollection:
+    return _level("geo_territory", TERR_GJ, _read_territory_geo, level)
+
+
+def load_county_geo(zoom: float | None = None) -> FeatureCollection:
+    """County polygons, simplified for ``zoom`` when given."""
+    return _county_geo(resolution_for_zoom(zoom))
+
+
+def load_territory_geo(zoom: float | None = None) -> FeatureCollection:
+    """Territory polygons, simplified for ``zoom`` when given."""
+    return _territory_geo(resolution_for_zoom(zoom))
+
+
+def _feature_keys(read, key: str) -> pd.DataFrame:
+    return pd.DataFrame({key: [f["properties"][key] for f in read()["features"]]})
+
+
+register([COUNTY_GJ], {"COUNTY_KEY": "county"},
+         lambda: _feature_keys(_read_county_geo, "COUNTY_KEY"), primary=True)
+register([TERR_GJ], {"TERR_KEY": "territory"},
+         lambda: _feature_keys(_read_territory_geo, "TERR_KEY"), primary=True)
+
+
+# ── centroids / extents / areas ────────────────────────────────────
+_KEYS = {"county": "COUNTY_KEY", "territory": "TERR_KEY"}
+
+
+def _build_centroids() -> pd.DataFrame:
+    parts = [pd.DataFrame(shape_table(read(), _KEYS[level])).assign(LEVEL=level)
+             for level, read in (("county", _read_county_geo),
+                                 ("territory", _read_territory_geo))]
+    return pd.concat(parts, ignore_index=True)[["LEVEL", "KEY", *SHAPE_COLUMNS]]
+
+
+def write_centroids(path: Path = CENTROIDS_FILE) -> pd.DataFrame:
+    """(Re)build the centroid table from the full-resolution GeoJSON."""
+    df = _build_centroids()
+    df.round(6).to_csv(path, index=False)
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def load_centroids(level: Literal["county", "territory"]) -> pd.DataFrame:
+    """Centroid (``lon`` / ``lat``), bbox and ``area_km2`` per county / territory.
+
+    Keyed by ``COUNTY_KEY`` / ``TERR_KEY`` like the GeoJSON features (entity
+    categoricals, so frames join on ids).  Built in-process (still without
+    geopandas) if the table has not been generated.
+    """
+    df = pd.read_csv(CENTROIDS_FILE) if CENTROIDS_FILE.exists() else _build_centroids()
+    key = _KEYS[level]
+    df = (df[df["LEVEL"] == level].drop(columns="LEVEL")
+            .rename(columns={"KEY": key}).reset_index(drop=True))
+    return encode(df, {key: level})
+
+
+# ── browser-side geometry ───────────────────────────────────────────
+@st.cache_resource
+def _publish(stem: str, _fc: FeatureCollection) -> str:
+    """Write ``_fc`` once to ``static/geo/`` and return its relative URL."""
+    body = json.dumps(_fc, separators=(",", ":")).encode("utf-8")
+    name = f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}.geojson"
+    path = STATIC_DIR / "geo" / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with staged(path) as tmp:
+            tmp.write_bytes(body)
+            tmp.chmod(0o644)                 # served as a static file
+    return f"app/static/geo/{name}"
+
+
+# ── keyed feature index ─────────────────────────────────────────────
+_GEO = {"county": _county_geo, "territory": _territory_geo}
+
+
+@st.cache_resource(show_spinner=False)
+def _index(level: str, res: str | None) -> dict[str, tuple[int, ...]]:
+    """Key → positions of its features in the ``level`` / ``res`` collection."""
+    pos: dict[str, list[int]] = {}
+    for i, f in enumerate(_GEO[level](res)["features"]):
+        pos.setdefault(f["properties"][_KEYS[level]], []).append(i)
+    return {k: tuple(v) for k, v in pos.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def _index_keys(level: str, res: str | None) -> tuple[str, ...]:
+    return tuple(f["properties"][_KEYS[level]] for f in _GEO[level](res)["features"])
+
+
+def feature_keys(level: Literal["county", "territory"],
+                 zoom: float | None = None) -> tuple[str, ...]:
+    """Key of every feature, in file order (``locations=`` of a full map)."""
+    return _index_keys(level, resolution_for_zoom(zoom))
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _subset(level: str, res: str | None, keys: tuple[str, ...]) -> FeatureCollection:
+    features = _GEO[level](res)["features"]
+    index = _index(level, res)
+    pos = sorted(i for k in keys for i in index.get(k, ()))
+    return {"type": "FeatureCollection", "features": [features[i] for i in pos]}
+
+
+def _source(level: str, zoom: float | None,
+            keys: Iterable[str] | None) -> FeatureCollection | str:
+    res = resolution_for_zoom(zoom)
+    if st.get_option("server.enableStaticServing"):
+        # one file per level for the session; ``keys`` are left to locations=
+        return _publish(f"{level}_{res or 'full'}", _GEO[level](res))
+    if keys is None:
+        return _GEO[level](res)
+    return _subset(level, res, tuple(sorted(set(keys))))
+
+
+def county_geo_source(zoom: float | None = None,
+                      keys: Iterable[str] | None = None) -> FeatureCollection | str:
+    """``geojson=`` argument for county figures (URL or collection).
+
+    ``keys`` filters the embedded collection only; a URL always covers every
+    feature, so draw just ``keys`` through ``locations=``.
+    """
+    return _source("county", zoom, keys)
+
+
+def territory_geo_source(zoom: float | None = None,
+                         keys: Iterable[str] | None = None) -> FeatureCollection | str:
+    """``geojson=`` argument for territory figures (URL or collection).
+
+    ``keys`` filters the embedded collection only; a URL always covers every
+    feature, so draw just ``keys`` through ``locations=``.
+    """
+    return _source("territory", zoom, keys)
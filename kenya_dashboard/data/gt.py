@@ -0,0 +1,82 @@
+"""
+GT (general trade) KPI data.
+
+``load_gt`` is the canonical territory × brand frame: ``Territory`` / ``Brand``
+title-cased, ``TERR_KEY`` joining onto the territory GeoJSON.  The SKU page's
+upper-case ``MARKET`` / ``BRAND`` / ``CLUSTER`` view is derived from it rather
+than parsed from the workbook a second time.  Name columns are entity
+categoricals from the ``dims`` registry.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import streamlit as st
+
+from ..snapshot import snapshot
+from .dims import encode, register
+from .paths import GT_FILE, GT_MONTHLY_FILE
+
+GT_DIMS         = {"Territory": "territory", "TERR_KEY": "territory",
+                   "Brand": "brand", "SKU_CLUSTER": "cluster"}
+SKU_GT_DIMS     = {"MARKET": ("territory", "upper"), "BRAND": ("brand", "upper"),
+                   "CLUSTER": ("cluster", "upper"), "SKU": "sku"}
+GT_MONTHLY_DIMS = {"REGION_NAME": ("territory", "upper"), "BRAND": ("brand", "upper"),
+                   "SKU": "sku", "Cluster": "cluster"}
+
+
+def _read_gt() -> pd.DataFrame:
+    gt = (pd.read_excel(GT_FILE)
+          .rename(columns=str.strip)
+          .rename(columns={"brand": "Brand", "Markets": "Territory"}))
+    gt["TERR_KEY"]  = gt["Territory"]
+    gt["ERP/NEILSEN"] = pd.to_numeric(gt["ERP/NEILSEN"], errors="coerce")   # "#DIV/0!" cells
+    return gt
+
+
+def _gt() -> pd.DataFrame:
+    return snapshot("gt", [GT_FILE], _read_gt, version=2)
+
+
+@st.cache_resource(show_spinner="Loading GT KPIs …")
+def load_gt() -> pd.DataFrame:
+    return encode(_gt(), GT_DIMS)
+
+
+def _sku_view(gt: pd.DataFrame) -> pd.DataFrame:
+    df = gt.rename(columns={
+        "SKU_CLUSTER": "CLUSTER", "Market_Share": "SHARE_PCT",
+        "Total_brand": "SALES_VAL", "avg_price": "AVG_PRICE",
+    })
+    # upper-cased by encode (SKU_GT_DIMS); missing clusters stay missing
+    df["MARKET"]  = df["Territory"]
+    df["BRAND"]   = df["Brand"]
+    df["SKU"]     = df["SKU"] if "SKU" in df.columns else ""
+    df["SHARE_PCT"]   = pd.to_numeric(df["SHARE_PCT"], errors="coerce").fillna(0)
+    df["BUBBLE_SIZE"] = (df["SHARE_PCT"]*100).clip(lower=1)*20
+    df["SHARE_LABEL"] = (df["SHARE_PCT"]*100).round(1).astype(str) + "%"
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def load_sku_gt() -> pd.DataFrame:
+    """GT in the SKU page's vocabulary (upper-case keys, share / bubble cols)."""
+    return encode(_sku_view(load_gt()), SKU_GT_DIMS)
+
+
+def _read_gt_monthly() -> pd.DataFrame:
+    return pd.read_csv(GT_MONTHLY_FILE)
+
+
+def _gt_monthly() -> pd.DataFrame:
+    return snapshot("gt_monthly", [GT_MONTHLY_FILE], _read_gt_monthly, version=1)
+
+
+@st.cache_resource(show_spinner="Loading GT monthly …")
+def load_gt_monthly() -> pd.DataFrame:
+    """Monthly GT SKU panel (``REGION_NAME`` / ``BRAND`` / ``SKU`` upper-cased)."""
+    return encode(_gt_monthly(), GT_MONTHLY_DIMS)
+
+
+register([GT_FILE], GT_DIMS, _gt)
+register([GT_FILE], SKU_GT_DIMS, lambda: _sku_view(_gt()))
+register([GT_MONTHLY_FILE], GT_MONTHLY_DIMS, _gt_monthly)
@@ -0,0 +1,68 @@
+"""
+MT (modern trade) county-level data: white-space KPIs and SKU-cluster volumes.
+Name columns are entity categoricals from the ``dims`` registry.
+"""
+from __future__ import annotations
+
+import pandas as pd
+import streamlit as st
+
+from ..snapshot import snapshot
+from .dims import encode, register
+from .paths import MT_CLUSTER_FILE, MT_FILE
+
+WS_COL    = "White Space Score"
+CS_COL    = "Client Market Share"
+COMP_COL  = "Competitor Strength"
+SALES_COL = "ERP GT Sales Coverage"
+
+MT_DIMS          = {"County": "county", "COUNTY_KEY": "county", "Brand": "brand"}
+MT_CLUSTERS_DIMS = {"County": "county", "Brand": "brand",
+                    "SKU_CLUSTER": "cluster", "Cluster": "colour"}
+
+
+def _read_mt() -> pd.DataFrame:
+    df = pd.read_excel(MT_FILE)
+    df.columns = df.columns.str.strip()
+    df.rename(columns={"BRAND": "Brand"}, inplace=True, errors="ignore")
+    df["CATEGORY"] = df["CATEGORY"].astype(str).str.title().str.strip()
+    df["COUNTY_KEY"] = df["County"]
+    for c in [WS_COL, CS_COL, COMP_COL, SALES_COL]:
+        if c not in df.columns:
+            st.error(f"Column “{c}” missing in {MT_FILE.name}"); st.stop()
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    return df
+
+
+def _mt() -> pd.DataFrame:
+    return snapshot("mt", [MT_FILE], _read_mt, version=1)
+
+
+@st.cache_resource(show_spinner="Loading MT KPIs …")
+def load_mt() -> pd.DataFrame:
+    if not MT_FILE.exists():
+        st.error(f"❌ {MT_FILE.name} not found"); st.stop()
+    return encode(_mt(), MT_DIMS)
+
+
+def _read_mt_clusters() -> pd.DataFrame:
+    df = pd.read_excel(MT_CLUSTER_FILE)
+    df.columns = df.columns.str.strip()
+    df.rename(columns={"brand_qty_1": "Volume", "BRAND": "Brand"}, inplace=True, errors="ignore")
+    df["Cluster"] = df["SKU_CLUSTER"].str.extract(r"^(\w+)", expand=False).str.title()
+    df["Volume"]  = pd.to_numeric(df["Volume"], errors="coerce").fillna(0)
+    return df
+
+
+def _mt_clusters() -> pd.DataFrame:
+    return snapshot("mt_clusters", [MT_CLUSTER_FILE], _read_mt_clusters, version=1)
+
+
+@st.cache_resource(show_spinner="Loading cluster bubbles …")
+def load_mt_clusters() -> pd.DataFrame:
+    """County × SKU-cluster volumes behind the MT bubble map."""
+    return encode(_mt_clusters(), MT_CLUSTERS_DIMS)
+
+
+register([MT_FILE], MT_DIMS, _mt)
+register([MT_CLUSTER_FILE], MT_CLUSTERS_DIMS, _mt_clusters)
@@ -0,0 +1,38 @@
+"""
+Input files of the dashboards, resolved against the repository root so the
+apps work no matter which directory ``streamlit run`` is started from.
+"""
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# ── GT / MT KPI workbooks ───────────────────────────────────────────
+GT_FILE          = ROOT / "GT_DATA_122_merged_filled.xlsx"
+GT_MONTHLY_FILE  = ROOT / "GT_Monthly_Clustered_2_Standardized.csv"
+MT_FILE          = ROOT / "MT_WHITE_SPACE_SCORE_CLEANED.xlsx"
+MT_CLUSTER_FILE  = ROOT / "MT_CLUSTER_2_With_County.xlsx"
+
+# ── RTM / distributor data ──────────────────────────────────────────
+RTM_FILE         = ROOT / "rtm_std_follow_GT_final (1).csv"
+RTM_MONTHLY_FILE = ROOT / "RTM_MONTH DATA.csv"
+OPPORTUNITY_FILE = ROOT / "Merged_Data_with_Opportunity_Score.csv"
+POINTS_FILE      = ROOT / "rtm_lat_log.xlsx"
+
+# ── competitor benchmarks ───────────────────────────────────────────
+COMP_FILE        = ROOT / "PWANI_COMP_STD_final_confirmed.xlsx"
+COMP_TEXT_FILE   = ROOT / "all_brands_competitive_analysis_20250530_140609.csv"
+
+# ── geometry ────────────────────────────────────────────────────────
+COUNTY_GJ        = ROOT / "kenya.geojson"
+TERR_GJ          = ROOT / "kenya_territories (1).geojson"
+CENTROIDS_FILE   = ROOT / "geo_centroids.csv"      # built by kenya_dashboard.geometry
+
+# ── Export & Report page ────────────────────────────────────────────
+POP_PCT_FILE     = ROOT / "data_files" / "Province Percentage 250410 (1) (1).xlsx"
+TOP_LOC_FILE     = ROOT / "data_files" / "Top_3_Brand_Locations.csv"
+MD_DIR           = ROOT / "md_files"
+REPORTS_DIR      = ROOT / "Reports"
+
+# ── browser assets (served at app/static/… with enableStaticServing) ─
+STATIC_DIR       = ROOT / "static"
+TILE_DIR         = STATIC_DIR / "tiles"             # built by kenya_dashboard.tiles
@@ -0,0 +1,176 @@
+"""
+Inputs of the Export & Report page (population split, top locations, WS,
+brand markdown reports).
+
+The report keys (md_files/<BRAND>.md, Reports/<BRAND> <TERR>.pdf, the CSV /
+Excel columns below) use the upper-case brand names of the raw GT workbook,
+whitespace-normalised like the ``dims`` registry (``SAWA  SOAP`` → ``SAWA SOAP``).
+
+Brand markdown is parsed once into a structured record (``parse_report``)
+and kept in an index under the snapshot directory, keyed by file name and
+invalidated by size + mtime.  ``load_report(brand)`` is a dictionary lookup
+unless that one file changed; a new or edited markdown re-indexes only
+itself.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import streamlit as st
+
+from ..snapshot import SNAPSHOT_DIR, snapshot, staged
+from .dims import clean
+from .gt import load_gt
+from .paths import MD_DIR, POP_PCT_FILE, TOP_LOC_FILE
+
+
+def _read_population_pct() -> pd.DataFrame:
+    return pd.read_excel(POP_PCT_FILE).rename(columns=clean)
+
+
+@st.cache_resource(show_spinner="Loading population split …")
+def load_population_pct() -> pd.DataFrame:
+    """Territory population + % target-audience fit per brand column."""
+    return snapshot("population_pct", [POP_PCT_FILE], _read_population_pct, version=1)
+
+
+@st.cache_data(show_spinner=False)
+def load_top_locations() -> dict[tuple[str, str], str]:
+    """``(TERRITORY, BRAND) → "LOC A,LOC B,…"`` from the top-3 locations CSV."""
+    df = pd.read_csv(TOP_LOC_FILE)
+    df[["Territory", "Brand"]] = df[["Territory", "Brand"]].map(clean)
+    return (df.groupby(["Territory", "Brand"])["Top 3 Performing Location"]
+              .agg(",".join).to_dict())
+
+
+def white_space_by_brand(gt: pd.DataFrame) -> pd.Series:
+    """Mean White Space Score per report brand of a ``load_gt()`` frame.
+
+    ``load_gt`` title-cases the brands; the index is mapped back to the
+    upper-case report brand names.
+    """
+    return (gt.groupby(gt["Brand"].str.upper())["White Space Score"]
+              .mean().round(2))
+
+
+@st.cache_resource(show_spinner=False)
+def brand_white_space() -> pd.Series:
+    """``white_space_by_brand(load_gt())``, once per process."""
+    return white_space_by_brand(load_gt())
+
+
+# ── brand markdown index ────────────────────────────────────────────
+REPORT_INDEX  = SNAPSHOT_DIR / "md_reports.json"
+INDEX_VERSION = 2
+
+_SUMMARY   = re.compile(r"## 1. Executive Summary\s*(.*?)(?=\n##|\Z)", re.DOTALL)
+_TERR_HEAD = re.compile(r"^### ([A-Z][A-Z ]*)$", re.MULTILINE)
+_TERR_END  = re.compile(r"\n### [A-Z ]")
+_WS        = re.compile(r"\*\*White Space Score\*\*:\s*([\d.]+)")
+_CS        = re.compile(r"\*\*Client Share\*\*:\s*([\d.]+)%")
+_INSIGHTS  = re.compile(r"### Insights\s*(.*?)(?=\n###|\n##|\Z)", re.DOTALL)
+
+
+def _metrics_table(summary: str) -> dict[str, list]:
+    """First pipe table of the executive summary as ``{"columns", "rows"}``."""
+    lines = [ln.strip() for ln in summary.splitlines() if ln.strip().startswith("|")]
+    cells = [[c.strip() for c in ln.strip("|").split("|")] for ln in lines
+             if not set(ln) <= set("|-: ")]
+    if not cells:
+        return {"columns": [], "rows": []}
+    return {"columns": cells[0], "rows": cells[1:]}
+
+
+def parse_report(text: str) -> dict[str, Any]:
+    """Structured record of one brand markdown report.
+
+    ``summary`` (executive summary text), ``metrics`` (its metric table) and
+    per upper-case ``### TERRITORY`` section the ``white_space`` /
+    ``client_share`` strings (``"58.47 %"``), the joined ``insights`` and
+    the raw section ``text``.
+    """
+    m = _SUMMARY.search(text)
+    summary = m.group(1).strip() if m else ""
+
+    territories: dict[str, dict[str, Any]] = {}
+    for head in _TERR_HEAD.finditer(text):
+        name = head.group(1).strip()
+        if name in territories:
+            continue                              # first section wins
+        end   = _TERR_END.search(text, head.end())
+        block = text[head.start():end.start() if end else len(text)].strip()
+        ws, cs = _WS.search(block), _CS.search(block)
+        territories[name] = {
+            "white_space":  ws.group(1) + " %" if ws else None,
+            "client_share": cs.group(1) + " %" if cs else None,
+            "insights": " ".join(" ".join(i.strip().split())
+                                 for i in _INSIGHTS.findall(block)),
+            "text": block,
+        }
+    return {"summary": summary, "metrics": _metrics_table(summary),
+            "territories": territories}
+
+
+_index_lock = threading.Lock()
+
+
+def _stamp(path: Path) -> dict[str, int]:
+    st_ = path.stat()
+    return {"size": st_.st_size, "mtime_ns": st_.st_mtime_ns}
+
+
+def _save_index(index: dict) -> None:
+    try:
+        REPORT_INDEX.parent.mkdir(parents=True, exist_ok=True)
+        with staged(REPORT_INDEX) as tmp:
+            tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": index}), "utf-8")
+    except OSError:
+        pass                                      # read-only deploy: in-memory only
+
+
+@st.cache_resource(show_spinner=False)
+def _report_index() -> dict[str, dict]:
+    try:
+        raw = json.loads(REPORT_INDEX.read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return raw.get("files", {}) if raw.get("version") == INDEX_VERSION else {}
+
+
+def _entry(index: dict, path: Path) -> dict | None:
+    """Index entry of ``path``, re-parsed (and persisted) only if it changed."""
+    try:
+        stamp = _stamp(path)
+    except FileNotFoundError:
+        return None
+    entry = index.get(path.name)
+    if entry is None or entry["stamp"] != stamp:
+        entry = {"stamp": stamp, "record": parse_report(path.read_text("utf-8"))}
+        with _index_lock:
+            index[path.name] = entry
+            _save_index(index)
+    return entry
+
+
+def load_report(brand: str) -> dict[str, Any] | None:
+    """Parsed ``md_files/<brand>.md`` (see ``parse_report``), ``None`` if absent."""
+    entry = _entry(_report_index(), MD_DIR / f"{brand}.md")
+    return entry and entry["record"]
+
+
+def index_reports() -> list[str]:
+    """Bring the index up to date for every markdown file; returns the brands."""
+    index = _report_index()
+    brands = sorted(p.stem for p in MD_DIR.glob("*.md"))
+    for brand in brands:
+        _entry(index, MD_DIR / f"{brand}.md")
+    with _index_lock:
+        for name in set(index) - {f"{b}.md" for b in brands}:
+            del index[name]
+        _save_index(index)
+    return brands
@@ -0,0 +1,127 @@
+"""
+RTM (route-to-market) data: AWS hot zones, monthly price / volume panel,
+county opportunity scores and distributor coordinates (raw and hex-binned).
+Name columns are entity categoricals from the ``dims`` registry.
+"""
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ..density import cell_size_for_zoom, hexbin
+from ..snapshot import snapshot
+from .dims import encode, register
+from .paths import OPPORTUNITY_FILE, POINTS_FILE, RTM_FILE, RTM_MONTHLY_FILE
+
+RTM_DIMS         = {"Territory": "territory", "County": "county", "Brand": "brand",
+                    "Brand_Std": ("brand", "upper"), "Subcategory": "subcategory"}
+RTM_MONTHLY_DIMS = {"REGION_NAME": ("territory", "upper"), "BRAND": ("brand", "upper"),
+                    "SKU": "sku"}
+OPPORTUNITY_DIMS = {"Territory": ("territory", "upper"), "COUNTY_KEY": "county",
+                    "BRAND": ("brand", "upper"), "subcategory": "subcategory"}
+
+
+def _read_rtm() -> pd.DataFrame:
+    rtm = pd.read_csv(RTM_FILE)
+    rtm.columns = rtm.columns.str.strip().str.title()
+    return rtm
+
+
+def _rtm() -> pd.DataFrame:
+    return snapshot("rtm", [RTM_FILE], _read_rtm, version=1)
+
+
+@st.cache_resource(show_spinner="Loading RTM hot-zones …")
+def load_rtm() -> pd.DataFrame:
+    """County-level RTM AWS scores (title-cased columns and names)."""
+    return encode(_rtm(), RTM_DIMS)
+
+
+def _read_rtm_monthly() -> pd.DataFrame:
+    rtm = pd.read_csv(RTM_MONTHLY_FILE)
+    if "Volume" in rtm.columns and "VOLUME" not in rtm.columns:
+        rtm = rtm.rename(columns={"Volume": "VOLUME"})
+    return rtm
+
+
+def _rtm_monthly() -> pd.DataFrame:
+    return snapshot("rtm_monthly", [RTM_MONTHLY_FILE], _read_rtm_monthly, version=1)
+
+
+@st.cache_resource(show_spinner="Loading RTM monthly …")
+def load_rtm_monthly() -> pd.DataFrame:
+    """Monthly RTM price / volume per region × brand × SKU (upper-cased keys)."""
+    return encode(_rtm_monthly(), RTM_MONTHLY_DIMS)
+
+
+def _read_opportunity() -> pd.DataFrame:
+    df = pd.read_csv(OPPORTUNITY_FILE)
+    df["COUNTY_KEY"] = df["County"]
+    return df
+
+
+def _opportunity() -> pd.DataFrame:
+    return snapshot("opportunity", [OPPORTUNITY_FILE], _read_opportunity, version=1)
+
+
+@st.cache_resource(show_spinner="Loading county opportunity scores …")
+def load_opportunity() -> pd.DataFrame:
+    """RTM rows with ``Opportunity Score``; ``COUNTY_KEY`` joins the county GeoJSON."""
+    return encode(_opportunity(), OPPORTUNITY_DIMS)
+
+
+register([RTM_FILE], RTM_DIMS, _rtm)
+register([RTM_MONTHLY_FILE], RTM_MONTHLY_DIMS, _rtm_monthly)
+register([OPPORTUNITY_FILE], OPPORTUNITY_DIMS, _opportunity)
+
+
+def _detect_column(patterns, columns):
+    norm = {c: re.sub(r"[\s_]", "", c.lower()) for c in columns}
+    for col, normed in norm.items():
+        if any(re.search(p, normed) for p in patterns):
+            return col
+    return None
+
+
+def _read_points() -> pd.DataFrame:
+    raw  = pd.read_excel(POINTS_FILE)
+    cols = list(raw.columns)
+    lat  = _detect_column([r"^lat", r"latitude"], cols)
+    lon  = _detect_column([r"^lon", r"lng", r"longitude"], cols)
+    dist = _detect_column([r"distrib", r"dealer", r"partner", r"outlet"], cols)
+
+    missing = [n for n, c in [("Latitude", lat), ("Longitude", lon), ("Distributor", dist)] if c is None]
+    if missing:
+        st.error("❌ Could not find required column(s): " + ", ".join(missing) +
+                 "\n\nFound columns: " + ", ".join(map(str, cols)))
+        st.stop()
+
+    pts = raw[[dist, lat, lon]].copy()
+    pts.columns = ["Distributor", "Latitude", "Longitude"]
+    pts["Latitude"]  = pd.to_numeric(pts["Latitude"],  errors="coerce")
+    pts["Longitude"] = pd.to_numeric(pts["Longitude"], errors="coerce")
+    return pts.dropna(subset=["Latitude", "Longitude"])
+
+
+@st.cache_resource(show_spinner="Loading distributor points …")
+def load_points() -> pd.DataFrame:
+    """Distributor ``Distributor`` / ``Latitude`` / ``Longitude`` rows."""
+    return snapshot("points", [POINTS_FILE], _read_points)
+
+
+@st.cache_resource(show_spinner=False)
+def load_point_density(zoom: float) -> pd.DataFrame:
+    """Distributor points hex-binned for a density map drawn at ``zoom``.
+
+    One ``Latitude`` / ``Longitude`` / ``Weight`` (outlet count) row per
+    occupied cell, plus ``Intensity = log1p(Weight)``: counts run from 1 to
+    thousands, so a map coloured by ``Intensity`` over ``0 … max`` keeps a
+    visible gradient between sparse and dense areas.
+    """
+    pts  = load_points()
+    dens = hexbin(pts["Latitude"].to_numpy(), pts["Longitude"].to_numpy(),
+                  cell_size_for_zoom(zoom))
+    return dens.assign(Intensity=np.log1p(dens["Weight"]))
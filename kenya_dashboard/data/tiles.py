@@ -0,0 +1,36 @@
+"""
+Vector tiles of the map pages (see :mod:`kenya_dashboard.tiles`).
+
+Off unless ``KENYA_TILE_URL`` names the public base URL of the pre-generated
+``static/tiles/`` directory – there is no default, because only the
+deployment knows where the browser can reach it.  With the app's own static
+serving that is ``<app URL>/app/static/tiles``; any web server or CDN serving
+the directory works as well.  Generate the tiles first with
+``python -m kenya_dashboard.tiles``.
+
+Layers: ``counties``, ``territories``, ``distributors``.
+"""
+from __future__ import annotations
+
+import os
+import warnings
+
+import streamlit as st
+
+from ..tiles import TileLayers
+from .paths import TILE_DIR
+
+
+@st.cache_resource(show_spinner=False)
+def vector_tiles() -> TileLayers | None:
+    """The tile layers, or ``None`` when tiles are disabled or not generated."""
+    url = os.environ.get("KENYA_TILE_URL")
+    if not url:
+        return None
+    try:
+        return TileLayers.load(url, TILE_DIR)
+    except FileNotFoundError:
+        warnings.warn(f"KENYA_TILE_URL is set but {TILE_DIR} has no tiles; run "
+                      "`python -m kenya_dashboard.tiles` (falling back to inline geometry)",
+                      RuntimeWarning)
+        return None
@@ -0,0 +1,34 @@
+"""
+Version stamp of the loaded data, for caches of things derived from it.
+
+The loaders are ``st.cache_resource`` singletons, so within a process the data
+only changes when that cache is cleared and the files are read again.
+``data_version()`` is cached the same way: it fingerprints every input file
+once and moves exactly when the loaders reload changed files.
+"""
+from __future__ import annotations
+
+import hashlib
+
+import streamlit as st
+
+from .paths import (CENTROIDS_FILE, COMP_FILE, COMP_TEXT_FILE, COUNTY_GJ, GT_FILE,
+                    GT_MONTHLY_FILE, MT_CLUSTER_FILE, MT_FILE, OPPORTUNITY_FILE, POINTS_FILE,
+                    RTM_FILE, RTM_MONTHLY_FILE, TERR_GJ)
+
+INPUT_FILES = (GT_FILE, GT_MONTHLY_FILE, MT_FILE, MT_CLUSTER_FILE, RTM_FILE, RTM_MONTHLY_FILE,
+               OPPORTUNITY_FILE, POINTS_FILE, COMP_FILE, COMP_TEXT_FILE, COUNTY_GJ, TERR_GJ,
+               CENTROIDS_FILE)
+
+
+@st.cache_resource(show_spinner=False)
+def data_version() -> str:
+    """Short fingerprint (size + mtime) of the files behind the loaded frames."""
+    h = hashlib.sha1()
+    for path in INPUT_FILES:
+        try:
+            s = path.stat()
+            h.update(f"{path.name}:{s.st_size}:{s.st_mtime_ns};".encode())
+        except OSError:
+            h.update(f"{path.name}:-;".encode())
+    return h.hexdigest()[:12]
@@ -0,0 +1,60 @@
+"""
+Read-only filtering over the shared, cached frames.
+
+The loaders hand every session the *same* DataFrame objects, so pages must
+not ``.copy()`` them "to be safe" (that allocates a full frame per rerun and
+per session) nor modify them in place.  ``select()`` is the one way to
+narrow them down:
+
+* no active filter       →  the cached frame itself (zero copy)
+* one or more filters    →  a single combined boolean mask, one row take
+
+so an interaction allocates only the rows it displays.  Treat the result as
+read-only too; anything that needs new columns should build them on a
+derived frame (``assign``, ``groupby`` …).
+
+Name columns are categoricals (see ``dims``): filters compare their integer
+codes and ``levels()`` reads dropdown options off the sorted dictionary.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+NO_FILTER = ("All", "ALL", None)
+
+
+def mask(df: pd.DataFrame, **eq: Any) -> np.ndarray | None:
+    """Boolean row mask for ``column == value`` filters (``None`` = all rows).
+
+    Filters whose value is ``"All"`` / ``"ALL"`` / ``None`` are ignored.
+    """
+    m = None
+    for col, value in eq.items():
+        if value in NO_FILTER:
+            continue
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            code = s.cat.categories.get_indexer([value])[0]
+            hit = (s.cat.codes.to_numpy() == code) if code >= 0 else np.zeros(len(s), bool)
+        else:
+            hit = s.to_numpy() == value
+        m = hit if m is None else m & hit
+    return m
+
+
+def select(df: pd.DataFrame, **eq: Any) -> pd.DataFrame:
+    """``df`` narrowed to ``column == value`` for every active filter."""
+    m = mask(df, **eq)
+    return df if m is None else df[m]
+
+
+def levels(df: pd.DataFrame, col: str) -> list:
+    """Sorted distinct values of ``col`` present in ``df`` (dropdown options)."""
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = np.unique(s.cat.codes.to_numpy())
+        return s.cat.categories[codes[codes >= 0]].tolist()
+    return sorted(s.dropna().unique())
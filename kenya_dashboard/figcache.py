@@ -0,0 +1,86 @@
+"""
+Size-bounded, process-wide cache of finished Plotly figures.
+
+Each rerun used to rebuild every chart from pandas (filter, aggregate,
+``px.*``, layout), although most reruns come from a widget the chart does not
+depend on and popular brand / territory combinations are drawn again and
+again by different sessions.  ``figure(page, panel, build, *filters)``
+returns ``build(*filters)`` and remembers it under
+
+    (page, panel, filters, data_version())
+
+so a repeat view skips both the aggregation and the figure construction.
+
+Entries are the figures' JSON: a hit gives each session its own
+``go.Figure`` (mutating it cannot leak into the cache), rebuilt without
+re-validation since the JSON came from a validated figure – about 1 ms
+instead of the 10–40 ms a map takes to build.  ``FIGURE_CACHE`` is an LRU
+bounded by total JSON bytes, ``KENYA_FIGURE_CACHE_MB`` (default 32).
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import plotly.graph_objects as go
+
+from .data import data_version
+
+
+class FigureCache:
+    """LRU of serialised figures with a total size bound."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> bytes | None:
+        with self._lock:
+            spec = self._items.get(key)
+            if spec is not None:
+                self._items.move_to_end(key)
+            return spec
+
+    def put(self, key: Hashable, spec: bytes) -> None:
+        if len(spec) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = spec
+            self._size += len(spec)
+            while self._size > self.max_bytes:
+                self._size -= len(self._items.popitem(last=False)[1])
+
+
+FIGURE_CACHE = FigureCache(int(os.environ.get("KENYA_FIGURE_CACHE_MB", 32)) << 20)
+
+
+def figure(page: str, panel: str, build: Callable[..., go.Figure | None], *filters: Hashable,
+           cache: FigureCache = FIGURE_CACHE) -> go.Figure | None:
+    """``build(*filters)``, cached per page, panel, filter values and data version.
+
+    ``build`` must depend on nothing but ``filters`` and the loaded data.  A
+    ``None`` result (nothing to draw) is passed through uncached.
+    """
+    key  = (page, panel, filters, data_version())
+    spec = cache.get(key)
+    if spec is not None:
+        return go.Figure(json.loads(spec), _validate=False)
+    fig = build(*filters)
+    if fig is not None:
+        cache.put(key, fig.to_json().encode())
+    return fig
@@ -0,0 +1,84 @@
+"""
+Size-bounded, process-wide cache of file contents for download buttons.
+
+``st.download_button(data=path.read_bytes())`` reads the whole report on
+every rerun of every session.  ``download_data(path)`` instead returns
+
+* on Streamlit versions with deferred downloads, a callable – nothing is read
+  until the user actually clicks;
+* otherwise the bytes from ``FILE_CACHE``, one shared object per file.
+
+``FILE_CACHE`` is an LRU keyed by path + mtime + size (an edited or rebuilt
+file is a new entry; its stale version is dropped) and bounded by total
+bytes, so memory stays flat however many users browse reports.  The bound
+is ``KENYA_DOWNLOAD_CACHE_MB`` (default 64).  Files larger than the whole
+budget are streamed from disk each time and never cached.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+try:                                    # deferred downloads (callable ``data=``)
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    DEFERRED = hasattr(MediaFileManager, "add_deferred")
+except ImportError:
+    DEFERRED = False
+
+
+class FileCache:
+    """LRU of whole-file contents with a total size bound."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[tuple[str, int, int], bytes] = OrderedDict()
+        self._keys: dict[str, tuple[str, int, int]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _drop(self, key: tuple[str, int, int]) -> None:
+        self._size -= len(self._items.pop(key))
+        if self._keys.get(key[0]) == key:
+            del self._keys[key[0]]
+
+    def get(self, path: str | Path) -> bytes:
+        path = str(path)
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                return data
+
+        data = Path(path).read_bytes()
+        if len(data) > self.max_bytes:
+            return data
+        with self._lock:
+            old = self._keys.get(path)
+            if old is not None and old in self._items:
+                self._drop(old)               # superseded version of the file
+            if key not in self._items:
+                self._items[key] = data
+                self._keys[path] = key
+                self._size += len(data)
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._items)))
+        return data
+
+
+FILE_CACHE = FileCache(int(os.environ.get("KENYA_DOWNLOAD_CACHE_MB", 64)) << 20)
+
+
+def download_data(path: str | Path, cache: FileCache = FILE_CACHE) -> bytes | Callable[[], bytes]:
+    """``data=`` argument of ``st.download_button`` for the file at ``path``."""
+    if DEFERRED:
+        return lambda: cache.get(path)
+    return cache.get(path)
@@ -0,0 +1,39 @@
+"""
+Fragment-scoped reruns for independent dashboard panels.
+
+A widget normally reruns the whole page script – maps, KPI strip and all.
+A panel decorated with ``@fragment`` is rerun *on its own* when one of its own
+widgets changes, re-sending only that panel:
+
+    @fragment
+    def competitor_panel(territory, brand):      # inputs from the page
+        comp = st.selectbox("Select Competitor", …)   # reruns this panel only
+        …
+
+    competitor_panel(territory, brand)
+
+The panel's parameters are its declared inputs: a page-level widget still
+reruns the page, which calls the panel again with the new values, whereas a
+fragment rerun reuses the values of the last full run.  A fragment may only
+create widgets inside its own container, so a widget that drives one panel
+lives in that panel.
+
+``st.fragment`` needs Streamlit 1.37 (``st.experimental_fragment`` before);
+on older versions ``fragment`` is a no-op and the panel reruns with the page.
+"""
+from __future__ import annotations
+
+from typing import Callable, TypeVar
+
+import streamlit as st
+
+F = TypeVar("F", bound=Callable)
+
+
+def _whole_page(func: F) -> F:
+    return func
+
+
+fragment: Callable[[F], F] = (getattr(st, "fragment", None)
+                              or getattr(st, "experimental_fragment", None)
+                              or _whole_page)
@@ -0,0 +1,267 @@
+"""
+Topology-preserving simplification of the county / territory GeoJSON.
+
+``kenya.geojson`` and ``kenya_territories (1).geojson`` are surveyed at
+sub-metre detail, far beyond what a national map at zoom 5.5 can show.
+``simplify()`` reduces them the way TopoJSON does:
+
+1. coordinates are rounded to a fixed number of decimals;
+2. every ring is cut into *arcs* at junctions, i.e. vertices where more
+   than two polygons meet or where a shared border turns into a coast line;
+3. each arc is Douglas–Peucker simplified exactly once and reused by every
+   polygon that borders it, so neighbours never drift apart or overlap.
+
+``RESOLUTIONS`` lists the prepared levels; ``resolution_for_zoom()`` maps
+the ``zoom`` of a mapbox figure to the coarsest level that still renders
+without visible error (tolerance ≈ ⅓ px at that zoom).
+
+``shape_table()`` derives what the maps need besides outlines – centroid,
+bounding box and area of every feature – without geopandas / pyproj:
+centroids are planar centroids in EPSG:3857 (what ``gdf.to_crs(3857)
+.centroid`` gave), areas are taken on the WGS-84 authalic sphere.
+
+Run ``python -m kenya_dashboard.geometry`` to (re)build every level and the
+centroid table (``geo_centroids.csv``) ahead of deployment and print the
+resulting payload sizes.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import math
+from collections import defaultdict
+from typing import Any, Iterable
+
+import numpy as np
+
+Point = tuple[float, float]
+FeatureCollection = dict[str, Any]
+
+# name → (max zoom served, DP tolerance in degrees, coordinate decimals)
+RESOLUTIONS: dict[str, tuple[float, float, int]] = {
+    "z5": (5.75, 0.010, 3),
+    "z6": (6.50, 0.005, 3),
+    "z8": (8.50, 0.001, 4),
+}
+GEOMETRY_VERSION = 2          # bump when the algorithm / levels / feature keys change
+
+
+def resolution_for_zoom(zoom: float | None) -> str | None:
+    """Coarsest level that is exact enough for ``zoom`` (``None`` = full)."""
+    if zoom is None:
+        return None
+    for name, (max_zoom, _, _) in sorted(RESOLUTIONS.items(), key=lambda kv: kv[1][0]):
+        if zoom <= max_zoom:
+            return name
+    return None
+
+
+# ── geometry helpers ────────────────────────────────────────────────
+def _polygons(geom: dict) -> list | None:
+    if geom["type"] == "Polygon":
+        return [geom["coordinates"]]
+    if geom["type"] == "MultiPolygon":
+        return geom["coordinates"]
+    return None
+
+
+def _quantize(ring: Iterable, decimals: int) -> list[Point]:
+    out: list[Point] = []
+    for x, y, *_ in ring:
+        pt = (round(x, decimals), round(y, decimals))
+        if not out or pt != out[-1]:
+            out.append(pt)
+    if len(out) > 1 and out[0] == out[-1]:
+        out.pop()                         # store rings open, close on output
+    return out
+
+
+def _seg_dist2(p: Point, a: Point, b: Point) -> float:
+    (px, py), (ax, ay), (bx, by) = p, a, b
+    dx, dy = bx - ax, by - ay
+    if dx == dy == 0:
+        return (px - ax) ** 2 + (py - ay) ** 2
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return (px - ax - t * dx) ** 2 + (py - ay - t * dy) ** 2
+
+
+def _douglas_peucker(pts: list[Point], tol2: float) -> list[Point]:
+    if len(pts) < 3:
+        return pts
+    keep = [False] * len(pts)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(pts) - 1)]
+    while stack:
+        i, j = stack.pop()
+        best, idx = tol2, -1
+        for k in range(i + 1, j):
+            d = _seg_dist2(pts[k], pts[i], pts[j])
+            if d > best:
+                best, idx = d, k
+        if idx >= 0:
+            keep[idx] = True
+            stack += [(i, idx), (idx, j)]
+    return [p for p, k in zip(pts, keep) if k]
+
+
+class _ArcSimplifier:
+    """Simplify open arcs once per shared border, independent of direction."""
+
+    def __init__(self, tolerance: float):
+        self.tol2 = tolerance * tolerance
+        self.done: dict[tuple[Point, ...], list[Point]] = {}
+
+    def __call__(self, arc: list[Point]) -> list[Point]:
+        fwd = tuple(arc)
+        rev = fwd[::-1]
+        key = min(fwd, rev)
+        if key not in self.done:
+            self.done[key] = _douglas_peucker(list(key), self.tol2)
+        out = self.done[key]
+        return out if key == fwd else out[::-1]
+
+
+def _junctions(rings: list[list[Point]]) -> set[Point]:
+    neighbours: dict[Point, set[Point]] = defaultdict(set)
+    for ring in rings:
+        n = len(ring)
+        for i, p in enumerate(ring):
+            neighbours[p].update((ring[i - 1], ring[(i + 1) % n]))
+    return {p for p, nb in neighbours.items() if len(nb) > 2}
+
+
+def _simplify_ring(ring: list[Point], junctions: set[Point],
+                   arc: _ArcSimplifier) -> list[Point]:
+    cuts = [i for i, p in enumerate(ring) if p in junctions]
+    if not cuts:
+        # free-standing ring (island, enclave): canonical start + split in two
+        start = ring.index(min(ring))
+        ring = ring[start:] + ring[:start]
+        far = max(range(len(ring)), key=lambda i: _seg_dist2(ring[i], ring[0], ring[0]))
+        cuts = [0, far] if far else [0]
+    else:
+        ring = ring[cuts[0]:] + ring[:cuts[0]]
+        cuts = [c - cuts[0] for c in cuts]
+
+    out: list[Point] = []
+    bounds = cuts + [len(ring)]
+    for a, b in zip(bounds, bounds[1:]):
+        piece = arc(ring[a:b] + [ring[b % len(ring)]])
+        out.extend(piece[:-1])
+    return out
+
+
+def simplify(fc: FeatureCollection, tolerance: float, decimals: int) -> FeatureCollection:
+    """Return a simplified deep copy of ``fc``; properties are kept as-is."""
+    fc = copy.deepcopy(fc)
+    polys = [(f, _polygons(f["geometry"])) for f in fc["features"] if f.get("geometry")]
+    rings = {id(r): _quantize(r, decimals)
+             for _, ps in polys if ps for p in ps for r in p}
+    junctions = _junctions([r for r in rings.values() if len(r) >= 3])
+    arc = _ArcSimplifier(tolerance)
+
+    for feat, ps in polys:
+        if ps is None:
+            continue
+        new_polys = []
+        for poly in ps:
+            new_rings = []
+            for r_idx, ring in enumerate(poly):
+                q = rings[id(ring)]
+                s = _simplify_ring(q, junctions, arc) if len(q) >= 3 else q
+                if len(s) < 3:
+                    if r_idx:                    # collapsed hole → drop it
+                        continue
+                    if new_polys:                # collapsed sliver → drop polygon
+                        break
+                    s = q                        # never lose a feature outright
+                new_rings.append([list(pt) for pt in s + s[:1]])
+            else:
+                new_polys.append(new_rings)
+        if feat["geometry"]["type"] == "Polygon":
+            feat["geometry"]["coordinates"] = new_polys[0]
+        else:
+            feat["geometry"]["coordinates"] = new_polys
+    return fc
+
+
+# ── centroids / extents / areas ────────────────────────────────────
+R_MERCATOR = 6378137.0                 # EPSG:3857 sphere
+R_AUTHALIC = 6371007.2                 # equal-area sphere of WGS-84
+SHAPE_COLUMNS = ("lon", "lat", "min_lon", "min_lat", "max_lon", "max_lat", "area_km2")
+
+
+def _ring_moments(ring: np.ndarray) -> tuple[float, float, float, float]:
+    """Signed Mercator area, centroid moments and spherical area of a ring."""
+    lon, lat = np.radians(ring[:, 0]), np.radians(ring[:, 1])
+    x = R_MERCATOR * lon
+    y = R_MERCATOR * np.log(np.tan(np.pi / 4 + lat / 2))
+    x1, y1, x2, y2 = x[:-1], y[:-1], x[1:], y[1:]
+    cross = x1 * y2 - x2 * y1
+    area  = cross.sum() / 2
+    cx    = ((x1 + x2) * cross).sum() / 6
+    cy    = ((y1 + y2) * cross).sum() / 6
+    sphere = abs(((lon[1:] - lon[:-1]) * (2 + np.sin(lat[:-1]) + np.sin(lat[1:]))).sum()) \
+        * R_AUTHALIC ** 2 / 2
+    return area, cx, cy, sphere
+
+
+def shape_stats(geom: dict) -> dict[str, float]:
+    """Centroid, bounding box and area (km²) of a (Multi)Polygon."""
+    A = CX = CY = SPH = 0.0
+    lo, hi = np.full(2, np.inf), np.full(2, -np.inf)
+    for poly in _polygons(geom) or []:
+        for r_idx, ring in enumerate(poly):
+            ring = np.asarray(ring, dtype=float)[:, :2]
+            if len(ring) < 3:
+                continue
+            if (ring[0] != ring[-1]).any():
+                ring = np.vstack([ring, ring[:1]])
+            area, cx, cy, sphere = _ring_moments(ring)
+            # exterior counts positive, holes negative, whatever the winding
+            sign = (1 if area >= 0 else -1) * (-1 if r_idx else 1)
+            A, CX, CY = A + sign * area, CX + sign * cx, CY + sign * cy
+            SPH += sphere if not r_idx else -sphere
+            if not r_idx:
+                lo, hi = np.minimum(lo, ring.min(0)), np.maximum(hi, ring.max(0))
+    x, y = CX / A, CY / A
+    return {
+        "lon":      math.degrees(x / R_MERCATOR),
+        "lat":      math.degrees(2 * math.atan(math.exp(y / R_MERCATOR)) - math.pi / 2),
+        "min_lon":  lo[0], "min_lat": lo[1], "max_lon": hi[0], "max_lat": hi[1],
+        "area_km2": SPH / 1e6,
+    }
+
+
+def shape_table(fc: FeatureCollection, key: str) -> list[dict[str, Any]]:
+    """One ``shape_stats`` row per distinct ``properties[key]``.
+
+    Features sharing a key (e.g. the constituencies of one county) are
+    merged, so each key gets the centroid / extent / area of its whole area.
+    """
+    groups: dict[Any, list] = defaultdict(list)
+    for f in fc["features"]:
+        if f.get("geometry") and _polygons(f["geometry"]):
+            groups[f["properties"][key]].extend(_polygons(f["geometry"]))
+    return [{"KEY": k, **shape_stats({"type": "MultiPolygon", "coordinates": polys})}
+            for k, polys in sorted(groups.items())]
+
+
+def _main() -> None:
+    from .data import geo
+    from .data.paths import CENTROIDS_FILE, COUNTY_GJ, TERR_GJ
+
+    for label, src, load in (("county", COUNTY_GJ, geo.load_county_geo),
+                             ("territory", TERR_GJ, geo.load_territory_geo)):
+        full = len(src.read_bytes())
+        print(f"{label:<9} full  {full / 1e6:6.2f} MB")
+        for name, (max_zoom, _, _) in RESOLUTIONS.items():
+            size = len(json.dumps(load(zoom=max_zoom), separators=(",", ":")))
+            print(f"{label:<9} {name:<5} {size / 1e6:6.2f} MB  ({full / size:4.1f}×)")
+
+    geo.write_centroids(CENTROIDS_FILE)
+    print(f"centroids → {CENTROIDS_FILE.name}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,101 @@
+"""
+Deferred imports for the heavy, page-specific dependencies.
+
+The multi-page scripts (``streamlit_app.py``, ``example.py``) execute every
+page's imports on a cold start although only the selected page runs.
+``lazy("plotly.express")`` returns a stand-in module that performs the real
+import on first attribute access, so a page that never touches ``px`` – the
+README page, say – never pays for it:
+
+    px = lazy("plotly.express")
+    px.bar(...)                          # imported here, once per process
+
+``lazy_timings()`` reports what was deferred and what it cost when it was
+finally loaded.  Where a cold start spends its time::
+
+    python -m kenya_dashboard.lazy                  # the dashboards' imports
+    python -m kenya_dashboard.lazy plotly.express pyarrow
+"""
+from __future__ import annotations
+
+import importlib
+import re
+import subprocess
+import sys
+import time
+import types
+
+# import order of the multi-page app; the report shows each one's *added* cost
+DASHBOARD_IMPORTS = ("streamlit", "numpy", "pandas", "kenya_dashboard.data",
+                     "plotly.graph_objects", "plotly.express")
+
+_TIMINGS: dict[str, float | None] = {}
+
+
+class _LazyModule(types.ModuleType):
+    """Module proxy that imports its target on first attribute access."""
+
+    def _load(self) -> types.ModuleType:
+        mod = self.__dict__.get("_target")
+        if mod is None:
+            t0 = time.perf_counter()
+            mod = importlib.import_module(self.__name__)
+            _TIMINGS[self.__name__] = time.perf_counter() - t0
+            self.__dict__["_target"] = mod
+        return mod
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if "_target" in self.__dict__ else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy(name: str) -> types.ModuleType:
+    """``import name`` on first use (the real module if it is already loaded)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    _TIMINGS.setdefault(name, None)
+    return _LazyModule(name)
+
+
+def lazy_timings() -> dict[str, float | None]:
+    """Seconds each deferred import took (``None`` = never needed)."""
+    return dict(_TIMINGS)
+
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\| ( *)(\S+)")
+
+
+def import_report(modules=DASHBOARD_IMPORTS) -> list[tuple[str, float]]:
+    """Cold-start import cost of ``modules``, imported in order.
+
+    Runs a fresh interpreter under ``-X importtime`` and returns
+    ``(module, seconds)`` for every top-level import it triggered, i.e. the
+    time each requested module *added* on top of those before it (its own
+    dependencies included).
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         capture_output=True, text=True, check=True).stderr
+    return [(name, int(cum) / 1e6)
+            for _, cum, indent, name in _LINE.findall(err) if not indent]
+
+
+def _main() -> None:
+    modules = sys.argv[1:] or DASHBOARD_IMPORTS
+    rows  = import_report(modules)
+    total = sum(s for _, s in rows)
+    wanted = set(modules)
+    for name, s in sorted(rows, key=lambda r: -r[1]):
+        if name in wanted or s >= 0.01:
+            print(f"{s * 1000:9.1f} ms  {name}")
+    print(f"{total * 1000:9.1f} ms  total")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,230 @@
+"""
+Layout of the generated brand reports, on fpdf2.
+
+``render_report()`` turns a ``report_builder.report_inputs`` payload into PDF
+bytes: title, executive summary and one section per territory (KPI, SKU and
+competitor tables, then the strategy brief).  ``render_markdown()`` lays out
+the markdown subset of the briefs in ``md_files/`` – headings, paragraphs
+with inline ``**bold**``, lists, pipe tables and rules.
+
+Only fpdf2's core Helvetica faces are used (no font files to ship); they
+cover Latin-1, so ``clean()`` spells out the rest.  The creation date is
+pinned, so identical inputs give byte-identical files.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from typing import Any
+
+from fpdf import FPDF, FontFace
+
+MARGIN = 50.0                             # points, A4 pages
+_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_HEADING_RGB = (15, 28, 46)
+_HEADER_FILL = (230, 235, 242)
+
+# the core fonts only cover Latin-1; spell out the rest
+_ASCII = str.maketrans({
+    "–": "-", "—": "--", "‘": "'", "’": "'", "“": '"', "”": '"', "•": "-",
+    "→": "->", "←": "<-", "↑": "^", "↓": "v", "…": "...", "₹": "Rs ", "×": "x",
+    "≥": ">=", "≤": "<=", "≈": "~", "✅": "", "⚠": "!", " ": " ",
+})
+
+
+def clean(text: str) -> str:
+    """``text`` restricted to what the core fonts can show."""
+    text = str(text).translate(_ASCII)
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def runs(text: str) -> list[tuple[str, bool]]:
+    """Split ``**bold**`` markup into ``(text, bold)`` runs."""
+    parts = re.split(r"\*\*(.+?)\*\*", clean(text))
+    return [(p, bool(i % 2)) for i, p in enumerate(parts) if p]
+
+
+class ReportPdf(FPDF):
+    """A4 report with a ``Page n / N`` footer."""
+
+    def __init__(self, title: str = ""):
+        super().__init__(format="A4", unit="pt")
+        self.set_margins(MARGIN, MARGIN)
+        self.set_auto_page_break(True, MARGIN)
+        self.set_title(clean(title))
+        self.set_producer("kenya_dashboard")
+        self.set_creation_date(_EPOCH)
+        self.add_page()
+
+    def footer(self) -> None:
+        self.set_y(-MARGIN + 15)
+        self.set_font("Helvetica", size=8)
+        self.set_text_color(128)
+        self.cell(0, 10, f"Page {self.page_no()} / {{nb}}", align="R")
+
+    # ── flow elements ───────────────────────────────────────────────
+    def paragraph(self, text: str, size: float = 10, indent: float = 0,
+                  bullet: str | None = None, bold: bool = False,
+                  rgb: tuple[int, int, int] = (0, 0, 0)) -> None:
+        leading = size * 1.35
+        self.set_text_color(*rgb)
+        self.set_left_margin(MARGIN + indent)
+        self.set_x(MARGIN + indent)
+        if bullet:
+            self.set_font("Helvetica", size=size)
+            w = self.get_string_width(bullet + " ")
+            self.set_x(MARGIN + indent - w)
+            self.cell(w, leading, bullet)
+        for part, strong in runs(text):
+            self.set_font("Helvetica", "B" if bold or strong else "", size)
+            self.write(leading, part)
+        self.ln(leading + size * 0.35)
+        self.set_left_margin(MARGIN)
+
+    def heading(self, text: str, level: int = 1) -> None:
+        size = {1: 18, 2: 14, 3: 12}.get(level, 10.5)
+        if self.will_page_break(size * 3 + 40):  # keep it with what follows
+            self.add_page()
+        self.ln(size * 0.5)
+        self.paragraph(text, size=size, bold=True, rgb=_HEADING_RGB)
+
+    def rule(self) -> None:
+        self.ln(5)
+        self.set_draw_color(191)
+        self.set_line_width(0.7)
+        self.line(MARGIN, self.y, self.w - MARGIN, self.y)
+        self.ln(5)
+
+    def grid(self, header: list[str], rows: list[list], size: float = 8.5) -> None:
+        """Bordered table; columns sized to content, header repeated per page."""
+        header = [clean(h) for h in header]
+        rows = [[clean("" if c is None else c) for c in r] + [""] * (len(header) - len(r))
+                for r in rows]
+        pad = 4.0
+        self.set_text_color(0)
+        self.set_draw_color(153)
+        self.set_line_width(0.5)
+        self.set_font("Helvetica", "B", size)
+        natural = [self.get_string_width(h) for h in header]
+        self.set_font("Helvetica", "", size)
+        for r in rows:
+            natural = [max(n, self.get_string_width(c)) for n, c in zip(natural, r)]
+        natural = [n + 2 * pad + 1 for n in natural]
+        with self.table(width=min(sum(natural), self.epw), col_widths=natural, align="LEFT",
+                        text_align="LEFT", line_height=size * 1.3, padding=pad,
+                        headings_style=FontFace(emphasis="BOLD", fill_color=_HEADER_FILL)) as t:
+            for r in [header, *rows]:
+                t.row(r)
+        self.ln(6)
+
+
+# ── markdown ────────────────────────────────────────────────────────
+_TABLE_SEP = re.compile(r"^\|?[\s:|-]+\|?$")
+
+
+def _row(line: str) -> list[str]:
+    return [c.strip() for c in line.strip().strip("|").split("|")]
+
+
+def render_markdown(pdf: ReportPdf, text: str, base_level: int = 1) -> None:
+    """Lay out the markdown subset of the brand briefs onto ``pdf``.
+
+    Headings (``#`` … ``####``, shifted by ``base_level - 1``), paragraphs,
+    ``-`` / ``*`` / ``1.`` lists, pipe tables and ``---`` rules.
+    """
+    lines = text.splitlines()
+    para: list[str] = []
+    indent = 0.0
+
+    def flush():
+        if para:
+            pdf.paragraph(" ".join(para), indent=indent)
+            para.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        stripped = line.strip()
+        if not stripped:
+            flush()
+        elif m := re.match(r"^(#{1,6})\s+(.*)", stripped):
+            flush()
+            pdf.heading(m.group(2), len(m.group(1)) + base_level - 1)
+        elif re.fullmatch(r"-{3,}|\*{3,}", stripped):
+            flush()
+            pdf.rule()
+        elif stripped.startswith("|"):
+            flush()
+            block = []
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                block.append(lines[i].strip())
+                i += 1
+            body = [_row(b) for b in block if not _TABLE_SEP.match(b)]
+            if body:
+                pdf.grid(body[0], body[1:])
+            continue
+        elif m := re.match(r"^(\s*)([-*]|\d+\.)\s+(.*)", line):
+            flush()
+            depth = len(m.group(1)) // 2
+            bullet = "-" if m.group(2) in "-*" else m.group(2)
+            pdf.paragraph(m.group(3), indent=14 + 12 * depth, bullet=bullet)
+        else:
+            if not para:                            # list continuation stays indented
+                indent = 14.0 if line.startswith("  ") else 0.0
+            para.append(stripped)
+            if lines[i].endswith("  "):             # markdown hard break
+                flush()
+        i += 1
+    flush()
+
+
+# ── brand reports ───────────────────────────────────────────────────
+def _fmt(x) -> str:
+    if x is None:
+        return "-"
+    if isinstance(x, int):
+        return f"{x:,}"
+    if isinstance(x, float):
+        return f"{x:,.2f}"
+    return str(x)
+
+
+def _render_section(pdf: ReportPdf, sec: dict[str, Any], complete: bool) -> None:
+    pdf.heading(sec["territory"].title(), 2)
+    if sec["kpis"]:
+        pdf.grid(["Metric", "Value"], [[k, _fmt(v)] for k, v in sec["kpis"].items()])
+    pop = sec["population"]
+    if pop:
+        pdf.paragraph(f"**Population:** {_fmt(pop['total'])}   "
+                      f"**Target-audience fit:** {_fmt(pop['fit_pct'])} %   "
+                      f"**Target audience:** {_fmt(pop['audience'])}")
+    if sec["top"]:
+        pdf.paragraph(f"**High-potential locations:** {sec['top']}")
+    if sec["skus"]:
+        pdf.heading("RTM volume by SKU", 3)
+        pdf.paragraph(f"Total volume: {_fmt(sec['volume'])}", size=9)
+        pdf.grid(["SKU", "Volume", "Avg base price"],
+                 [[s, _fmt(v), _fmt(p)] for s, v, p in sec["skus"]])
+    if sec["competitors"]:
+        pdf.heading("Main competitors", 3)
+        pdf.grid(["Competitor", "Market share (%)"],
+                 [[c, _fmt(s)] for c, s in sec["competitors"]])
+    if sec["text"]:
+        pdf.heading("Strategy brief", 3)
+        body = sec["text"].split("\n", 1)[1] if sec["text"].startswith("###") else sec["text"]
+        render_markdown(pdf, body, base_level=2 if complete else 1)
+
+
+def render_report(payload: dict[str, Any]) -> bytes:
+    """PDF bytes for a ``report_builder.report_inputs`` payload."""
+    brand, complete = payload["brand"], payload["complete"]
+    title = f"{brand} - {'All territories' if complete else payload['scope'].title()}"
+    pdf = ReportPdf(title)
+    pdf.heading(title, 1)
+    pdf.rule()
+    if payload["summary"]:
+        pdf.heading("Executive Summary", 2)
+        render_markdown(pdf, payload["summary"], base_level=2)
+    for sec in payload["sections"]:
+        _render_section(pdf, sec, complete)
+    return bytes(pdf.output())
@@ -0,0 +1,318 @@
+"""
+Headless builder for the per-brand / per-territory PDF reports.
+
+The Export & Report page offers ``Reports/<BRAND> <TERRITORY>.pdf`` and
+``Reports/<BRAND> Complete.pdf`` for every brand it lists.  This module
+gathers their inputs from the data the pages already load – the brand
+markdown brief, the GT KPIs, RTM volumes / prices, competitor shares,
+population fit and top locations – decides which reports are stale and
+hands those to :mod:`kenya_dashboard.pdf` (fpdf2) for the layout.
+
+Generated files go to ``<snapshots>/reports/``; a hand-made PDF of the same
+name in ``Reports/`` always wins and is never regenerated (``report_path``
+resolves which one to serve).  Builds are incremental: every report's inputs
+are gathered into a plain payload whose SHA-256 is recorded in the output
+directory's ``manifest.json``, and a report is re-rendered only when that
+digest (or ``BUILDER_VERSION``) changes or the file is missing.  Rendering
+runs in a process pool; gathering stays in the parent, which reads the
+frames once without the page's ``st.cache_resource`` layer.
+
+The page checks that digest on every request (``request_report``, a few ms)
+and serves only an up-to-date file.  A missing or stale one is queued on
+``RENDER_POOL`` (``KENYA_REPORT_WORKERS`` processes, default 1) and the page
+shows it as being built; the script thread never renders.  Running the CLI
+after a data update saves the first visitors that wait.
+
+    python -m kenya_dashboard.report_builder              # everything stale
+    python -m kenya_dashboard.report_builder --brand "USHINDI BAR" --force
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+import streamlit as st
+
+from .data.paths import REPORTS_DIR
+from .pdf import render_report
+from .snapshot import SNAPSHOT_DIR
+
+BUILDER_VERSION = 2
+OUT_DIR  = SNAPSHOT_DIR / "reports"
+MANIFEST = OUT_DIR / "manifest.json"
+COMPLETE = "Complete"
+
+# report territory → (GT / competitor / population name, RTM regions)
+TERRITORIES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "CENTRAL":     ("Central",     ("CENTRAL",)),
+    "COAST":       ("Coast",       ("COAST",)),
+    "LAKE":        ("Lake",        ("NYANZA",)),
+    "NAIROBI":     ("Nairobi",     ("NAIROBI",)),
+    "RIFT VALLEY": ("Rift Valley", ("SOUTH RIFT", "NORTH RIFT")),
+}
+_GT_NAME = {"Lake": "Nyanza"}               # the GT workbook still says Nyanza
+
+_manifest_lock = threading.Lock()
+
+# on-request renders for the page; workers fork from the fork server, not
+# from the threaded Streamlit server
+RENDER_POOL = ProcessPoolExecutor(max_workers=int(os.environ.get("KENYA_REPORT_WORKERS", 1)),
+                                  mp_context=multiprocessing.get_context("forkserver"))
+_building: dict[str, Future] = {}                  # file name → render in flight
+_building_lock = threading.Lock()
+
+
+def report_path(brand: str, territory: str) -> Path:
+    """PDF to serve: the hand-made one in ``Reports/`` if present, else generated."""
+    name = f"{brand} {territory}.pdf"
+    curated = REPORTS_DIR / name
+    return curated if curated.exists() else OUT_DIR / name
+
+
+# ── inputs ──────────────────────────────────────────────────────────
+def _num(x, digits: int = 2):
+    if x is None or x != x:
+        return None
+    return round(float(x), digits) if digits else int(round(float(x)))
+
+
+def _read_tables(cached: bool = True) -> dict[str, Any]:
+    """The page data grouped by (brand, report territory).
+
+    ``cached=False`` calls the loaders' undecorated functions (``__wrapped__``):
+    the same frames, without the ``st.cache_resource`` layer and its spinners,
+    which have no script run to attach to in the CLI.
+    """
+    from .data import load_comp, load_gt, load_population_pct, load_rtm_monthly
+
+    def read(loader):
+        return loader() if cached else loader.__wrapped__()
+
+    by_name = {_GT_NAME.get(n, n): t for t, (n, _) in TERRITORIES.items()}
+    by_name |= {n: t for t, (n, _) in TERRITORIES.items()}
+    by_region = {r: t for t, (_, regions) in TERRITORIES.items() for r in regions}
+
+    gt = read(load_gt)
+    gt = gt.assign(_B=gt["Brand"].str.upper(), _T=gt["Territory"].map(by_name))
+    kpis = gt.dropna(subset=["_T"]).groupby(["_B", "_T"], observed=True).agg(**{
+        "SKU Cluster":             ("SKU_CLUSTER", "first"),
+        "White Space Score":       ("White Space Score", "mean"),
+        "Client Share (%)":        ("Client Market Share", "mean"),
+        "Competitor Strength (%)": ("Competitor Strength", "mean"),
+        "ERP GT Sales Coverage":   ("ERP GT Sales Coverage", "sum"),
+        "TA Fit (%)":              ("TA_Fit", "mean"),
+        "Z-Score":                 ("Z_score", "mean"),
+    })
+    kpis[["Client Share (%)", "Competitor Strength (%)"]] *= 100
+
+    comp = read(load_comp)
+    comp = (comp.assign(_T=comp["Territory"].map(by_name)).dropna(subset=["_T"])
+                .sort_values("Competitor Market Share (%)", ascending=False))
+    competitors = {key: g[["Competitor", "Competitor Market Share (%)"]].head(8).values.tolist()
+                   for key, g in comp.groupby(["Brand_STD", "_T"], observed=True, sort=False)}
+
+    rtm = read(load_rtm_monthly)
+    rtm = rtm.assign(_T=rtm["REGION_NAME"].map(by_region)).dropna(subset=["_T"])
+    skus = (rtm.groupby(["BRAND", "_T", "SKU"], observed=True)
+               .agg(volume=("VOLUME", "sum"), price=("AVERAGE_BASE_PRICE", "mean")))
+    volume = rtm.groupby(["BRAND", "_T"], observed=True)["VOLUME"].sum()
+
+    pop = read(load_population_pct).assign(_T=lambda d: d["Territory"].map(by_name))
+    return {"kpis": kpis, "competitors": competitors, "skus": skus,
+            "volume": volume.to_dict(), "population": pop.dropna(subset=["_T"]).set_index("_T")}
+
+
+@st.cache_resource(show_spinner=False)
+def _tables() -> dict[str, Any]:
+    """``_read_tables()`` once per server process (the page's path)."""
+    return _read_tables()
+
+
+def _territory_inputs(brand: str, territory: str, t: dict[str, Any]) -> dict[str, Any]:
+    from .data import load_top_locations
+
+    kpis = None
+    if (brand, territory) in t["kpis"].index:
+        row = t["kpis"].loc[(brand, territory)]
+        kpis = {k: (v if isinstance(v, str) else _num(v, 0 if k == "ERP GT Sales Coverage" else 2))
+                for k, v in row.items()}
+
+    sku_rows = []
+    if (brand, territory) in t["skus"].index.droplevel("SKU"):
+        top = t["skus"].loc[(brand, territory)].sort_values("volume", ascending=False).head(8)
+        sku_rows = [[sku, _num(r.volume, 0), _num(r.price)] for sku, r in top.iterrows()]
+
+    population = None
+    if territory in t["population"].index:
+        row = t["population"].loc[territory]
+        total = float(row["Total Population"])
+        fit = row[brand] if brand in row.index else None
+        population = {"total": _num(total, 0), "fit_pct": _num(fit),
+                      "audience": _num(total * fit / 100, 0) if fit is not None else None}
+
+    return {
+        "territory":   territory,
+        "kpis":        kpis,
+        "competitors": t["competitors"].get((brand, territory), []),
+        "skus":        sku_rows,
+        "volume":      _num(t["volume"].get((brand, territory), 0), 0),
+        "population":  population,
+        "top":         load_top_locations().get((territory, brand), ""),
+    }
+
+
+def report_inputs(brand: str, territory: str,
+                  tables: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Everything the ``(brand, territory)`` report shows, as plain data.
+
+    ``tables`` defaults to the server's cached ``_tables()``.
+    """
+    from .data import load_report
+
+    tables = _tables() if tables is None else tables
+    md = load_report(brand) or {"summary": "", "metrics": {"columns": [], "rows": []},
+                                "territories": {}}
+    terrs = list(TERRITORIES) if territory == COMPLETE else [territory]
+    return {
+        "version":  BUILDER_VERSION,
+        "brand":    brand,
+        "scope":    territory,
+        "complete": territory == COMPLETE,
+        "summary":  md["summary"],
+        "sections": [{**_territory_inputs(brand, t, tables),
+                      "text": md["territories"].get(t, {}).get("text", "")}
+                     for t in terrs],
+    }
+
+
+def digest(payload: dict[str, Any]) -> str:
+    body = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+# ── rendering (runs in the worker processes) ────────────────────────
+def _write(path: Path, data: bytes) -> None:
+    """Replace ``path`` atomically; each writer gets its own temp file."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp",
+                                     delete=False) as tmp:
+        tmp.write(data)
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
+def _render_job(job: tuple[str, dict[str, Any]]) -> str:
+    path, payload = job
+    _write(Path(path), render_report(payload))
+    return path
+
+
+# ── manifest / orchestration ────────────────────────────────────────
+def _read_manifest() -> dict[str, str]:
+    try:
+        return json.loads(MANIFEST.read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _record(done: dict[str, str]) -> None:
+    with _manifest_lock:
+        manifest = _read_manifest() | done
+        OUT_DIR.mkdir(parents=True, exist_ok=True)
+        _write(MANIFEST, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+
+
+def _stale(path: Path, dig: str, manifest: dict[str, str], force: bool) -> bool:
+    if path.parent != OUT_DIR:
+        return False                                    # hand-made, never rebuilt
+    return force or not path.exists() or manifest.get(path.name) != dig
+
+
+def report_brands() -> list[str]:
+    """Brands listed on the Export & Report page (read uncached, for the CLI)."""
+    from .data import load_gt
+    from .data.reports import white_space_by_brand
+    return list(white_space_by_brand(load_gt.__wrapped__()).index)
+
+
+def build_reports(brands: Iterable[str] | None = None, *, workers: int | None = None,
+                  force: bool = False) -> dict[str, int]:
+    """Render every stale generated report; returns ``{"built": n, "fresh": m}``."""
+    manifest, tables = _read_manifest(), _read_tables(cached=False)
+    jobs, digests, fresh = [], {}, 0
+    for brand in brands or report_brands():
+        for territory in [*TERRITORIES, COMPLETE]:
+            path = report_path(brand, territory)
+            payload = report_inputs(brand, territory, tables)
+            dig = digest(payload)
+            if _stale(path, dig, manifest, force):
+                jobs.append((str(path), payload))
+                digests[path.name] = dig
+            else:
+                fresh += 1
+    if jobs:
+        OUT_DIR.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_render_job, jobs, chunksize=4):
+                pass
+        _record(digests)
+    return {"built": len(jobs), "fresh": fresh}
+
+
+def _built(name: str, dig: str, job: Future) -> None:
+    if job.exception() is None:
+        _record({name: dig})
+        with _building_lock:
+            _building.pop(name, None)
+    # a failed render stays in _building until request_report reports it
+
+
+def request_report(brand: str, territory: str) -> Path | None:
+    """Path of the report if it is up to date, else ``None`` while it is rendered.
+
+    A missing or stale report is queued on ``RENDER_POOL`` once; the next call
+    after it finishes returns its path.  A failed render is raised here (once,
+    then retried on the following call).
+    """
+    path = report_path(brand, territory)
+    payload = report_inputs(brand, territory)
+    dig = digest(payload)
+    if not _stale(path, dig, _read_manifest(), force=False):
+        return path
+    with _building_lock:
+        job = _building.get(path.name)
+        if job is not None and job.done() and job.exception() is not None:
+            del _building[path.name]
+            raise job.exception()
+        queued = job is None
+        if queued:
+            OUT_DIR.mkdir(parents=True, exist_ok=True)
+            job = _building[path.name] = RENDER_POOL.submit(_render_job, (str(path), payload))
+    if queued:                      # outside the lock: may run right here if already done
+        job.add_done_callback(lambda job: _built(path.name, dig, job))
+    return None
+
+
+def _main() -> None:
+    ap = argparse.ArgumentParser(description="Pre-generate the brand PDF reports.")
+    ap.add_argument("--brand", action="append", help="only this brand (repeatable)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--force", action="store_true",
+                    help="re-render every generated report")
+    args = ap.parse_args()
+    stats = build_reports(args.brand, workers=args.workers, force=args.force)
+    print(f"{stats['built']} reports rendered, {stats['fresh']} up to date  →  {OUT_DIR}")
+
+
+if __name__ == "__main__":
+    _main()
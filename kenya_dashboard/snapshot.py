@@ -0,0 +1,169 @@
+"""
+Columnar snapshot cache for the dashboard's Excel / CSV inputs.
+
+Parsing the GT / MT / competitor workbooks through openpyxl dominates a cold
+start.  ``snapshot()`` runs a loader's read + normalisation step once, writes
+the resulting frame to ``<repo>/.snapshots/<name>.parquet`` and serves that
+file on every later start.
+
+A snapshot is rebuilt only when one of its source files really changed:
+
+* size + mtime identical          →  load the Parquet file
+* mtime moved but SHA-256 matches →  re-stamp the metadata, load the Parquet
+* anything else                   →  re-run ``build`` and rewrite the snapshot
+
+``snapshot_json()`` applies the same scheme to JSON artefacts such as the
+pre-simplified GeoJSON levels.
+
+If Parquet support (``pyarrow``) is missing or a frame cannot be written, the
+freshly built frame is returned as-is, i.e. the app behaves exactly as it did
+before the snapshot layer existed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import warnings
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+import pandas as pd
+
+SNAPSHOT_DIR   = Path(os.environ.get("KENYA_SNAPSHOT_DIR",
+                                 Path(__file__).resolve().parents[1] / ".snapshots"))
+FORMAT_VERSION = 1
+
+T = TypeVar("T")
+
+
+def _stat(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path: Path) -> dict:
+    return _stat(path) | {"sha256": _sha256(path)}
+
+
+@contextmanager
+def staged(path: Path) -> Iterator[Path]:
+    """A temp file beside ``path``, unique per writer, moved over ``path`` on success.
+
+    Concurrent writers (sessions, pool workers, a second server process) never
+    share a temp file, and a failed write leaves ``path`` untouched.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield Path(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def _read_meta(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(path: Path, meta: dict) -> None:
+    with staged(path) as tmp:
+        tmp.write_text(json.dumps(meta, indent=1), "utf-8")
+
+
+def _check(meta: dict | None, sources: list[Path], version: int) -> tuple[bool, bool]:
+    """Return ``(fresh, restamp)`` for the recorded metadata."""
+    if (meta is None or meta.get("format") != FORMAT_VERSION
+            or meta.get("version") != version):
+        return False, False
+    recorded = meta.get("sources", {})
+    if set(recorded) != {str(s) for s in sources}:
+        return False, False
+
+    restamp = False
+    for src in sources:
+        rec, now = recorded[str(src)], _stat(src)
+        if now["size"] == rec["size"] and now["mtime_ns"] == rec["mtime_ns"]:
+            continue
+        if now["size"] != rec["size"] or _sha256(src) != rec["sha256"]:
+            return False, False
+        rec.update(now)                 # touched, but byte-identical
+        restamp = True
+    return True, restamp
+
+
+def _cached(name: str, suffix: str, sources: Iterable[str | Path],
+            build: Callable[[], T], read: Callable[[Path], T],
+            write: Callable[[T, Path], None], version: int) -> T:
+    sources   = [Path(s) for s in sources]
+    data_path = SNAPSHOT_DIR / f"{name}{suffix}"
+    meta_path = SNAPSHOT_DIR / f"{name}.json"
+
+    meta = _read_meta(meta_path)
+    if data_path.exists():
+        fresh, restamp = _check(meta, sources, version)
+        if fresh:
+            try:
+                obj = read(data_path)
+            except Exception:           # corrupt / unreadable → rebuild
+                pass
+            else:
+                if restamp:
+                    _write_meta(meta_path, meta)
+                return obj
+
+    obj = build()
+    try:
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        with staged(data_path) as tmp:
+            write(obj, tmp)
+        _write_meta(meta_path, {
+            "format":  FORMAT_VERSION,
+            "version": version,
+            "sources": {str(s): _fingerprint(s) for s in sources},
+        })
+    except Exception as exc:
+        warnings.warn(f"snapshot '{name}' not written ({exc}); "
+                      "serving the freshly built object", RuntimeWarning)
+    return obj
+
+
+def snapshot(name: str,
+             sources: Iterable[str | Path],
+             build: Callable[[], pd.DataFrame],
+             *, version: int = 0) -> pd.DataFrame:
+    """Return ``build()``'s frame, served from a Parquet snapshot when fresh.
+
+    ``sources`` are the files ``build`` reads; ``version`` must be bumped
+    whenever the normalisation inside ``build`` changes so that existing
+    snapshots are discarded.
+    """
+    return _cached(name, ".parquet", sources, build,
+                   pd.read_parquet, lambda df, p: df.to_parquet(p), version)
+
+
+def snapshot_json(name: str,
+                  sources: Iterable[str | Path],
+                  build: Callable[[], Any],
+                  *, version: int = 0) -> Any:
+    """Same contract as :func:`snapshot` for JSON-serialisable artefacts
+    (e.g. the simplified GeoJSON levels)."""
+    return _cached(name, ".data.json", sources, build,
+                   lambda p: json.loads(p.read_text("utf-8")),
+                   lambda obj, p: p.write_text(json.dumps(obj, separators=(",", ":")), "utf-8"),
+                   version)
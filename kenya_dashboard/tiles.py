@@ -0,0 +1,214 @@
+"""
+Pre-generated Mapbox Vector Tiles (MVT) for the map layers.
+
+Inlining GeoJSON into a figure costs bytes proportional to the geometry's
+detail.  Vector tiles cost bytes proportional to what is *on screen*: every
+tile is clipped to its 256-px square and quantised to a 4096 grid, so the
+payload stays bounded however detailed the source (sub-county, ward,
+outlet …) becomes.
+
+* ``TileSet``     – projects named layers of GeoJSON features to Web
+  Mercator once (shapely) and encodes ``(z, x, y)`` tiles with
+  ``mapbox-vector-tile``, each clipped to its square plus a ``BUFFER`` margin.
+  A layer can start at a ``minzoom`` (the 100k distributor points would make
+  a country-wide tile megabytes large).
+* ``write_tiles`` – writes every non-empty tile up to a zoom level as static
+  files, ``<dir>/<version>/<z>/<x>/<y>.pbf`` (Mapbox GL draws a missing tile
+  as empty), and then the manifest
+  ``<dir>/tiles.json`` naming the version, layers and zoom range.  The version is a digest
+  of the features, so browsers never mix tiles of two builds; older versions
+  are removed.
+* ``TileLayers``  – reads the manifest; ``layer()`` returns the matching
+  ``layout.mapbox.layers`` entry for Plotly, fetching tiles from a public URL.
+
+The tiles are plain files for any web server or CDN; the default output,
+``static/tiles/`` (``data.paths.TILE_DIR``), is served by Streamlit itself with
+``server.enableStaticServing``.  Generate them after a data update with::
+
+    python -m kenya_dashboard.tiles --max-zoom 12
+
+Zoom levels beyond ``--max-zoom`` have no tiles; the layers are hidden there.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import shutil
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from .lazy import lazy
+from .snapshot import staged
+
+# only needed to build tiles, not to draw them
+shapely = lazy("shapely")
+mvt     = lazy("mapbox_vector_tile")
+
+EXTENT   = 4096
+BUFFER   = 64                  # tile units kept outside the edge (no seams)
+MAX_ZOOM = 16
+MANIFEST = "tiles.json"
+DISTRIBUTOR_MINZOOM = 8        # individual outlets only once zoomed in
+
+Feature = Mapping[str, Any]
+
+
+def _mercator(lonlat: np.ndarray) -> np.ndarray:
+    """lon/lat rows → world coordinates in [0, 1)² (Web Mercator, y down)."""
+    lon, lat = lonlat[:, 0], np.clip(lonlat[:, 1], -85.0511, 85.0511)
+    s = np.sin(np.radians(lat))
+    return np.column_stack([(lon + 180.0) / 360.0,
+                            0.5 - np.log((1 + s) / (1 - s)) / (4 * math.pi)])
+
+
+# ── tile set ────────────────────────────────────────────────────────
+class TileSet:
+    """Named layers of GeoJSON features, encoded to MVT tiles on demand."""
+
+    def __init__(self, layers: Mapping[str, Iterable[Feature]],
+                 minzoom: Mapping[str, int] | None = None):
+        self.minzoom = {name: 0 for name in layers} | dict(minzoom or {})
+        self._layers: dict[str, tuple[Any, list, list[dict]]] = {}
+        digest = hashlib.sha256(json.dumps(self.minzoom, sort_keys=True).encode("utf-8"))
+        for name, feats in layers.items():
+            geoms, props = [], []
+            for f in feats:
+                geom = f.get("geometry")
+                if not geom:
+                    continue
+                p = {k: v for k, v in (f.get("properties") or {}).items()
+                     if isinstance(v, (str, int, float, bool))}
+                geoms.append(shapely.transform(shapely.geometry.shape(geom), _mercator))
+                props.append(p)
+                digest.update(json.dumps([name, geom, p], sort_keys=True,
+                                         default=str).encode("utf-8"))
+            self._layers[name] = (shapely.STRtree(geoms), geoms, props)
+        self.names = list(self._layers)
+        self.version = digest.hexdigest()[:16]
+
+    def _live(self, z: int):
+        return [(name, layer) for name, layer in self._layers.items()
+                if z >= self.minzoom[name]]
+
+    def _clip(self, z: int, x: int, y: int):
+        n, pad = 2 ** z, BUFFER / EXTENT
+        return shapely.box((x - pad) / n, (y - pad) / n, (x + 1 + pad) / n, (y + 1 + pad) / n)
+
+    def tile(self, z: int, x: int, y: int) -> bytes:
+        """Encoded ``z/x/y`` tile (``b""`` when nothing intersects it)."""
+        if not (0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError(f"tile {z}/{x}/{y} out of range")
+        clip, n = self._clip(z, x, y), 2 ** z
+        layers = []
+        for name, (tree, geoms, props) in self._live(z):
+            features = []
+            for i in tree.query(clip, predicate="intersects"):
+                geom = geoms[i]
+                part = geom if clip.contains(geom) else geom.intersection(clip)
+                if not part.is_empty:
+                    features.append({"geometry": part, "properties": props[i]})
+            if features:
+                layers.append({"name": name, "features": features})
+        if not layers:
+            return b""
+        return mvt.encode(layers, default_options={
+            "quantize_bounds": (x / n, y / n, (x + 1) / n, (y + 1) / n),
+            "extents": EXTENT, "y_coord_down": True})
+
+    def tiles_for(self, max_zoom: int, min_zoom: int = 0) -> Iterable[tuple[int, int, int]]:
+        """All ``(z, x, y)`` up to ``max_zoom`` that hold any feature."""
+        level = [(0, 0, 0)]
+        for z in range(max_zoom + 1):
+            # children of an empty tile are empty: descend only where there is data
+            level = [t for t in level
+                     if any(len(tree.query(self._clip(*t), predicate="intersects"))
+                            for _, (tree, _, _) in self._live(t[0]))]
+            if z >= min_zoom:
+                yield from level
+            level = [(z + 1, 2 * x + dx, 2 * y + dy)
+                     for _, x, y in level for dx in (0, 1) for dy in (0, 1)]
+
+
+def write_tiles(tiles: TileSet, out_dir: Path, max_zoom: int, min_zoom: int = 0) -> int:
+    """Write ``tiles`` up to ``max_zoom`` under ``out_dir``; returns the tile count."""
+    root = out_dir / tiles.version
+    n = 0
+    for z, x, y in tiles.tiles_for(max_zoom, min_zoom):
+        if not (data := tiles.tile(z, x, y)):
+            continue
+        path = root / str(z) / str(x) / f"{y}.pbf"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        n += 1
+    # the manifest switches readers over once every tile is in place
+    with staged(out_dir / MANIFEST) as tmp:
+        tmp.write_text(json.dumps({"version": tiles.version, "layers": tiles.minzoom,
+                                   "maxzoom": max_zoom}), "utf-8")
+    for old in out_dir.iterdir():
+        if old.is_dir() and old != root:
+            shutil.rmtree(old, ignore_errors=True)
+    return n
+
+
+# ── Plotly layers ───────────────────────────────────────────────────
+class TileLayers:
+    """``layout.mapbox.layers`` entries drawing from tiles served at ``url``."""
+
+    def __init__(self, url: str, manifest: Mapping[str, Any]):
+        self.minzoom = dict(manifest["layers"])
+        self.names = list(self.minzoom)
+        self.maxzoom = manifest["maxzoom"]
+        self.source = f"{url.rstrip('/')}/{manifest['version']}/{{z}}/{{x}}/{{y}}.pbf"
+
+    @classmethod
+    def load(cls, url: str, tile_dir: Path) -> TileLayers:
+        """Layers of the tiles last written to ``tile_dir``."""
+        return cls(url, json.loads((tile_dir / MANIFEST).read_text("utf-8")))
+
+    def layer(self, name: str, type: str = "line", **style) -> dict:
+        """``layout.mapbox.layers`` entry that draws ``name`` from the tiles."""
+        if name not in self.names:
+            raise KeyError(f"unknown tile layer {name!r}")
+        # hidden (not fetched) where no tiles were generated
+        style.setdefault("minzoom", self.minzoom[name])
+        style.setdefault("maxzoom", self.maxzoom + 1)
+        return dict(sourcetype="vector", sourcelayer=name, type=type,
+                    source=[self.source], **style)
+
+
+def points_to_features(df, lat: str = "Latitude", lon: str = "Longitude",
+                       props: Iterable[str] = ()) -> list[dict]:
+    """Turn a points frame into GeoJSON ``Point`` features."""
+    props = list(props)
+    return [{"type": "Feature",
+             "geometry": {"type": "Point", "coordinates": [float(r[lon]), float(r[lat])]},
+             "properties": {p: r[p] for p in props}}
+            for r in df[[lat, lon, *props]].to_dict("records")]
+
+
+def _main() -> None:
+    from .data.geo import _read_county_geo, _read_territory_geo
+    from .data.paths import TILE_DIR
+    from .data.rtm import _read_points
+
+    ap = argparse.ArgumentParser(description="Pre-generate the vector tiles of the map layers.")
+    ap.add_argument("--max-zoom", type=int, default=12)
+    ap.add_argument("--out", type=Path, default=TILE_DIR)
+    args = ap.parse_args()
+
+    tiles = TileSet({
+        "counties":     _read_county_geo()["features"],
+        "territories":  _read_territory_geo()["features"],
+        "distributors": points_to_features(_read_points(), props=["Distributor"]),
+    }, minzoom={"distributors": DISTRIBUTOR_MINZOOM})
+    n = write_tiles(tiles, args.out, args.max_zoom)
+    print(f"{n} tiles written to {args.out / tiles.version}; serve {args.out} and set "
+          f"KENYA_TILE_URL to its public URL")
+
+
+if __name__ == "__main__":
+    _main()
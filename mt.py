@@ -2,10 +2,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
-from pathlib import Path
-import numpy as np
-import re
+from kenya_dashboard.data import county_geo_source, levels, load_county_geo, load_mt, select
+from kenya_dashboard.data.mt import COMP_COL, CS_COL, SALES_COL, WS_COL
 
 # ─── page / style ─────────────────────────────────────────
 st.set_page_config(page_title="MT Dashboard",
@@ -25,62 +23,20 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ─── file paths ───────────────────────────────────────────
-XL_FILE  = "WHITE_SPACE_SCORES_PAVANI.xlsx"
-GEO_FILE = "kenya.geojson"
-
-# ─── load Excel ───────────────────────────────────────────
-@st.cache_data(show_spinner="Loading MT Excel …")
-def load_mt():
-    df = pd.read_excel(XL_FILE)
-
-    # rename to simple names
-    df = df.rename(columns={
-        "County": "County",
-        "BRAND": "Brand",
-        "Client Market Share": "Client_Share",
-        "Competitor Strength": "Competitor_Strength",
-        "ERP GT Sales Coverage": "Sales",
-        "White Space Score": "WS_Score",
-        "CATEGORY": "Category",
-    })
-
-    df["County"]  = df["County"].astype(str).str.title().str.strip()
-    df["Brand"]   = df["Brand"].astype(str).str.title().str.strip()
-    df["Category"]= df["Category"].astype(str).str.title().str.strip()
-
-    # convert shares to %
-    if df["Client_Share"].max() <= 1:        # fraction → %
-        df["Client_Share"]        *= 100
-    if df["Competitor_Strength"].max() <= 1:
-        df["Competitor_Strength"] *= 100
-
-    return df
-
-@st.cache_data(show_spinner="Loading Kenya GeoJSON …")
-def load_geo():
-    geo = json.loads(Path(GEO_FILE).read_text("utf-8"))
-    for f in geo["features"]:
-        f["properties"]["county_key"] = (
-            f["properties"]["COUNTY_NAM"].title().strip()
-        )
-    return geo
+# ─── data (shared cached loaders) ────────────────────────
+percent = lambda s: s*100 if s.max() <= 1 else s
 
-df = load_mt()
-geo = load_geo()
+df  = load_mt()
+geo = load_county_geo(zoom=5.5)
 
 # ─── filters ──────────────────────────────────────────────
 st.markdown("## Main Dashboard – SUMMARY (MT)")
 
 c1, c2, _ = st.columns([1,1,6])
-brand = c1.selectbox("Brand",    ["All"] + sorted(df["Brand"].unique()))
-cat   = c2.selectbox("Category", ["All"] + sorted(df["Category"].unique()))
+brand = c1.selectbox("Brand",    ["All"] + levels(df, "Brand"))
+cat   = c2.selectbox("Category", ["All"] + levels(df, "CATEGORY"))
 
-sub = df.copy()
-if brand != "All":
-    sub = sub[sub["Brand"] == brand]
-if cat != "All":
-    sub = sub[sub["Category"] == cat]
+sub = select(df, Brand=brand, CATEGORY=cat)
 
 # ─── KPI cards ────────────────────────────────────────────
 def kpi(label, value):
@@ -96,9 +52,9 @@ def kpi(label, value):
     )
 
 k1,k2,k3 = st.columns(3)
-with k1: kpi("White-Space Score", f"{sub['WS_Score'].mean():,.0f}")
-with k2: kpi("Client Share",      f"{sub['Client_Share'].mean():.1f}%")
-with k3: kpi("Competitor Strength", f"{sub['Competitor_Strength'].mean():.1f}%")
+with k1: kpi("White-Space Score", f"{sub[WS_COL].mean():,.0f}")
+with k2: kpi("Client Share",      f"{percent(sub[CS_COL]).mean():.1f}%")
+with k3: kpi("Competitor Strength", f"{percent(sub[COMP_COL]).mean():.1f}%")
 
 st.markdown("<div style='height:30px'></div>", unsafe_allow_html=True)
 
@@ -106,16 +62,16 @@ left, _, right = st.columns([2,.05,1])
 
 # ─── choropleth map ───────────────────────────────────────
 with left:
-    ws_by_county = sub.groupby("County", as_index=False)["WS_Score"].mean()
-    counties = [f["properties"]["county_key"] for f in geo["features"]]
-    map_df = pd.DataFrame({"County": counties}).merge(ws_by_county, how="left").fillna({"WS_Score": 0})
+    ws_by_county = sub.groupby("COUNTY_KEY", as_index=False, observed=True)[WS_COL].mean()
+    counties = [f["properties"]["COUNTY_KEY"] for f in geo["features"]]
+    map_df = pd.DataFrame({"COUNTY_KEY": counties}).merge(ws_by_county, how="left").fillna({WS_COL: 0})
 
     fig_map = px.choropleth_map(
         map_df,
-        geojson=geo,
-        locations="County",
-        featureidkey="properties.county_key",
-        color="WS_Score",
+        geojson=county_geo_source(zoom=5.5),
+        locations="COUNTY_KEY",
+        featureidkey="properties.COUNTY_KEY",
+        color=WS_COL,
         color_continuous_scale="YlOrRd",
         range_color=(0, 60),
         center={"lat": 0.23, "lon": 37.9},
@@ -134,23 +90,25 @@ with left:
 # ─── bar charts ───────────────────────────────────────────
 with right:
     share = (
-        sub.groupby("County")[["Client_Share", "Competitor_Strength"]]
+        sub.groupby("County", observed=True)[[CS_COL, COMP_COL]]
         .mean()
         .reset_index()
     )
+    share[CS_COL]   = percent(share[CS_COL])
+    share[COMP_COL] = percent(share[COMP_COL])
     op = [1] * len(share)   # no opacity dimming because we filter by dropdowns
     fig_share = go.Figure()
     fig_share.add_bar(
         name="Client Share",
         x=share["County"],
-        y=share["Client_Share"],
+        y=share[CS_COL],
         marker_color="#00B4D8",
         marker_opacity=op,
     )
     fig_share.add_bar(
         name="Competitor Strength",
         x=share["County"],
-        y=share["Competitor_Strength"],
+        y=share[COMP_COL],
         marker_color="#0077B6",
         marker_opacity=op,
     )
@@ -168,11 +126,11 @@ with right:
     )
     st.plotly_chart(fig_share, use_container_width=True)
 
-    sales = sub.groupby("County")["Sales"].sum().reset_index()
+    sales = sub.groupby("County", observed=True)[SALES_COL].sum().reset_index()
     fig_sales = go.Figure(
         go.Bar(
             x=sales["County"],
-            y=sales["Sales"],
+            y=sales[SALES_COL],
             marker_color="#48CAE4",
         )
     )
@@ -193,11 +151,11 @@ with right:
 st.markdown("### Detailed Market Snapshot")
 st.dataframe(
     sub[
-        ["County", "Category", "Brand", "Sales",
-         "Client_Share", "Competitor_Strength", "WS_Score"]
+        ["County", "CATEGORY", "Brand", SALES_COL,
+         CS_COL, COMP_COL, WS_COL]
     ],
     height=350,
     use_container_width=True,
 )
 
-st.caption("Source: WHITE_SPACE_SCORES_PAVANI.xlsx · kenya.geojson")
+st.caption("Source: MT_WHITE_SPACE_SCORE_CLEANED.xlsx · kenya.geojson")
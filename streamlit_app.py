@@ -10,19 +10,25 @@
 # ─────────────────────────────────────────────────────────────────────────────
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import json, geopandas as gpd
-from pathlib import Path
-import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-import json, re
-from pathlib import Path
-import importlib.util
-from sklearn.cluster import KMeans
+from kenya_dashboard.basemap import BLUE_OVERLAY, KENYA_CENTER, BaseMap
+from kenya_dashboard.figcache import figure
+from kenya_dashboard.filecache import download_data
+from kenya_dashboard.fragment import fragment
+from kenya_dashboard.lazy import lazy
+from kenya_dashboard.report_builder import request_report
+from kenya_dashboard.data import (
+    brand_white_space, by_region, county_geo_source, feature_keys, kpi_cell, levels,
+    load_centroids,
+    load_comp, load_county_geo, load_gt, load_kpi_cube,
+    load_mt, load_mt_clusters, load_opportunity, load_point_density,
+    load_population_pct, load_report, load_rtm, load_rtm_monthly, load_sku_gt,
+    load_territory_geo, load_top_locations, price_buckets, price_buckets_async, reason_cards,
+    select, territory_geo_source, vector_tiles, warm_price_buckets)
+
+# page-specific heavy module, imported on first use (README never loads it)
+px = lazy("plotly.express")
 # ╭──────────────────────────  APP CONFIG  ──────────────────────────╮
 st.set_page_config(page_title="Pwani Dashboards · Main",
                    layout="wide",
@@ -42,101 +48,20 @@ h1,h2,h3,h4,h5,h6{{color:#fff;margin:0}}
 .stPlotlyChart>div{{background:{NAVY_BG}!important}}
 </style>""", unsafe_allow_html=True)
 
-# ╭──────────────────────────  FILE PATHS  ──────────────────────────╮
-GT_FILE       = "GT_DATA_122_merged_filled.xlsx"
-TERR_GJ       = "kenya_territories (1).geojson"
-RTM_FILE  = "rtm_std_follow_GT_final (1).csv"
-COUNTY_GJ     = "kenya.geojson"
-MT_FILE       = "MT_WHITE_SPACE_SCORE_CLEANED.xlsx"
-CLUSTER_FILE  = "MT_CLUSTER_2_With_County.xlsx"
-COMP_FILE = "PWANI_COMP_STD_final_confirmed.xlsx"
-
-
-
-def load_rtm_main():
-
-    rtm = pd.read_csv(RTM_FILE)
-    rtm.columns = rtm.columns.str.strip().str.title()
-    rtm[["Territory", "County", "Brand"]] = rtm[["Territory", "County", "Brand"]].apply(
-        lambda s: s.str.title().str.strip())
-    
-    comp_df = pd.read_excel(COMP_FILE)
-    comp_df.columns = comp_df.columns.str.strip()
-    comp_df.rename(columns={"Market": "Territory"}, inplace=True)
-    comp_df["Territory"]  = comp_df["Territory"].str.title().str.strip()
-    comp_df["BRAND"]      = comp_df["BRAND"].str.title().str.strip()
-    comp_df["Competitor"] = comp_df["Competitor"].str.title().str.strip()
-
-    return rtm,comp_df
-
-RTM_DF,COMP_DF = load_rtm_main()
-
 SALES   = "ERP GT Sales Coverage"
 CS      = "Client Market Share"
 COMP    = "Competitor Strength"
 WS      = "White Space Score"
 AWS     = "Aws"
-# ╭──────────────────────  DATA LOADERS (cached)  ───────────────────╮
-@st.cache_data(show_spinner="Loading GT & territory …")
-def load_gt_terr():
-    gt = (pd.read_excel(GT_FILE)
-          .rename(columns=str.strip)
-          .rename(columns={"brand":"Brand","Markets":"Territory"}))
-    gt["Territory"] = gt["Territory"].str.title().str.strip()
-    gt["Brand"]     = gt["Brand"].str.title().str.strip()
-    gt["TERR_KEY"]  = gt["Territory"]
-
-    terr = json.loads(Path(TERR_GJ).read_text("utf-8"))
-    for f in terr["features"]:
-        f["properties"]["TERR_KEY"] = f["properties"]["TERRITORY"].title().strip()
-    return gt, terr
-
-@st.cache_data(show_spinner="Loading MT KPIs …")
-def load_mt():
-    df = pd.read_excel(MT_FILE)
-    df.columns = df.columns.str.strip()
-    df["County"] = df["County"].astype(str).str.title().str.strip()
-    df.rename(columns={"BRAND":"Brand"}, inplace=True, errors="ignore")
-    df["Brand"]  = df["Brand"].astype(str).str.title().str.strip()
-    df["COUNTY_KEY"] = df["County"]
-    for col in ["White Space Score","Client Market Share",
-                "Competitor Strength","ERP GT Sales Coverage"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-    return df
-
-@st.cache_data(show_spinner="Loading county GeoJSON …")
-def load_county_geo():
-    geo = json.loads(Path(COUNTY_GJ).read_text("utf-8"))
-    for f in geo["features"]:
-        nm = f["properties"].get("COUNTY_NAM") or f["properties"].get("NAME","")
-        f["properties"]["COUNTY_KEY"] = nm.title().strip()
-    return geo
-
-@st.cache_data(show_spinner="Loading cluster bubbles …")
-def load_bubbles():
-    df = pd.read_excel(CLUSTER_FILE)
-    df.columns = df.columns.str.strip()
-    df["County"] = df["County"].astype(str).str.title().str.strip()
-    df.rename(columns={"brand_qty_1":"Volume","BRAND":"Brand"}, inplace=True, errors="ignore")
-    df["Brand"]   = df["Brand"].astype(str).str.title().str.strip()
-    df["Cluster"] = df["SKU_CLUSTER"].str.extract(r"^(\w+)", expand=False).str.title()
-    df["Volume"]  = pd.to_numeric(df["Volume"], errors="coerce").fillna(0)
-    return df
-
-@st.cache_data
-def county_centroids(geojson):
-    gdf = gpd.GeoDataFrame.from_features(geojson["features"])
-    if gdf.crs is None: gdf.set_crs(epsg=4326, inplace=True)
-    gdf = gdf.to_crs(3857); gdf["geometry"] = gdf.geometry.centroid
-    gdf = gdf.to_crs(4326)
-    gdf["lon"], gdf["lat"] = gdf.geometry.x, gdf.geometry.y
-    return gdf[["COUNTY_KEY","lon","lat"]]
-
-GT_DF, TERR_GEO  = load_gt_terr()
+# ╭──────────────────────  DATA (kenya_dashboard.data)  ─────────────╮
+#  Canonical loaders, normalised once and shared by every page / app.
+GT_DF            = load_gt()
+TERR_GEO         = load_territory_geo(zoom=5.5)
+RTM_DF           = load_rtm()
+COMP_DF          = load_comp()
 MT_DF            = load_mt()
-COUNTY_GEO       = load_county_geo()
-MT_CLUSTER_DF    = load_bubbles()
-COUNTY_CENTROIDS = county_centroids(COUNTY_GEO)
+COUNTY_GEO       = load_county_geo(zoom=5.5)     # simplified for national maps
+MT_CLUSTER_DF    = load_mt_clusters()
 
 # ╭──────────────────────────  HELPERS  ─────────────────────────────╮
 percent = lambda s:(s*100 if s.max()<=1 else s).round(2)
@@ -145,18 +70,17 @@ COLOR_CLUSTERS = {"Green":"#2ECC71","Blue":"#3498DB","Yellow":"#F1C40F",
                   "White":"#ECF0F1","Purple":"#9B59B6","Red":"#E74C3C"}
 def spacer(px=25): st.markdown(f"<div style='height:{px}px'></div>", unsafe_allow_html=True)
 
-def add_zero_layer(fig, geojson, key_field, zero_keys, hovertxt):
+def add_zero_layer(fig, geo_source, key_field, zero_keys, hovertxt):
     """Paint polygons pure white for territories/counties with score 0."""
     if not zero_keys:
         return
-    z_polys = [f for f in geojson["features"] if f["properties"][key_field] in zero_keys]
     fig.add_trace(go.Choroplethmapbox(
-        geojson={"type":"FeatureCollection","features":z_polys},
-        locations=[p["properties"][key_field] for p in z_polys],
+        geojson=geo_source(zoom=5.5, keys=zero_keys),
+        locations=zero_keys,
         featureidkey=f"properties.{key_field}",
 
         # any constant z; colourscale forces white
-        z=[0]*len(z_polys),
+        z=[0]*len(zero_keys),
         colorscale=[[0,"white"],[1,"white"]],
         autocolorscale=False,
         showscale=False,
@@ -167,53 +91,250 @@ def add_zero_layer(fig, geojson, key_field, zero_keys, hovertxt):
     ))
 
 def draw_bubble_map(df):
-    grid=(df.groupby(["County","Cluster"],as_index=False)["Volume"].sum()
-          .merge(COUNTY_CENTROIDS,left_on="County",right_on="COUNTY_KEY",how="left"))
-    outline=go.Choroplethmapbox(
-        geojson=COUNTY_GEO,
-        locations=[f["properties"]["COUNTY_KEY"] for f in COUNTY_GEO["features"]],
-        z=[0]*len(COUNTY_GEO["features"]),showscale=False,
-        marker=dict(line=dict(color="rgba(180,180,180,0.25)",width=.4)))
+    grid=(df.groupby(["County","Cluster"],as_index=False,observed=True)["Volume"].sum()
+          .merge(load_centroids("county")[["COUNTY_KEY","lon","lat"]],
+                 left_on="County",right_on="COUNTY_KEY",how="left"))
+    tiles=vector_tiles()
+    outline=[] if tiles else [go.Choroplethmapbox(
+        geojson=county_geo_source(zoom=5.5),
+        locations=feature_keys("county", zoom=5.5),
+        z=[0]*len(feature_keys("county", zoom=5.5)),showscale=False,
+        marker=dict(line=dict(color="rgba(180,180,180,0.25)",width=.4)))]
+    tile_layers=[tiles.layer("counties",type="line",color="rgba(180,180,180,0.25)",
+                             line=dict(width=.4))] if tiles else []
     px_fig=px.scatter_mapbox(grid,lat="lat",lon="lon",size="Volume",size_max=45,
                              color="Cluster",color_discrete_map=COLOR_CLUSTERS,
                              hover_data=dict(County=True,Cluster=True,Volume=True,
                                              lat=False,lon=False))
-    fig=go.Figure([outline]+list(px_fig.data))
+    fig=go.Figure(outline+list(px_fig.data))
     fig.update_layout(mapbox=dict(
-        style="carto-darkmatter",zoom=5.5,center=dict(lat=0.23,lon=37.9),
-        layers=[dict(sourcetype="geojson",type="fill",below="traces",
-                     source={"type":"FeatureCollection","features":[{"type":"Feature",
-                     "geometry":{"type":"Polygon","coordinates":[[[10,-35],[70,-35],[70,25],[10,25],[10,-35]]]}}]},
-                     color="rgba(0,120,255,0.15)")] ),
+        style="carto-darkmatter",zoom=5.5,center=KENYA_CENTER,
+        layers=[BLUE_OVERLAY]+tile_layers ),
         height=520, margin=dict(l=0,r=0,t=30,b=0),
         paper_bgcolor=NAVY_BG, plot_bgcolor=NAVY_BG, font_color=FG_TEXT)
     return fig
 
+# ╭───────────────────  BASE MAPS (kenya_dashboard.basemap)  ────────╮
+#  Each map type's figure is built once per process from a sample frame;
+#  renders only swap in locations / z / hover values.
+WS_BINS   = [0,10,20,30,40,50,60,np.inf]
+WS_LABELS = ["0-10","10-20","20-30","30-40","40-50","50-60","60+"]
+WS_COLOURS = {
+                "0-10": "#ffffcc",   # very light yellow
+                "10-20": "#ffeda0",  # light yellow-orange
+                "20-30": "#fed976",  # yellow-orange
+                "30-40": "#feb24c",  # orange
+                "40-50": "#fd8d3c",  # strong orange-red
+                "50-60": "#f03b20",  # red-orange
+                "60+":  "#bd0026",   # deep red
+            }
+
+def zero_values(geo_source, zero_keys):
+    """Values of the white "not present" slot (see ``add_zero_layer``)."""
+    return {"geojson": geo_source(zoom=5.5, keys=zero_keys),
+            "locations": zero_keys, "z": [0]*len(zero_keys)}
+
+@st.cache_resource(show_spinner=False)
+def territory_ws_base():
+    """GT White Space map: one slot per score bin + the zero layer."""
+    sample = pd.DataFrame({"TERR_KEY": WS_LABELS, "ws_bin": WS_LABELS, "White Space Score": 0.0})
+    fig = px.choropleth_mapbox(
+        sample, geojson=territory_geo_source(zoom=5.5), locations="TERR_KEY",
+        featureidkey="properties.TERR_KEY",
+        color="ws_bin", category_orders={"ws_bin":WS_LABELS},
+        color_discrete_map=WS_COLOURS,
+        mapbox_style="carto-darkmatter",
+        center=KENYA_CENTER, zoom=5.5,
+        opacity=.9, height=520,
+        hover_data={"ws_bin":True,"White Space Score":":.1f"})
+    fig.update_layout(mapbox=dict(layers=[BLUE_OVERLAY]),
+        margin=dict(l=0,r=0,t=30,b=0),
+        paper_bgcolor=NAVY_BG,plot_bgcolor=NAVY_BG,font_color=FG_TEXT)
+    add_zero_layer(fig, territory_geo_source, "TERR_KEY", WS_LABELS[:1],
+                   "You are not selling here")
+    return BaseMap(fig, *WS_LABELS, "zero")
+
+@st.cache_resource(show_spinner=False)
+def county_ws_base():
+    """MT White Space map: continuous score slot + the zero layer."""
+    sample = pd.DataFrame({"COUNTY_KEY": ["-"], "White Space Score": [0.0]})
+    fig = px.choropleth_mapbox(
+        sample,geojson=county_geo_source(zoom=5.5),locations="COUNTY_KEY",
+        featureidkey="properties.COUNTY_KEY",
+        color="White Space Score",color_continuous_scale="YlOrRd",
+        range_color=(0,60),mapbox_style="carto-darkmatter",
+        center=KENYA_CENTER,zoom=5.5,
+        opacity=.9,height=520)
+    fig.update_layout(mapbox=dict(layers=[BLUE_OVERLAY]),
+        paper_bgcolor=NAVY_BG,plot_bgcolor=NAVY_BG,
+        margin=dict(l=0,r=0,t=30,b=0),font_color=FG_TEXT)
+    add_zero_layer(fig, county_geo_source, "COUNTY_KEY", ["-"], "Not present here")
+    fig.update_layout(legend=dict(traceorder="normal"))
+    return BaseMap(fig, "ws", "zero")
+
+@st.cache_resource(show_spinner=False)
+def aws_hot_zone_base():
+    """Deep-dive RTM map: county AWS slot + the territory outline."""
+    sample = pd.DataFrame({"COUNTY_KEY": ["-"], AWS: [0.0]})
+    mfig = px.choropleth_mapbox(
+        sample, geojson=county_geo_source(zoom=6), locations="COUNTY_KEY",
+        featureidkey="properties.COUNTY_KEY", color=AWS,
+        color_continuous_scale="YlOrRd", mapbox_style="carto-darkmatter",
+        center=KENYA_CENTER, zoom=6, opacity=0.9, height=330)
+    # Territory outline (white border)
+    mfig.add_trace(go.Choroplethmapbox(
+        geojson=territory_geo_source(zoom=6), locations=["-"],
+        featureidkey="properties.TERR_KEY", z=[0],
+        colorscale=[[0, "rgba(0,0,0,0)"], [1, "rgba(0,0,0,0)"]], showscale=False,
+        marker_line_color="#e2e8f0", marker_line_width=1.3, hoverinfo="skip"))
+    mfig.update_layout(mapbox=dict(style="carto-darkmatter", layers=[BLUE_OVERLAY]),
+                       paper_bgcolor=NAVY_BG, plot_bgcolor=NAVY_BG, font_color=FG_TEXT,
+                       margin=dict(l=0, r=0, t=10, b=10))
+    return BaseMap(mfig, "aws", "outline")
+
+@st.cache_resource(show_spinner=False)
+def opportunity_base():
+    """Opportunity map: county score slot + the (static) distributor density."""
+    dens   = load_point_density(5.5)     # hex-binned outlets
+    sample = pd.DataFrame({"County": ["-"], "Opportunity Score": [0.0]})
+    fig = px.choropleth_mapbox(
+        sample, geojson=county_geo_source(zoom=5.5),
+        locations="County", featureidkey="properties.COUNTY_KEY",
+        color="Opportunity Score", color_continuous_scale="YlOrRd",
+        mapbox_style="carto-darkmatter", center=KENYA_CENTER, zoom=5.5,
+        opacity=0.9, height=MAP_TABLE_HEIGHT)
+    fig.add_trace(go.Densitymapbox(
+        lat=dens["Latitude"], lon=dens["Longitude"],
+        # log-scaled outlet counts, colour range taken from the data
+        z=dens["Intensity"], zmin=0, zmax=dens["Intensity"].max(), radius=14, opacity=0.7,
+        colorscale=[[0,"rgba(0,120,255,0.25)"],
+                    [0.3,"rgba(0,120,255,0.55)"],
+                    [1,"rgba(0,120,255,0.9)"]],
+        showscale=False, name="Distributor Density"))
+    fig.update_layout(paper_bgcolor=NAVY_BG, font_color=FG_TEXT,
+                      margin=dict(l=0,r=0,t=15,b=0))
+    # individual outlets once zoomed in, streamed as vector tiles
+    if (tiles := vector_tiles()) is not None:
+        fig.update_layout(mapbox_layers=[tiles.layer(
+            "distributors", type="circle",
+            color="rgba(0,180,255,0.9)", circle=dict(radius=4))])
+    return BaseMap(fig, "score", "density")
+
+# ╭──────────────────  FIGURES (kenya_dashboard.figcache)  ──────────╮
+#  Built from the filter values alone, so ``figure()`` can serve repeat
+#  views of a (brand, region) combination from the shared cache.
+def gt_ws_map(brand, sel):
+    full_keys=feature_keys("territory", zoom=5.5)
+    mdf = (pd.DataFrame({"TERR_KEY":full_keys})
+           .merge(by_region(load_kpi_cube("GT"), brand)[["Territory","White Space Score"]]
+                  .rename(columns={"Territory":"TERR_KEY"}),
+                  how="left").fillna({"White Space Score":0}))
+    if sel!="All":
+        mdf.loc[mdf["TERR_KEY"]!=sel,"White Space Score"]=0
+
+    # Discrete bins, one trace each (in bin order, as px draws them)
+    mdf["ws_bin"] = pd.cut(mdf["White Space Score"],
+                           bins=WS_BINS, labels=WS_LABELS,
+                           right=False, include_lowest=True)
+    traces = [(label, {"locations": g["TERR_KEY"].tolist(), "z": [1]*len(g),
+                       "customdata": list(zip(g["ws_bin"].astype(str), g["White Space Score"]))})
+              for label, g in mdf.groupby("ws_bin", observed=True)]
+    zero = mdf.loc[mdf["White Space Score"]==0,"TERR_KEY"].tolist()
+    if zero:
+        traces.append(("zero", zero_values(territory_geo_source, zero)))
+    return territory_ws_base().render(*traces)
+
+def gt_composition(brand, sel):
+    comp = by_region(load_kpi_cube("GT"), brand)
+    op=[1 if(sel=="All" or r==sel) else .3 for r in comp["Territory"]]
+
+    stk=go.Figure()
+    stk.add_bar(name="Client Share",x=comp["Territory"],y=comp["Client Market Share"],
+                marker_color="#00B4D8",marker_opacity=op)
+    stk.add_bar(name="Competitor Strength",x=comp["Territory"],y=comp["Competitor Strength"],
+                marker_color="#0077B6",marker_opacity=op)
+    stk.update_layout(barmode="stack",height=260,title="Market Composition",
+                      paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
+                      margin=dict(l=0,r=0,t=30,b=0),
+                      xaxis=AXIS,yaxis=AXIS,
+                      legend=dict(orientation="h",
+                                  yanchor="bottom",y=-.25,bgcolor="rgba(0,0,0,0)"))
+    return stk
+
+def gt_sales(brand, sel):
+    sales = by_region(load_kpi_cube("GT"), brand)
+    sop=[1 if(sel=="All" or r==sel) else .3 for r in sales["Territory"]]
+    erp=go.Figure(go.Bar(x=sales["Territory"],y=sales["ERP GT Sales Coverage"],
+                         marker_color="#48CAE4",marker_opacity=sop))
+    erp.update_layout(title="Sales",height=260,
+                      paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
+                      bargap=.15,margin=dict(l=0,r=0,t=40,b=0),
+                      xaxis=AXIS,yaxis=AXIS,showlegend=False)
+    return erp
+
+def mt_ws_map(brand, sel):
+    all_counties=feature_keys("county", zoom=5.5)
+    mdf=(pd.DataFrame({"COUNTY_KEY":all_counties})
+          .merge(by_region(load_kpi_cube("MT"), brand)[["County","White Space Score"]]
+                 .rename(columns={"County":"COUNTY_KEY"}),
+                 how="left").fillna({"White Space Score":0}))
+    if sel!="All": mdf.loc[mdf["COUNTY_KEY"]!=sel,"White Space Score"]=0
+    traces = [("ws", {"locations": all_counties, "z": mdf["White Space Score"].tolist()})]
+    zero = mdf.loc[mdf["White Space Score"]==0,"COUNTY_KEY"].tolist()
+    if zero:
+        traces.append(("zero", zero_values(county_geo_source, zero)))
+    return county_ws_base().render(*traces)
+
+def mt_composition(sel):
+    comp=by_region(load_kpi_cube("MT"))
+    op=[1 if(sel=="All" or r==sel) else .3 for r in comp["County"]]
+
+    stack=go.Figure()
+    stack.add_bar(name="Client Share",x=comp["County"],y=comp["Client Market Share"],
+                  marker_color="#00B4D8",marker_opacity=op)
+    stack.add_bar(name="Competitor Strength",x=comp["County"],y=comp["Competitor Strength"],
+                  marker_color="#0077B6",marker_opacity=op)
+    stack.update_layout(barmode="stack",height=260,title="Market Composition",
+                        paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
+                        margin=dict(l=0,r=0,t=30,b=0),
+                        xaxis=AXIS|dict(tickangle=-45),yaxis=AXIS,
+                        legend=dict(orientation="h",yanchor="bottom",
+                                    y=1.02,bgcolor="rgba(0,0,0,0)"))
+    return stack
+
+def mt_sales(sel):
+    sales=by_region(load_kpi_cube("MT"))
+    sop=[1 if(sel=="All" or r==sel) else .3 for r in sales["County"]]
+    erp=go.Figure(go.Bar(x=sales["County"],y=sales["ERP GT Sales Coverage"],
+                         marker_color="#48CAE4",marker_opacity=sop))
+    erp.update_layout(title="Sales",height=260,
+                      paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
+                      bargap=.15,margin=dict(l=0,r=0,t=40,b=0),
+                      xaxis=AXIS|dict(tickangle=-45),yaxis=AXIS,
+                      showlegend=False)
+    return erp
+
 # ╭────────────────────────  PAGE FUNCTION  ─────────────────────────╮
 def page_main_dashboard():
     st.markdown("## Main Dashboard")
 
     mode = st.selectbox("Data Source", ("GT – Territory View", "MT – County View"))
     is_mt = mode.startswith("MT")
-    df, geo, region, key = \
-        (GT_DF, TERR_GEO, "Territory", "TERR_KEY") if not is_mt \
-        else (MT_DF, COUNTY_GEO, "County", "COUNTY_KEY")
+    df, region = (GT_DF, "Territory") if not is_mt else (MT_DF, "County")
+    cube = load_kpi_cube("MT" if is_mt else "GT")
 
     c1, c2, _ = st.columns([1,1,5])
-    brand = c1.selectbox("Brand", ["All"]+sorted(df["Brand"].unique()))
-    sel   = c2.selectbox(region, ["All"]+sorted(df[region].unique()))
-
-    view = df.copy()
-    if brand != "All": view = view[view["Brand"] == brand]
-    if sel   != "All": view = view[view[region] == sel]
+    brand = c1.selectbox("Brand", ["All"]+levels(df, "Brand"))
+    sel   = c2.selectbox(region, ["All"]+levels(df, region))
 
     # KPI strip
+    kpi = kpi_cell(cube, brand, sel)
     k1,k2,k3=st.columns(3)
     for box,title,val in zip([k1,k2,k3],
         ["White Space Score","Client Market Share","Competitor Strength"],
-        [f"{view['White Space Score'].mean():.0f}",
-         f"{percent(view['Client Market Share']).mean():.1f}%",
-         f"{percent(view['Competitor Strength']).mean():.1f}%"]):
+        [f"{kpi['White Space Score']:.0f}",
+         f"{kpi['Client Market Share']:.1f}%",
+         f"{kpi['Competitor Strength']:.1f}%"]):
         box.markdown(f"""
         <div style='border:1px solid #ccc;border-radius:10px;
              padding:1rem;background:#253348;height:160px'>
@@ -230,82 +351,13 @@ def page_main_dashboard():
         map_col,_,bar_col = st.columns([2,.05,1])
 
         with map_col:
-            base = df if brand=="All" else df[df["Brand"]==brand]
-            full_keys=[f["properties"][key] for f in geo["features"]]
-            mdf = (pd.DataFrame({key:full_keys})
-                   .merge(base.groupby(key,as_index=False)["White Space Score"].mean(),
-                          how="left").fillna({"White Space Score":0}))
-            if sel!="All":
-                mdf.loc[mdf[key]!=sel,"White Space Score"]=0
-
-            # Discrete bins
-            bins   = [0,10,20,30,40,50,60,np.inf]
-            labels = ["0-10","10-20","20-30","30-40","40-50","50-60","60+"]
-            mdf["ws_bin"] = pd.cut(mdf["White Space Score"],
-                                   bins=bins, labels=labels,
-                                   right=False, include_lowest=True)
-            BIN_COLOURS = {
-                                "0-10": "#ffffcc",   # very light yellow
-                                "10-20": "#ffeda0",  # light yellow-orange
-                                "20-30": "#fed976",  # yellow-orange
-                                "30-40": "#feb24c",  # orange
-                                "40-50": "#fd8d3c",  # strong orange-red
-                                "50-60": "#f03b20",  # red-orange
-                                "60+":  "#bd0026",   # deep red
-                            }
-            fig = px.choropleth_mapbox(
-                mdf, geojson=geo, locations=key,
-                featureidkey=f"properties.{key}",
-                color="ws_bin", category_orders={"ws_bin":labels},
-                color_discrete_map=BIN_COLOURS,
-                mapbox_style="carto-darkmatter",
-                center=dict(lat=0.23,lon=37.9), zoom=5.5,
-                opacity=.9, height=520,
-                hover_data={"ws_bin":True,"White Space Score":":.1f"})
-            # blue overlay
-            fig.update_layout(mapbox=dict(layers=[dict(
-                sourcetype="geojson",type="fill",below="traces",
-                source={"type":"FeatureCollection","features":[{"type":"Feature",
-                    "geometry":{"type":"Polygon","coordinates":[[[10,-35],[70,-35],
-                        [70,25],[10,25],[10,-35]]]}}]},
-                color="rgba(0,120,255,0.15)")] ),
-                margin=dict(l=0,r=0,t=30,b=0),
-                paper_bgcolor=NAVY_BG,plot_bgcolor=NAVY_BG,font_color=FG_TEXT)
-            add_zero_layer(fig, geo, key,
-                           mdf.loc[mdf["White Space Score"]==0,key].tolist(),
-                           "You are not selling here")
-            st.plotly_chart(fig,use_container_width=True)
+            st.plotly_chart(figure("main", "gt_ws_map", gt_ws_map, brand, sel),
+                            use_container_width=True)
         with bar_col:
-            comp = (df if brand=="All" else df[df["Brand"]==brand]) \
-                   .groupby(region, as_index=False)[["Client Market Share",
-                                                     "Competitor Strength"]].mean()
-            comp["Client Market Share"]=percent(comp["Client Market Share"])
-            comp["Competitor Strength"]=percent(comp["Competitor Strength"])
-            op=[1 if(sel=="All" or r==sel) else .3 for r in comp[region]]
-
-            stk=go.Figure()
-            stk.add_bar(name="Client Share",x=comp[region],y=comp["Client Market Share"],
-                        marker_color="#00B4D8",marker_opacity=op)
-            stk.add_bar(name="Competitor Strength",x=comp[region],y=comp["Competitor Strength"],
-                        marker_color="#0077B6",marker_opacity=op)
-            stk.update_layout(barmode="stack",height=260,title="Market Composition",
-                              paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
-                              margin=dict(l=0,r=0,t=30,b=0),
-                              xaxis=AXIS,yaxis=AXIS,
-                              legend=dict(orientation="h",
-                                          yanchor="bottom",y=-.25,bgcolor="rgba(0,0,0,0)"))
-            st.plotly_chart(stk,use_container_width=True)
-
-            sales=(df if brand=="All" else df[df["Brand"]==brand]) \
-                  .groupby(region,as_index=False)["ERP GT Sales Coverage"].sum()
-            sop=[1 if(sel=="All" or r==sel) else .3 for r in sales[region]]
-            erp=go.Figure(go.Bar(x=sales[region],y=sales["ERP GT Sales Coverage"],
-                                 marker_color="#48CAE4",marker_opacity=sop))
-            erp.update_layout(title="Sales",height=260,
-                              paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
-                              bargap=.15,margin=dict(l=0,r=0,t=40,b=0),
-                              xaxis=AXIS,yaxis=AXIS,showlegend=False)
-            st.plotly_chart(erp,use_container_width=True)
+            st.plotly_chart(figure("main", "gt_composition", gt_composition, brand, sel),
+                            use_container_width=True)
+            st.plotly_chart(figure("main", "gt_sales", gt_sales, brand, sel),
+                            use_container_width=True)
 
         spacer(); st.markdown("---"); st.markdown("### Detailed Dataset")
         st.dataframe(df,height=350,use_container_width=True); spacer(20)
@@ -315,37 +367,15 @@ def page_main_dashboard():
 
         with map_l:
             st.markdown("### MT White Space")
-            base=df if brand=="All" else df[df["Brand"]==brand]
-            all_counties=[f["properties"]["COUNTY_KEY"] for f in COUNTY_GEO["features"]]
-            mdf=(pd.DataFrame({"COUNTY_KEY":all_counties})
-                  .merge(base.groupby("COUNTY_KEY",as_index=False)["White Space Score"].mean(),
-                         how="left").fillna({"White Space Score":0}))
-            if sel!="All": mdf.loc[mdf["COUNTY_KEY"]!=sel,"White Space Score"]=0
-            fig_c=px.choropleth_mapbox(
-                mdf,geojson=COUNTY_GEO,locations="COUNTY_KEY",
-                featureidkey="properties.COUNTY_KEY",
-                color="White Space Score",color_continuous_scale="YlOrRd",
-                range_color=(0,60),mapbox_style="carto-darkmatter",
-                center=dict(lat=0.23,lon=37.9),zoom=5.5,
-                opacity=.9,height=520)
-            fig_c.update_layout(mapbox=dict(layers=[dict(sourcetype="geojson",type="fill",
-                below="traces",source={"type":"FeatureCollection","features":[{"type":"Feature",
-                "geometry":{"type":"Polygon","coordinates":[[[10,-35],[70,-35],[70,25],[10,25],[10,-35]]]}}]},
-                color="rgba(0,120,255,0.15)")] ),
-                paper_bgcolor=NAVY_BG,plot_bgcolor=NAVY_BG,
-                margin=dict(l=0,r=0,t=30,b=0),font_color=FG_TEXT)
-            add_zero_layer(fig_c, COUNTY_GEO, "COUNTY_KEY",
-                           mdf.loc[mdf["White Space Score"]==0,"COUNTY_KEY"].tolist(),
-                           "Not present here")
-            fig_c.update_layout(legend=dict(traceorder="normal"))
-            st.plotly_chart(fig_c,use_container_width=True)
+            st.plotly_chart(figure("main", "mt_ws_map", mt_ws_map, brand, sel),
+                            use_container_width=True)
 
         with map_r:
             st.markdown("### Cluster Density by County")
-            bub=MT_CLUSTER_DF.copy()
-            if brand!="All": bub=bub[bub["Brand"]==brand]
-            if sel!="All" :  bub=bub[bub["County"]==sel]
-            st.plotly_chart(draw_bubble_map(bub),use_container_width=True)
+            st.plotly_chart(figure("main", "mt_bubbles",
+                                   lambda b, s: draw_bubble_map(select(MT_CLUSTER_DF, Brand=b, County=s)),
+                                   brand, sel),
+                            use_container_width=True)
 
         spacer()
 
@@ -353,36 +383,10 @@ def page_main_dashboard():
 
         with gcol:
             st.markdown("### Market and Sales")
-
-            comp=df.groupby("County",as_index=False)[["Client Market Share",
-                                                     "Competitor Strength"]].mean()
-            comp["Client Market Share"]=percent(comp["Client Market Share"])
-            comp["Competitor Strength"]=percent(comp["Competitor Strength"])
-            op=[1 if(sel=="All" or r==sel) else .3 for r in comp["County"]]
-
-            stack=go.Figure()
-            stack.add_bar(name="Client Share",x=comp["County"],y=comp["Client Market Share"],
-                          marker_color="#00B4D8",marker_opacity=op)
-            stack.add_bar(name="Competitor Strength",x=comp["County"],y=comp["Competitor Strength"],
-                          marker_color="#0077B6",marker_opacity=op)
-            stack.update_layout(barmode="stack",height=260,title="Market Composition",
-                                paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
-                                margin=dict(l=0,r=0,t=30,b=0),
-                                xaxis=AXIS|dict(tickangle=-45),yaxis=AXIS,
-                                legend=dict(orientation="h",yanchor="bottom",
-                                            y=1.02,bgcolor="rgba(0,0,0,0)"))
-            st.plotly_chart(stack,use_container_width=True)
-
-            sales=df.groupby("County",as_index=False)["ERP GT Sales Coverage"].sum()
-            sop=[1 if(sel=="All" or r==sel) else .3 for r in sales["County"]]
-            erp=go.Figure(go.Bar(x=sales["County"],y=sales["ERP GT Sales Coverage"],
-                                 marker_color="#48CAE4",marker_opacity=sop))
-            erp.update_layout(title="Sales",height=260,
-                              paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
-                              bargap=.15,margin=dict(l=0,r=0,t=40,b=0),
-                              xaxis=AXIS|dict(tickangle=-45),yaxis=AXIS,
-                              showlegend=False)
-            st.plotly_chart(erp,use_container_width=True)
+            st.plotly_chart(figure("main", "mt_composition", mt_composition, sel),
+                            use_container_width=True)
+            st.plotly_chart(figure("main", "mt_sales", mt_sales, sel),
+                            use_container_width=True)
 
         with tcol:
             st.markdown("### Detailed Dataset")
@@ -402,32 +406,105 @@ def page_main_dashboard():
 # ────────────────────────────────────────────────────────────────────
 
 
+# ╭──────────────────────────  PAGE 2 FIGURES  ──────────────────────╮
+def rtm_slice(territory, brand):
+    rtm_sel = RTM_DF[RTM_DF["Territory"] == territory]
+    if brand != "All":
+        rtm_sel = rtm_sel[rtm_sel["Brand"] == brand]
+    return rtm_sel
+
+# RTM hot-zone map with full blue overlay
+def rtm_hot_zone_map(territory, brand):
+    rtm_sel = rtm_slice(territory, brand)
+
+    counties = rtm_sel["County"].unique()
+    map_df = (
+        pd.DataFrame({"COUNTY_KEY": counties})
+        .merge(
+            rtm_sel[["County", AWS]].rename(columns={"County": "COUNTY_KEY"}),
+            how="left"
+        )
+        .fillna({AWS: 0})
+    )
+    return aws_hot_zone_base().render(
+        ("aws",     {"geojson": county_geo_source(zoom=6, keys=counties),
+                     "locations": map_df["COUNTY_KEY"].tolist(), "z": map_df[AWS].tolist()}),
+        ("outline", {"geojson": territory_geo_source(zoom=6, keys=[territory]),
+                     "locations": [territory]}))
+
+# AWS distribution
+def aws_histogram(territory, brand):
+    rtm_sel = rtm_slice(territory, brand)
+    hist = px.histogram(
+        rtm_sel, x=AWS, nbins=5, labels={AWS: "AWS Score"},
+        color_discrete_sequence=["#38bdf8"])
+    hist.update_layout(
+        height=330, bargap=0.5,
+        paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG,
+        xaxis=AXIS, yaxis=AXIS,
+        margin=dict(l=0, r=0, t=10, b=10)
+    )
+    return hist
+
+
+# Key Competitor Analysis: the competitor box reruns this panel only
+@fragment
+def competitor_panel(territory, brand):
+    with st.container():
+        st.markdown("### Key Competitor Analysis")
+
+        # ── choose brand & competitor numerics (unchanged logic) ──────────
+        if brand == "All":
+            st.info("Select a specific **brand** above to view competitor analysis.")
+            sel_comp = None
+        else:
+            comp_rows = COMP_DF[(COMP_DF["Territory"] == territory) &
+                                (COMP_DF["BRAND"]     == brand)]
+            if comp_rows.empty:
+                st.warning("No numeric competitor data for this territory & brand.")
+                sel_comp = None
+            else:
+                sel_comp = st.selectbox("Select Competitor",
+                                        levels(comp_rows, "Competitor"))
+                row = comp_rows[comp_rows["Competitor"] == sel_comp].iloc[0]
+                client_val = row["Pwani Market Share (%)"]
+                comp_val   = row["Competitor Market Share (%)"]
+                total_val  = client_val + comp_val
+
+                fig_strip = go.Figure()
+                fig_strip.add_bar(y=["Market"], x=[client_val],
+                                orientation='h', marker_color="#38bdf8",
+                                text=[f"Client {client_val:.1f}%"],
+                                textposition="inside")
+                fig_strip.add_bar(y=["Market"], x=[comp_val],
+                                orientation='h', marker_color="#64748b",
+                                text=[f"{sel_comp} {comp_val:.1f}%"],
+                                textposition="inside")
+                fig_strip.update_layout(
+                    barmode="stack", height=140,
+                    title=f"Total Market Value: {total_val:.1f}%",
+                    margin=dict(l=20,r=20,t=40,b=10),
+                    paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG,
+                    xaxis=dict(visible=False), yaxis=dict(visible=False),
+                    font=dict(color="#e3e8ef"), showlegend=False)
+                st.plotly_chart(fig_strip, use_container_width=True)
+
+        # ── narrative cards (reason_cards) ─────────────────────────────────
+        if sel_comp:
+            cards = reason_cards(brand, sel_comp, territory)
+            if not cards:
+                st.info("No narrative analysis found for this competitor.")
+            else:
+                st.markdown("#### Reasons Outperformance")
+                st.markdown(cards, unsafe_allow_html=True)
+
+
 # ╭───────────────────────────────  PAGE 2  ─────────────────────────╮
 # Territory Deep-Dive  (unchanged logic, wrapped into a function)
 # -------------------------------------------------------------------
 def page_territory_deep_dive():
     
 
-    # ── COMPETITOR TEXT ANALYSIS  (Reasons for outperformance) ──────────
-    TEXT_CSV = "all_brands_competitive_analysis_20250530_140609.csv"
-
-    @st.cache_data(show_spinner="Loading competitor-analysis text …")
-    def load_comp_text():
-        df = pd.read_csv(TEXT_CSV)
-        # Normalise naming
-        df.columns = df.columns.str.strip()
-        df["Brand"]      = df["Brand"].astype(str).str.title().str.strip()
-        df["Competitor"] = df["Competitor"].astype(str).str.title().str.strip()
-        df["Territory"]  = df["Territory"].astype(str).str.title().str.strip()
-        # make % numeric helper
-        for col in ["Brand_Market_Share", "Competitor_Market_Share"]:
-            if col in df.columns:
-                df[col+"_num"] = (df[col].str.replace("%","").astype(float)
-                                            .round(2).fillna(0))
-        return df
-
-    COMP_TXT_DF = load_comp_text()
-
     # --------------------------------------------------------------------- #
     # Territory Deep-Dive Dashboard
     # --------------------------------------------------------------------- #
@@ -436,8 +513,8 @@ def page_territory_deep_dive():
 
     # ── FILTERS & KPI METRICS ─────────────────────────────────────────────
     c1, c2, c3, c4, c5, c6 = st.columns([1, 1, 1, 1, 1, 1])
-    territory = c1.selectbox("Territory", sorted(GT_DF["Territory"].unique()))
-    brand     = c2.selectbox("Brand", ["All"] + sorted(GT_DF["Brand"].unique()))
+    territory = c1.selectbox("Territory", levels(GT_DF, "Territory"))
+    brand     = c2.selectbox("Brand", ["All"] + levels(GT_DF, "Brand"))
 
     sub_df = GT_DF[GT_DF["Territory"] == territory]
     if brand != "All":
@@ -454,122 +531,25 @@ def page_territory_deep_dive():
             f"<div class='number {cls}'>{val}</div>",
             unsafe_allow_html=True)
 
-    rtm_sel = RTM_DF[RTM_DF["Territory"] == territory]
-    if brand != "All":
-        rtm_sel = rtm_sel[rtm_sel["Brand"] == brand]
-
     left, right = st.columns(2)
 
     # ── LEFT COLUMN : RTM Map with Full Blue Overlay ──────────────────────
     with left:
         st.markdown("### RTM Insights (Hot Zones)")
-
-        counties = rtm_sel["County"].unique()
-        map_df = (
-            pd.DataFrame({"COUNTY_KEY": counties})
-            .merge(
-                rtm_sel[["County", AWS]].rename(columns={"County": "COUNTY_KEY"}),
-                how="left"
-            )
-            .fillna({AWS: 0})
-        )
-
-        county_sub = {
-            "type": "FeatureCollection",
-            "features": [
-                f for f in COUNTY_GEO["features"]
-                if f["properties"]["COUNTY_KEY"] in counties
-            ]
-        }
-
-        mfig = px.choropleth_mapbox(
-            map_df,
-            geojson=county_sub,
-            locations="COUNTY_KEY",
-            featureidkey="properties.COUNTY_KEY",
-            color=AWS,
-            color_continuous_scale="YlOrRd",
-            mapbox_style="carto-darkmatter",
-            center={"lat": 0.23, "lon": 37.9},
-            zoom=6,
-            opacity=0.9,
-            height=330
-        )
-
-        # Territory outline (white border)
-        terr_poly = next(
-            f for f in TERR_GEO["features"]
-            if f["properties"]["TERR_KEY"] == territory
-        )
-        mfig.add_trace(
-            go.Choroplethmapbox(
-                geojson=terr_poly,
-                locations=[territory],
-                featureidkey="properties.TERR_KEY",
-                z=[0],
-                colorscale=[[0, "rgba(0,0,0,0)"], [1, "rgba(0,0,0,0)"]],
-                showscale=False,
-                marker_line_color="#e2e8f0",
-                marker_line_width=1.3,
-                hoverinfo="skip"
-            )
-        )
-
-        # 🔵 Full-screen blue overlay
-        mfig.update_layout(
-            mapbox=dict(
-                style="carto-darkmatter",
-                layers=[
-                    dict(
-                        sourcetype="geojson",
-                        type="fill",
-                        below="traces",
-                        source={
-                            "type": "FeatureCollection",
-                            "features": [{
-                                "type": "Feature",
-                                "geometry": {
-                                    "type": "Polygon",
-                                    "coordinates": [[
-                                        [10, -35], [70, -35],
-                                        [70, 25], [10, 25],
-                                        [10, -35]
-                                    ]]
-                                }
-                            }]
-                        },
-                        color="rgba(0,120,255,0.15)"
-                    )
-                ]
-            ),
-            paper_bgcolor=NAVY_BG,
-            plot_bgcolor=NAVY_BG,
-            font_color=FG_TEXT,
-            margin=dict(l=0, r=0, t=10, b=10)
-        )
-
-        st.plotly_chart(mfig, use_container_width=True)
+        st.plotly_chart(figure("deep_dive", "rtm_map", rtm_hot_zone_map, territory, brand),
+                        use_container_width=True)
 
     # ── RIGHT COLUMN : Histogram ───────────────────────────────────────────
     with right:
         st.markdown("### White Space Score Distribution")
-        hist = px.histogram(
-            rtm_sel, x=AWS, nbins=5, labels={AWS: "AWS Score"},
-            color_discrete_sequence=["#38bdf8"])
-        hist.update_layout(
-            height=330, bargap=0.5,
-            paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG,
-            xaxis=AXIS, yaxis=AXIS,
-            margin=dict(l=0, r=0, t=10, b=10)
-        )
-        st.plotly_chart(hist, use_container_width=True)
+        st.plotly_chart(figure("deep_dive", "aws_hist", aws_histogram, territory, brand),
+                        use_container_width=True)
 
     # ── COMPETITOR PANEL (unchanged) ───────────────────────────────────────
     # ── COMPETITOR PANEL (numeric bar + narrative text) ───────────────────
     # ──────────────────────────────────────────────────────────────────────────
 #  BEAUTIFIED  Key Competitor Analysis  · full replacement panel
 # ──────────────────────────────────────────────────────────────────────────
-    import re, html
 
     # 1️⃣  GLOBAL CSS (inject once – put at top of your app only once)
     st.markdown("""
@@ -604,91 +584,8 @@ def page_territory_deep_dive():
     </style>
     """, unsafe_allow_html=True)
 
-    # 2️⃣  helper: bullet detector + HTML builder
-    _bullet_pat = re.compile(r"^\s*(?:-|\•|\d+\)|\d+\.)\s+(.*)$")
-
-    def _build_reason_html(territory:str, raw:str)->str:
-        """Turn raw multi-line reason text into a styled HTML card."""
-        raw = (raw or "").strip()
-        paras, bullets = [], []
-
-        for ln in raw.splitlines():
-            ln = ln.strip()
-            if not ln:
-                continue
-            m = _bullet_pat.match(ln)
-            if m:
-                bullets.append(html.escape(m.group(1)))
-            else:
-                paras.append(html.escape(ln))
-
-        h  = [f"<div class='reason-card'><h5>{html.escape(territory)}</h5>"]
-        if paras:
-            h.append("<p>" + " ".join(paras) + "</p>")
-        if bullets:
-            h.append("<ul>" + "".join(f"<li>{b}</li>" for b in bullets) + "</ul>")
-        h.append("</div>")
-        return "".join(h)
-
-    # 3️⃣  FULL PANEL  (replace your old container)
-    with st.container():
-        st.markdown("### Key Competitor Analysis")
-
-        # ── choose brand & competitor numerics (unchanged logic) ──────────
-        if brand == "All":
-            st.info("Select a specific **brand** above to view competitor analysis.")
-            sel_comp = None
-        else:
-            comp_rows = COMP_DF[(COMP_DF["Territory"] == territory) &
-                                (COMP_DF["BRAND"]     == brand)]
-            if comp_rows.empty:
-                st.warning("No numeric competitor data for this territory & brand.")
-                sel_comp = None
-            else:
-                sel_comp = st.selectbox("Select Competitor",
-                                        sorted(comp_rows["Competitor"].unique()))
-                row = comp_rows[comp_rows["Competitor"] == sel_comp].iloc[0]
-                client_val = row["Pwani Market Share (%)"]
-                comp_val   = row["Competitor Market Share (%)"]
-                total_val  = client_val + comp_val
-
-                fig_strip = go.Figure()
-                fig_strip.add_bar(y=["Market"], x=[client_val],
-                                orientation='h', marker_color="#38bdf8",
-                                text=[f"Client {client_val:.1f}%"],
-                                textposition="inside")
-                fig_strip.add_bar(y=["Market"], x=[comp_val],
-                                orientation='h', marker_color="#64748b",
-                                text=[f"{sel_comp} {comp_val:.1f}%"],
-                                textposition="inside")
-                fig_strip.update_layout(
-                    barmode="stack", height=140,
-                    title=f"Total Market Value: {total_val:.1f}%",
-                    margin=dict(l=20,r=20,t=40,b=10),
-                    paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG,
-                    xaxis=dict(visible=False), yaxis=dict(visible=False),
-                    font=dict(color="#e3e8ef"), showlegend=False)
-                st.plotly_chart(fig_strip, use_container_width=True)
-
-        # ── narrative cards pulled from COMP_TXT_DF ────────────────────────
-        if sel_comp:
-            txt_rows = COMP_TXT_DF[(COMP_TXT_DF["Brand"]      == brand) &
-                                (COMP_TXT_DF["Competitor"] == sel_comp)&
-                                (COMP_TXT_DF["Territory"]  == territory) ]
-            if txt_rows.empty:
-                st.info("No narrative analysis found for this competitor.")
-            else:
-                st.markdown("#### Reasons Outperformance")
-                # loop through each territory row & render prettily
-                for _, r in txt_rows.iterrows():
-                    terr   = r["Territory"]
-                    reason = (r.get("Reasons_Outperformance") or
-                            r.get("Reason") or "")
-                    st.markdown(_build_reason_html(terr, reason),
-                                unsafe_allow_html=True)
-
-
-               
+    # 3️⃣  FULL PANEL  (a fragment: picking a competitor reruns only the panel)
+    competitor_panel(territory, brand)
 
     st.caption("Data sources: GT KPI Excel ▪ RTM AWS CSV ▪ Kenya GeoJSONs ▪ Competitor Excel")
 
@@ -699,19 +596,7 @@ def page_territory_deep_dive():
 # Page 3 – SKU Cluster Dashboard
 # Brand-aware SKU filter (affects price bucket panel only)
 
-import streamlit as st
-import pandas as pd
-import geopandas as gpd
-import plotly.express as px
-import plotly.graph_objs as go
-import json
-from pathlib import Path
-from sklearn.cluster import KMeans
-
-# ───────── paths
-GT_FILE  = Path("GT_DATA_122_merged_filled.xlsx")
-RTM_FILE = Path("RTM_MONTH DATA.csv")
-GEO_FILE = Path("kenya_territories (1).geojson")
+# (streamlit / pandas / go / json / Path imported above; px lazy)
 
 # ───────── theme + colour helpers
 PANEL_BG = "#0e1b2c"
@@ -724,59 +609,15 @@ def colour_for(cluster: str) -> str:
     first = str(cluster).split()[0].upper()
     return BASE_COLOURS.get(first, "#95A5A6")
 
-def ensure_str_col(df: pd.DataFrame, name: str, *src):
-    """Guarantee df[name] exists as string Series; pull from first src col."""
-    for c in src:
-        if c in df.columns:
-            df[name] = df[c].astype(str)
-            break
-    if name not in df.columns:
-        df[name] = pd.Series([""] * len(df), dtype=str)
-    df[name] = df[name].str.upper().str.strip()
-
-# ───────── load GT
-@st.cache_data(show_spinner="Loading GT …")
-def load_gt():
-    df = pd.read_excel(GT_FILE)
-    df = df.rename(columns={
-        "Markets": "MARKET", "SKU_CLUSTER": "CLUSTER",
-        "Market_Share": "SHARE_PCT", "Total_brand": "SALES_VAL",
-        "avg_price": "AVG_PRICE",
-    })
-    ensure_str_col(df, "MARKET")
-    ensure_str_col(df, "CLUSTER")
-    ensure_str_col(df, "BRAND", "brand", "Brand")
-    ensure_str_col(df, "SKU",   "SKU")
-    df["SHARE_PCT"] = pd.to_numeric(df["SHARE_PCT"], errors="coerce").fillna(0)
-    df["BUBBLE_SIZE"] = (df["SHARE_PCT"]*100).clip(lower=1)*20
-    df["SHARE_LABEL"] = (df["SHARE_PCT"]*100).round(1).astype(str) + "%"
-    return df
-
-# ───────── load RTM
-@st.cache_data(show_spinner="Loading RTM …")
-def load_rtm():
-    rtm = pd.read_csv(RTM_FILE)
-    ensure_str_col(rtm, "MARKET", "REGION_NAME", "Markets")
-    ensure_str_col(rtm, "BRAND",  "Brand")
-    ensure_str_col(rtm, "SKU",    "SKU")
-    if "Volume" in rtm.columns and "VOLUME" not in rtm.columns:
-        rtm = rtm.rename(columns={"Volume": "VOLUME"})
-    return rtm
-
-# ───────── load map
-@st.cache_data(show_spinner="Loading map …")
+# ───────── load map  (centroids prebuilt in geo_centroids.csv)
 def load_map():
-    poly = gpd.read_file(GEO_FILE).rename(
-        columns={"TERRITORY": "MARKET", "REGION_NAME": "MARKET"})
-    poly["MARKET"] = poly["MARKET"].str.upper()
-    poly = poly.to_crs(3857); poly["geometry"] = poly.geometry.centroid
-    poly = poly.to_crs(4326)
-    poly["lon"] = poly.geometry.x; poly["lat"] = poly.geometry.y
-    cent = poly[["MARKET","lon","lat"]].copy()
-    return cent, poly
+    terr = load_centroids("territory")
+    cent = pd.DataFrame({"MARKET": terr["TERR_KEY"].str.upper(),
+                         "lon": terr["lon"], "lat": terr["lat"]})
+    return cent, terr["TERR_KEY"]
 
 # ───────── bubble map
-def draw_cluster_map(df, cent, poly):
+def draw_cluster_map(df, cent, terr_keys):
     grid = (
         df[["MARKET","CLUSTER","SHARE_PCT","BUBBLE_SIZE","SHARE_LABEL"]]
         .drop_duplicates()
@@ -784,8 +625,9 @@ def draw_cluster_map(df, cent, poly):
     )
     colour_map = {c: colour_for(c) for c in grid["CLUSTER"].unique()}
     outline = go.Choroplethmapbox(
-        geojson=json.loads(poly.to_json()), locations=poly["MARKET"],
-        z=[0]*len(poly), showscale=False,
+        geojson=territory_geo_source(zoom=5.4), featureidkey="properties.TERR_KEY",
+        locations=terr_keys, z=[0]*len(terr_keys), showscale=False,
+        colorscale=[[0, "rgba(0,0,0,0)"], [1, "rgba(0,0,0,0)"]],
         marker=dict(line=dict(color="rgba(200,200,200,0.4)", width=0.5)))
     px_fig = px.scatter_mapbox(
         grid, lat="lat", lon="lon",
@@ -798,45 +640,101 @@ def draw_cluster_map(df, cent, poly):
         mapbox_zoom=5.4, mapbox_center=dict(lat=0.25, lon=37.6),
         height=260, margin=dict(l=0,r=0,t=0,b=0),
         paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG)
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+# ───────── panels  (built from the filter values, see kenya_dashboard.figcache)
+def sku_gt(market, brand, cluster):
+    return select(load_sku_gt(), MARKET=market, BRAND=brand, CLUSTER=cluster)
+
+def cluster_share(market, brand, cluster):
+    share = sku_gt(market, brand, cluster).groupby("CLUSTER", observed=True)["SHARE_PCT"].sum().reset_index()
+    share["Percent"] = (share["SHARE_PCT"] / share["SHARE_PCT"].sum()*100).round(1)
+    fig = px.bar(share, x="Percent", y="CLUSTER", orientation="h",
+                 text="Percent",
+                 color="CLUSTER",
+                 color_discrete_map={c:colour_for(c) for c in share["CLUSTER"]})
+    fig.update_traces(texttemplate="%{text:.1f}%")
+    fig.update_layout(height=260,paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
+                      showlegend=False,margin=dict(l=0,r=0,t=5,b=5))
+    return fig
+
+def price_bucket_bars(market, brand, sku):
+    bars = price_buckets(market, brand, sku)   # memoised, pre-warmed
+    if bars is None:
+        return None
+    fig = px.bar(bars,y="Label",x="Volume",orientation="h",
+                 color_discrete_sequence=["#F04E4E"])
+    fig.update_layout(height=260,paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
+                      showlegend=False,margin=dict(l=30,r=10,t=30,b=20))
+    return fig
+
+def ped_scatter(market, brand, cluster):
+    ped_df = sku_gt(market, brand, cluster).dropna(subset=["PED","SALES_VAL"])
+    if ped_df.empty:
+        return None
+    fig = px.scatter(
+        ped_df, x="PED", y="SALES_VAL",
+        size="SHARE_PCT", size_max=40,
+        color="CLUSTER",
+        color_discrete_map={c:colour_for(c) for c in ped_df["CLUSTER"].unique()})
+    fig.update_layout(height=300,paper_bgcolor=PANEL_BG,
+                      plot_bgcolor=PANEL_BG,margin=dict(l=0,r=0,t=5,b=5))
+    return fig
+
+def cluster_map(market, brand, cluster):
+    cent, terr_keys = load_map()
+    return draw_cluster_map(sku_gt(market, brand, cluster), cent, terr_keys)
+
+# ───────── price panel  (a fragment: the SKU box reruns this panel only)
+def price_skus(market, brand):
+    """SKU options of the price panel; a selection no longer offered resets to ALL."""
+    # SKU list from RTM after market & brand filter
+    rtm_pool = select(load_rtm_monthly(), REGION_NAME=market, BRAND=brand)
+    options = ["ALL"]+levels(rtm_pool, "SKU")
+    if st.session_state.get("price_sku") not in options:
+        st.session_state["price_sku"] = "ALL"
+    return options
+
+@fragment
+def price_panel(market, brand):
+    st.subheader("Price Buckets (RTM)")
+    rtm = load_rtm_monthly()
+    sku = st.selectbox("SKU (price panel only)", price_skus(market, brand), key="price_sku")
+    if {"AVERAGE_BASE_PRICE","VOLUME"}.issubset(rtm.columns):
+        fig = figure("sku", "price_buckets", price_bucket_bars, market, brand, sku)
+        if fig is not None:
+            st.plotly_chart(fig,use_container_width=True)
+        else:
+            st.info("Not enough RTM price variation.")
+    else:
+        st.info("RTM price / volume columns missing.")
 
 # ───────── main page
 def page_sku_dashboard():
     st.title("SKU-Cluster Dashboard")
 
-    gt  = load_gt()
-    rtm = load_rtm()
-    cent, poly = load_map()
+    gt  = load_sku_gt()
+    warm_price_buckets()
 
     # FILTERS
     f = st.columns(5)
-    market_sel  = f[0].selectbox("Market", ["ALL"]+sorted(gt["MARKET"].unique()))
-    brand_sel   = f[1].selectbox("Brand",  ["ALL"]+sorted(gt["BRAND"].unique()))
+    market_sel  = f[0].selectbox("Market", ["ALL"]+levels(gt, "MARKET"))
+    brand_sel   = f[1].selectbox("Brand",  ["ALL"]+levels(gt, "BRAND"))
     cluster_sel = f[2].selectbox(
         "Cluster",
-        ["ALL"] + sorted(gt["CLUSTER"].dropna().astype(str).unique()))
-    # SKU list from RTM after market & brand filter
-    rtm_pool = rtm.copy()
-    if market_sel != "ALL": rtm_pool = rtm_pool[rtm_pool["MARKET"] == market_sel]
-    if brand_sel  != "ALL": rtm_pool = rtm_pool[rtm_pool["BRAND"]  == brand_sel]
-    sku_sel = f[3].selectbox("SKU (price panel only)",
-                             ["ALL"]+sorted(rtm_pool["SKU"].dropna().unique()))
-
-    period_sel = f[4].selectbox("Period", ["LAST 12 MONTHS"])
+        ["ALL"] + levels(gt, "CLUSTER"))
+    # (the SKU filter lives in the price panel, the only panel it affects)
+    # the panels cover the data's last 12 months; shown for context only
+    f[3].selectbox("Period", ["LAST 12 MONTHS"], disabled=True)
 
     # GT filters (SKU not applied)
-    gt_filt = gt.copy()
-    if market_sel  != "ALL": gt_filt = gt_filt[gt_filt["MARKET"]  == market_sel]
-    if brand_sel   != "ALL": gt_filt = gt_filt[gt_filt["BRAND"]   == brand_sel]
-    if cluster_sel != "ALL": gt_filt = gt_filt[gt_filt["CLUSTER"] == cluster_sel]
-    if gt_filt.empty:
+    gt_key = (market_sel, brand_sel, cluster_sel)
+    if sku_gt(*gt_key).empty:
         st.warning("No GT rows for filters."); return
 
-    # RTM filters (includes SKU)
-    rtm_filt = rtm.copy()
-    if market_sel != "ALL": rtm_filt = rtm_filt[rtm_filt["MARKET"] == market_sel]
-    if brand_sel  != "ALL": rtm_filt = rtm_filt[rtm_filt["BRAND"]  == brand_sel]
-    if sku_sel    != "ALL": rtm_filt = rtm_filt[rtm_filt["SKU"]    == sku_sel]
+    # the price k-means runs in a worker process while the other panels draw
+    price_skus(market_sel, brand_sel)
+    price_buckets_async(market_sel, brand_sel, st.session_state["price_sku"])
 
     # Layout panels
     c1,c2 = st.columns(2); c3,c4 = st.columns(2)
@@ -844,53 +742,15 @@ def page_sku_dashboard():
     # 1 Cluster share
     with c1:
         st.subheader("Cluster Share")
-        share = gt_filt.groupby("CLUSTER")["SHARE_PCT"].sum().reset_index()
-        share["Percent"] = (share["SHARE_PCT"] / share["SHARE_PCT"].sum()*100).round(1)
-        fig = px.bar(share, x="Percent", y="CLUSTER", orientation="h",
-                     text="Percent",
-                     color="CLUSTER",
-                     color_discrete_map={c:colour_for(c) for c in share["CLUSTER"]})
-        fig.update_traces(texttemplate="%{text:.1f}%")
-        fig.update_layout(height=260,paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
-                          showlegend=False,margin=dict(l=0,r=0,t=5,b=5))
-        st.plotly_chart(fig,use_container_width=True)
-
-    # 2 Price buckets (SKU aware)
-    with c2:
-        st.subheader("Price Buckets (RTM)")
-        if {"AVERAGE_BASE_PRICE","VOLUME"}.issubset(rtm_filt.columns):
-            tmp = rtm_filt.dropna(subset=["AVERAGE_BASE_PRICE","VOLUME"])
-            if tmp["AVERAGE_BASE_PRICE"].nunique() >= 4:
-                km = KMeans(n_clusters=4,n_init="auto").fit(
-                    tmp[["AVERAGE_BASE_PRICE"]], sample_weight=tmp["VOLUME"])
-                tmp["Bucket"] = km.labels_
-                centers = km.cluster_centers_.flatten()
-                vol = tmp.groupby("Bucket")["VOLUME"].sum()
-                bars = pd.DataFrame({"Center":centers,"Volume":vol}).sort_values("Volume")
-                bars["Label"]="₹"+bars["Center"].round().astype(int).astype(str)
-                fig = px.bar(bars,y="Label",x="Volume",orientation="h",
-                             color_discrete_sequence=["#F04E4E"])
-                fig.update_layout(height=260,paper_bgcolor=PANEL_BG,plot_bgcolor=PANEL_BG,
-                                  showlegend=False,margin=dict(l=30,r=10,t=30,b=20))
-                st.plotly_chart(fig,use_container_width=True)
-            else:
-                st.info("Not enough RTM price variation.")
-        else:
-            st.info("RTM price / volume columns missing.")
+        st.plotly_chart(figure("sku", "cluster_share", cluster_share, *gt_key),
+                        use_container_width=True)
 
     # 3 PED vs sales (SKU ignored)
     with c3:
         st.subheader("PED vs Sales")
-        if {"PED","SALES_VAL"}.issubset(gt_filt.columns):
-            ped_df = gt_filt.dropna(subset=["PED","SALES_VAL"])
-            if not ped_df.empty:
-                fig = px.scatter(
-                    ped_df, x="PED", y="SALES_VAL",
-                    size="SHARE_PCT", size_max=40,
-                    color="CLUSTER",
-                    color_discrete_map={c:colour_for(c) for c in ped_df["CLUSTER"].unique()})
-                fig.update_layout(height=300,paper_bgcolor=PANEL_BG,
-                                  plot_bgcolor=PANEL_BG,margin=dict(l=0,r=0,t=5,b=5))
+        if {"PED","SALES_VAL"}.issubset(gt.columns):
+            fig = figure("sku", "ped", ped_scatter, *gt_key)
+            if fig is not None:
                 st.plotly_chart(fig,use_container_width=True)
             else:
                 st.info("No PED & Sales rows.")
@@ -900,7 +760,13 @@ def page_sku_dashboard():
     # 4 Map (SKU ignored)
     with c4:
         st.subheader("Territory Bubble Map")
-        draw_cluster_map(gt_filt, cent, poly)
+        st.plotly_chart(figure("sku", "cluster_map", cluster_map, *gt_key),
+                        use_container_width=True)
+
+    # 2 Price buckets (SKU aware, reruns on its own), drawn last so its
+    #   clustering overlaps the panels above
+    with c2:
+        price_panel(market_sel, brand_sel)
 
 
 
@@ -917,60 +783,48 @@ def page_sku_dashboard():
 # ╭───────────────────────────────  PAGE 4  ─────────────────────────╮
 # Territory–Brand Opportunity Dashboard (full-width report page)
 # -------------------------------------------------------------------
+# ───────── report download  (a fragment: Refresh re-checks this panel only)
+@fragment
+def report_download(brand, loc):
+    # served only when up to date; a missing / outdated one renders in the background
+    path = request_report(brand, loc)
+    if path is None:
+        st.info("Building this report … it takes a few seconds.")
+        st.button("Refresh", key="report_refresh")
+    else:
+        st.download_button("Download PDF Report", data=download_data(path),
+                           file_name=path.name, mime="application/pdf")
+    st.caption("Reports are pre-generated after a data update with "
+               "`python -m kenya_dashboard.report_builder`; an outdated one "
+               "is rebuilt in the background on request.")
+
 # ─── PAGE 4 · Territory–Brand Opportunity Dashboard ─────────────────────
 def page_opportunity_dashboard():
-    import re, pandas as pd, streamlit as st, pathlib
-
-    # ── data loads (identical) ───────────────────────────────────────────
-    gt_data         = pd.read_excel('data_files/GT_DATA_122_merged_filled.xlsx')
-    percentage_data = pd.read_excel('data_files/Province Percentage 250410 (1) (1).xlsx')
-    top_location_data = pd.read_csv('data_files/Top_3_Brand_Locations.csv')
-
-    # --- helper functions (unchanged) ------------------------------------
-    def executive_summary_retirver(text):
-        m = re.search(r'## 1. Executive Summary\s*(.*?)(?=\n##|\Z)', text, re.DOTALL)
-        return m.group(1).strip() if m else ""
-
-    def extract_territory_block(text, territory_name):
-        m = re.search(rf"### {territory_name}\n(.*?)(?=\n### [A-Z ]+|\Z)", text, re.DOTALL)
-        return m.group(0).strip() if m else None
-
-    def extract_data(txt):
-        ws  = re.search(r"\*\*White Space Score\*\*:\s*([\d.]+)", txt)
-        cs  = re.search(r"\*\*Client Share\*\*:\s*([\d.]+)%", txt)
-        ins = re.findall(r'### Insights\s*(.*?)(?=\n###|\n##|\Z)', txt, re.DOTALL)
-        return {
-            "white_space_scores": ws.group(1)+' %' if ws else None,
-            "client_shares": cs.group(1)+' %' if cs else None,
-            "insights": [' '.join(i.strip().split()) for i in ins],
-        }
+    # ── data loads (cached + shared, see kenya_dashboard.data) ───────────
+    percentage_data = load_population_pct()
+    top_locations   = load_top_locations()
+    brand_ws        = brand_white_space()
 
+    # --- helper functions ------------------------------------------------
     def get_top_location(territory, brand):
-        rows = top_location_data[(top_location_data['Territory']==territory) &
-                                 (top_location_data['Brand']==brand)]
-        return ','.join(rows['Top 3 Performing Location'].values)
+        return top_locations.get((territory, brand), "")
 
     def text_extractor(territories, brand):
-        data_dict = {"Territory":[], "White Space Scores":[], "Client Shares":[],
-                     "Summary":[], "High Potential Regions":[]}
-        try:
-            md_path = pathlib.Path(f"md_files/{brand}.md")
-            content = md_path.read_text(encoding='utf-8')
-            exec_sum = executive_summary_retirver(content)
-            for terr in territories:
-                block = extract_territory_block(content, terr)
-                if not block: continue
-                d       = extract_data(block)
-                top_loc = get_top_location(terr, brand)
-                data_dict["Territory"].append(terr)
-                data_dict["White Space Scores"].append(d["white_space_scores"])
-                data_dict["Client Shares"].append(d["client_shares"])
-                data_dict["Summary"].append(' '.join(d["insights"]))
-                data_dict["High Potential Regions"].append(top_loc)
-            return data_dict, exec_sum
-        except FileNotFoundError:
+        report = load_report(brand)            # parsed once, see kenya_dashboard.data.reports
+        if report is None:
             st.error(f"Markdown for {brand} not found.")
             return {}, ""
+        data_dict = {"Territory":[], "White Space Scores":[], "Client Shares":[],
+                     "Summary":[], "High Potential Regions":[]}
+        for terr in territories:
+            d = report["territories"].get(terr)
+            if not d: continue
+            data_dict["Territory"].append(terr)
+            data_dict["White Space Scores"].append(d["white_space"])
+            data_dict["Client Shares"].append(d["client_share"])
+            data_dict["Summary"].append(d["insights"])
+            data_dict["High Potential Regions"].append(get_top_location(terr, brand))
+        return data_dict, report["summary"]
 
     def Population_percentage_per_brand(brand,territory):
         try:    
@@ -1001,14 +855,14 @@ def page_opportunity_dashboard():
             return None
 
     def average_ws(brand):
-        return round(gt_data[gt_data['brand']==brand]['White Space Score'].mean(),2)
+        return brand_ws.get(brand)
 
     # ── UI layout identical to original ──────────────────────────────────
     st.title("Export and Report Section")
 
     col1, col2, col3 = st.columns([1.5,1.5,3])
     with col1:
-        brands = sorted(gt_data['brand'].unique())
+        brands = list(brand_ws.index)
         default_index = brands.index("USHINDI BAR") if "USHINDI BAR" in brands else 0
         brand = st.selectbox("Brand", brands, index=default_index)
         
@@ -1060,13 +914,7 @@ def page_opportunity_dashboard():
     report_map[f"{brand} – For all territories"] = "Complete"
     choice = st.selectbox("Report list", ["Select"]+list(report_map.keys()))
     if choice != "Select":
-        loc = report_map[choice]
-        path = pathlib.Path(f"Reports/{brand} {loc}.pdf")
-        if path.exists():
-            st.download_button("Download PDF Report", data=path.read_bytes(),
-                               file_name=path.name, mime="application/pdf")
-        else:
-            st.error(f"⚠️ Report file not found: {path}")
+        report_download(brand, report_map[choice])
 
 
 
@@ -1076,67 +924,30 @@ def page_opportunity_dashboard():
 MAP_TABLE_HEIGHT = 760
 MAP_TABLE_RATIO  = [5, 3]
 
-@st.cache_data
-def load_counties():
-    df  = pd.read_csv("Merged_Data_with_Opportunity_Score.csv")
-    geo = json.load(open("kenya.geojson", "r", encoding="utf-8"))
-    for f in geo["features"]:
-        nm = f["properties"].get("COUNTY_NAM") or ""
-        f["properties"]["COUNTY_KEY"] = nm.title().strip()
-    return df, geo
-
-@st.cache_data
-def load_points():
-    raw  = pd.read_excel("rtm_lat_log.xlsx")
-    cols = list(raw.columns)
-    lat  = next((c for c in cols if re.search(r"^lat", c, re.I)), None)
-    lon  = next((c for c in cols if re.search(r"(lon|lng)", c, re.I)), None)
-    dist = next((c for c in cols if re.search(r"distrib|dealer|partner|outlet", c, re.I)), None)
-    if None in (lat, lon, dist):
-        st.stop()
-    pts            = raw[[dist, lat, lon]].copy()
-    pts.columns    = ["Distributor", "Latitude", "Longitude"]
-    pts["Latitude"]= pd.to_numeric(pts["Latitude"],  errors="coerce")
-    pts["Longitude"]=pd.to_numeric(pts["Longitude"], errors="coerce")
-    return pts.dropna(subset=["Latitude","Longitude"])
+def opportunity_map(choose):
+    df      = load_opportunity()
+    view_df = df if choose == "All" else df[df["BRAND"] == choose]
+
+    county_avg = (view_df.groupby("COUNTY_KEY", as_index=False, observed=True)["Opportunity Score"]
+                           .mean()
+                           .rename(columns={"COUNTY_KEY": "County"}))
+    return opportunity_base().render(
+        ("score",   {"locations": county_avg["County"].tolist(),
+                     "z": county_avg["Opportunity Score"].tolist()}),
+        ("density", {}))
 
 def page_kenya_dashboard():
     st.markdown("## Kenya County Opportunity Dashboard")
 
-    df,  geojson = load_counties()
-    pts_df       = load_points()
+    df = load_opportunity()
 
     f1, f2 = st.columns([1, 5])
     with f1:
-        brands = ["All"] + sorted(df["BRAND"].dropna().unique())
+        brands = ["All"] + levels(df, "BRAND")
         choose = st.selectbox("Select Brand", brands)
 
     view_df = df if choose == "All" else df[df["BRAND"] == choose]
-
-    county_avg = (view_df.groupby("County", as_index=False)["Opportunity Score"]
-                           .mean()
-                           .assign(County=lambda d: d["County"].str.title().str.strip()))
-
-    fig = px.choropleth_mapbox(
-        county_avg, geojson=geojson,
-        locations="County", featureidkey="properties.COUNTY_KEY",
-        color="Opportunity Score",
-        color_continuous_scale="YlOrRd",
-        mapbox_style="carto-darkmatter",
-        center={"lat":0.23,"lon":37.9}, zoom=5.5,
-        opacity=0.9, height=MAP_TABLE_HEIGHT)
-
-    fig.add_trace(go.Densitymapbox(
-        lat=pts_df["Latitude"], lon=pts_df["Longitude"],
-        z=[1]*len(pts_df), radius=14, opacity=0.7,
-        colorscale=[[0,"rgba(0,120,255,0.25)"],
-                    [0.3,"rgba(0,120,255,0.55)"],
-                    [1,"rgba(0,120,255,0.9)"]],
-        showscale=False, name="Distributor Density"))
-
-    fig.update_layout(
-        paper_bgcolor=NAVY_BG, font_color=FG_TEXT,
-        margin=dict(l=0,r=0,t=15,b=0))
+    fig     = figure("kenya", "opportunity_map", opportunity_map, choose)
 
     map_col, table_col = st.columns(MAP_TABLE_RATIO)
 
@@ -1223,57 +1034,51 @@ All pages share the same dark theme and respond instantly to filters.
 # ———————————————————
 # Additional constants
 # ———————————————————
-MT_FILE      = "MT_WHITE_SPACE_SCORE_CLEANED.xlsx"   # cleaned file you produced
-COUNTY_GJ    = "kenya.geojson"                       # same file already uploaded
 WS_COL       = "White Space Score"
 CS_COL       = "Client Market Share"
 COMP_COL     = "Competitor Strength"
 SALES_COL    = "ERP GT Sales Coverage"
 
 # ———————————————————
-# Data loaders (cached)
-# ———————————————————
-@st.cache_data(show_spinner="Loading MT White-Space data …")
-def load_mt():
-    if not Path(MT_FILE).exists():
-        st.error(f"❌ {MT_FILE} not found"); st.stop()
-    df = pd.read_excel(MT_FILE)
-
-    # rename / strip
-    df.columns = df.columns.str.strip()
-    df["County"] = df["County"].astype(str).str.title().str.strip()
-    if "Brand" not in df.columns and "BRAND" in df.columns:
-        df.rename(columns={"BRAND": "Brand"}, inplace=True)
-    df["Brand"] = df["Brand"].astype(str).str.title().str.strip()
-
-    # key used by choropleth
-    df["COUNTY_KEY"] = df["County"]
-    # numeric guards
-    for c in [WS_COL, CS_COL, COMP_COL, SALES_COL]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-        else:
-            st.error(f"Column “{c}” missing in {MT_FILE}"); st.stop()
-
-    return df
-
-@st.cache_data(show_spinner="Loading Kenya county GeoJSON …")
-def load_county_geo():
-    if not Path(COUNTY_GJ).exists():
-        st.error(f"❌ {COUNTY_GJ} not found"); st.stop()
-    geo = json.loads(Path(COUNTY_GJ).read_text("utf-8"))
-    # normalise the name field to COUNTY_KEY
-    for feat in geo["features"]:
-        nm = feat["properties"].get("COUNTY_NAM") or feat["properties"].get("NAME", "")
-        feat["properties"]["COUNTY_KEY"] = str(nm).title().strip()
-    return geo
-
-MT_DF   = load_mt()
-COUNTY_GEO = load_county_geo()
-
-# ———————————————————
-# Helper: percent formatter
-percent_fmt = lambda s: (s*100 if s.max() <= 1 else s).round(2)
+def mt_county_map(brand_sel, cnty_sel):
+    cube = load_kpi_cube("MT")
+    agg_ws    = (by_region(cube, brand_sel)[["County", WS_COL]]
+                 .rename(columns={"County": "COUNTY_KEY"}))
+    keys_full = feature_keys("county", zoom=5.5)
+    mdf = pd.DataFrame({"COUNTY_KEY": keys_full}).merge(agg_ws, how="left").fillna({WS_COL:0})
+    mdf["plot_ws"] = mdf[WS_COL]
+    if cnty_sel != "All":
+        mdf.loc[mdf["COUNTY_KEY"] != cnty_sel, "plot_ws"] = 0
+
+    # same base as the main dashboard's MT map, without the zero layer
+    return county_ws_base().render(("ws", {"locations": keys_full, "z": mdf["plot_ws"].tolist()}))
+
+def mt_county_composition(brand_sel, cnty_sel):
+    share = by_region(load_kpi_cube("MT"), brand_sel)
+    op = [1 if (cnty_sel=="All" or c==cnty_sel) else .3 for c in share["County"]]
+
+    fig_stack = go.Figure()
+    fig_stack.add_bar(name="Client Share", x=share["County"], y=share[CS_COL],
+                      marker_opacity=op, marker_color="#00B4D8")
+    fig_stack.add_bar(name="Competitor Strength", x=share["County"], y=share[COMP_COL],
+                      marker_opacity=op, marker_color="#0077B6")
+    fig_stack.update_layout(
+        barmode="stack", bargap=.15, height=260, title="Market Composition",
+        paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG,
+        margin=dict(l=0,r=0,t=30,b=0), xaxis=AXIS, yaxis=AXIS,
+        legend=dict(bgcolor="rgba(0,0,0,0)", orientation="h", yanchor="bottom", y=-.25))
+    return fig_stack
+
+def mt_county_sales(brand_sel, cnty_sel):
+    sales = by_region(load_kpi_cube("MT"), brand_sel)
+    sales_op = [1 if (cnty_sel=="All" or c==cnty_sel) else .3 for c in sales["County"]]
+    fig_sales = go.Figure(go.Bar(x=sales["County"], y=sales[SALES_COL],
+                                 marker_opacity=sales_op, marker_color="#48CAE4"))
+    fig_sales.update_layout(
+        height=260, title="ERP GT Sales Coverage",
+        paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG, bargap=.15,
+        margin=dict(l=0,r=0,t=40,b=0), xaxis=AXIS, yaxis=AXIS, showlegend=False)
+    return fig_sales
 
 # ———————————————————
 def page_mt_dashboard():
@@ -1281,12 +1086,11 @@ def page_mt_dashboard():
 
     # ── FILTERS
     f_brand, f_cnty, _ = st.columns([1, 1, 6])
-    brand_sel = f_brand.selectbox("Brand",  ["All"] + sorted(MT_DF["Brand"].unique()))
-    cnty_sel  = f_cnty.selectbox("County", ["All"] + sorted(MT_DF["County"].unique()))
+    brand_sel = f_brand.selectbox("Brand",  ["All"] + levels(MT_DF, "Brand"))
+    cnty_sel  = f_cnty.selectbox("County", ["All"] + levels(MT_DF, "County"))
 
-    view = MT_DF.copy()
-    if brand_sel != "All": view = view[view["Brand"] == brand_sel]
-    if cnty_sel  != "All": view = view[view["County"] == cnty_sel]
+    cube = load_kpi_cube("MT")
+    kpi  = kpi_cell(cube, brand_sel, cnty_sel)
 
     # ── KPI CARDS
     k1, k2, k3 = st.columns(3)
@@ -1298,9 +1102,9 @@ def page_mt_dashboard():
             f"<p style='font-size:1.3rem;color:#fff'>{value}</p></div>",
             unsafe_allow_html=True)
 
-    card(k1, "White Space Score", f"{view[WS_COL].mean():.0f}")
-    card(k2, "Client Market Share", f"{percent_fmt(view[CS_COL]).mean():.1f}%")
-    card(k3, "Competitor Strength", f"{percent_fmt(view[COMP_COL]).mean():.1f}%")
+    card(k1, "White Space Score", f"{kpi[WS_COL]:.0f}")
+    card(k2, "Client Market Share", f"{kpi[CS_COL]:.1f}%")
+    card(k3, "Competitor Strength", f"{kpi[COMP_COL]:.1f}%")
 
     st.markdown("<div style='height:30px'></div>", unsafe_allow_html=True)
 
@@ -1309,66 +1113,15 @@ def page_mt_dashboard():
 
     # —— Choropleth map ——
     with left:
-        base      = MT_DF if brand_sel == "All" else MT_DF[MT_DF["Brand"] == brand_sel]
-        agg_ws    = base.groupby("COUNTY_KEY", as_index=False)[WS_COL].mean()
-        keys_full = [f["properties"]["COUNTY_KEY"] for f in COUNTY_GEO["features"]]
-        mdf = pd.DataFrame({"COUNTY_KEY": keys_full}).merge(agg_ws, how="left").fillna({WS_COL:0})
-        mdf["plot_ws"] = mdf[WS_COL]
-        if cnty_sel != "All":
-            mdf.loc[mdf["COUNTY_KEY"] != cnty_sel, "plot_ws"] = 0
-
-        fig_map = px.choropleth_mapbox(
-            mdf, geojson=COUNTY_GEO, locations="COUNTY_KEY",
-            featureidkey="properties.COUNTY_KEY",
-            color="plot_ws", color_continuous_scale="YlOrRd",
-            range_color=(0, 60),
-            mapbox_style="carto-darkmatter",
-            center={"lat":0.23, "lon":37.9}, zoom=5.5,
-            opacity=0.9, height=520
-        )
-        # optional blue overlay for brand look
-        fig_map.update_layout(
-            mapbox=dict(layers=[dict(
-                sourcetype="geojson", type="fill", below="traces",
-                source={"type":"FeatureCollection","features":[{
-                    "type":"Feature","geometry":{"type":"Polygon","coordinates":[
-                        [[10,-35],[70,-35],[70,25],[10,25],[10,-35]]]} }]},
-                color="rgba(0,120,255,0.15)")]),
-            paper_bgcolor=NAVY_BG, plot_bgcolor=NAVY_BG,
-            font_color=FG_TEXT, margin=dict(l=0,r=0,t=30,b=0)
-        )
-        st.plotly_chart(fig_map, use_container_width=True)
+        st.plotly_chart(figure("mt", "ws_map", mt_county_map, brand_sel, cnty_sel),
+                        use_container_width=True)
 
     # —— Right-hand bar panels ——
     with right:
-        share = (MT_DF if brand_sel=="All" else MT_DF[MT_DF["Brand"]==brand_sel]) \
-                .groupby("County", as_index=False)[[CS_COL, COMP_COL]].mean()
-        share[CS_COL]   = percent_fmt(share[CS_COL])
-        share[COMP_COL] = percent_fmt(share[COMP_COL])
-        op = [1 if (cnty_sel=="All" or c==cnty_sel) else .3 for c in share["County"]]
-
-        fig_stack = go.Figure()
-        fig_stack.add_bar(name="Client Share", x=share["County"], y=share[CS_COL],
-                          marker_opacity=op, marker_color="#00B4D8")
-        fig_stack.add_bar(name="Competitor Strength", x=share["County"], y=share[COMP_COL],
-                          marker_opacity=op, marker_color="#0077B6")
-        fig_stack.update_layout(
-            barmode="stack", bargap=.15, height=260, title="Market Composition",
-            paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG,
-            margin=dict(l=0,r=0,t=30,b=0), xaxis=AXIS, yaxis=AXIS,
-            legend=dict(bgcolor="rgba(0,0,0,0)", orientation="h", yanchor="bottom", y=-.25))
-        st.plotly_chart(fig_stack, use_container_width=True)
-
-        sales = (MT_DF if brand_sel=="All" else MT_DF[MT_DF["Brand"]==brand_sel]) \
-                .groupby("County", as_index=False)[SALES_COL].sum()
-        sales_op = [1 if (cnty_sel=="All" or c==cnty_sel) else .3 for c in sales["County"]]
-        fig_sales = go.Figure(go.Bar(x=sales["County"], y=sales[SALES_COL],
-                                     marker_opacity=sales_op, marker_color="#48CAE4"))
-        fig_sales.update_layout(
-            height=260, title="ERP GT Sales Coverage",
-            paper_bgcolor=PANEL_BG, plot_bgcolor=PANEL_BG, bargap=.15,
-            margin=dict(l=0,r=0,t=40,b=0), xaxis=AXIS, yaxis=AXIS, showlegend=False)
-        st.plotly_chart(fig_sales, use_container_width=True)
+        st.plotly_chart(figure("mt", "composition", mt_county_composition, brand_sel, cnty_sel),
+                        use_container_width=True)
+        st.plotly_chart(figure("mt", "sales", mt_county_sales, brand_sel, cnty_sel),
+                        use_container_width=True)
 
     # ── Data table
     st.markdown("### Full MT Dataset")
@@ -2,9 +2,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
-from pathlib import Path
 import importlib.util
+from kenya_dashboard.data import (county_geo_source, levels, load_comp, load_gt, load_rtm,
+                                   territory_geo_source)
 
 # ───── Page Setup ─────
 st.set_page_config(page_title="Territory Deep Dive", layout="wide", initial_sidebar_state="collapsed")
@@ -23,45 +23,14 @@ label div[data-baseweb="select"] div{{background:#1e293b !important;color:#e3e8e
 </style>
 """, unsafe_allow_html=True)
 
-# ───── File Paths ─────
-GT_FILE, RTM_FILE = "GT_DATA_122_merged_filled.xlsx", "rtm_std_follow_GT_final (1).csv"
-COUNTY_GJ, TERR_GJ = "kenya.geojson", "kenya_territories (1).geojson"
-COMP_FILE = "PWANI_COMP_STD_final_confirmed.xlsx"
-
 if importlib.util.find_spec("openpyxl") is None:
     st.error("⚠️ Install dependency →  pip install openpyxl")
     st.stop()
 
-# ───── Load Data ─────
-@st.cache_data(show_spinner="Loading data…")
-def load_all():
-    gt = pd.read_excel(GT_FILE).rename(columns=str.strip)
-    gt.rename(columns={"brand": "Brand", "Markets": "Territory"}, inplace=True)
-    gt["Territory"] = gt["Territory"].str.title().str.strip()
-    gt["Brand"] = gt["Brand"].str.title().str.strip()
-
-    rtm = pd.read_csv(RTM_FILE)
-    rtm.columns = rtm.columns.str.strip().str.title()
-    rtm[["Territory", "County", "Brand"]] = rtm[["Territory", "County", "Brand"]].apply(lambda s: s.str.title().str.strip())
-
-    county = json.loads(Path(COUNTY_GJ).read_text("utf-8"))
-    for f in county["features"]:
-        f["properties"]["COUNTY_KEY"] = (f["properties"].get("COUNTY_NAM") or f["properties"].get("NAME", "")).title().strip()
-
-    terr = json.loads(Path(TERR_GJ).read_text("utf-8"))
-    for f in terr["features"]:
-        f["properties"]["TERR_KEY"] = f["properties"]["TERRITORY"].title().strip()
-
-    comp_df = pd.read_excel(COMP_FILE)
-    comp_df.columns = comp_df.columns.str.strip()
-    comp_df.rename(columns={"Market":"Territory"}, inplace=True)
-    comp_df["Territory"] = comp_df["Territory"].str.title().str.strip()
-    comp_df["BRAND"] = comp_df["BRAND"].str.title().str.strip()
-    comp_df["Competitor"] = comp_df["Competitor"].str.title().str.strip()
-
-    return gt, rtm, county, terr, comp_df
-
-GT_DF, RTM_DF, COUNTY_GEO, TERR_GEO, COMP_DF = load_all()
+# ───── Load Data (shared cached loaders) ─────
+GT_DF      = load_gt()
+RTM_DF     = load_rtm()
+COMP_DF    = load_comp()
 
 # ───── Constants ─────
 SALES, CS, COMP, WS, AWS = "ERP GT Sales Coverage", "Client Market Share", "Competitor Strength", "White Space Score", "Aws"
@@ -76,8 +45,8 @@ with st.container():
     st.markdown(f"<div style='background:{PANEL}; padding:1.4rem 1rem; border-radius:8px; margin-bottom:24px;'>", unsafe_allow_html=True)
 
     c1, c2, c3, c4, c5, c6 = st.columns([1,1,1,1,1,1])
-    territory = c1.selectbox("Territory", sorted(GT_DF["Territory"].unique()))
-    brand = c2.selectbox("Brand", ["All"] + sorted(GT_DF["Brand"].unique()))
+    territory = c1.selectbox("Territory", levels(GT_DF, "Territory"))
+    brand = c2.selectbox("Brand", ["All"] + levels(GT_DF, "Brand"))
 
     sub_df = GT_DF[GT_DF["Territory"] == territory]
     if brand != "All":
@@ -106,8 +75,8 @@ with left:
     map_df = pd.DataFrame({"COUNTY_KEY": counties}).merge(
         rtm_sel[["County", AWS]].rename(columns={"County":"COUNTY_KEY"}), how="left"
     ).fillna({AWS:0})
-    county_sub = {"type":"FeatureCollection","features":[f for f in COUNTY_GEO["features"] if f["properties"]["COUNTY_KEY"] in counties]}
-    terr_poly = next(f for f in TERR_GEO["features"] if f["properties"]["TERR_KEY"]==territory)
+    county_sub = county_geo_source(zoom=8, keys=counties)
+    terr_poly = territory_geo_source(zoom=8, keys=[territory])
     mfig = px.choropleth(map_df, geojson=county_sub, locations="COUNTY_KEY", featureidkey="properties.COUNTY_KEY", color=AWS, color_continuous_scale="Blues")
     mfig.add_trace(go.Choropleth(geojson=terr_poly, locations=[territory], featureidkey="properties.TERR_KEY", z=[0], colorscale=[[0,"rgba(0,0,0,0)"],[1,"rgba(0,0,0,0)"]], showscale=False, marker_line_color="#e2e8f0", marker_line_width=1.3))
     mfig.update_geos(fitbounds="locations", visible=False, bgcolor=PANEL, lakecolor=PANEL, landcolor=PANEL)
@@ -132,7 +101,7 @@ with st.container():
         if comp_df_filtered.empty:
             st.warning("No competitor data available for this territory + brand.")
         else:
-            competitor = st.selectbox("Select Competitor", sorted(comp_df_filtered["Competitor"].unique()))
+            competitor = st.selectbox("Select Competitor", levels(comp_df_filtered, "Competitor"))
             row = comp_df_filtered[comp_df_filtered["Competitor"] == competitor].iloc[0]
             client_share = row["Pwani Market Share (%)"]
             comp_share = row["Competitor Market Share (%)"]
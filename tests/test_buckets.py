@@ -0,0 +1,67 @@
+"""1-D price segmentation against brute force and ``pd.cut``."""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kenya_dashboard.buckets import fixed_bins, kmeans_1d
+
+
+def _sse(x, w, labels):
+    return sum(np.sum(w[labels == b] * (x[labels == b] - np.average(x[labels == b],
+                                                                   weights=w[labels == b])) ** 2)
+               for b in np.unique(labels) if w[labels == b].sum() > 0)
+
+
+def _brute_force(x, w, k):
+    """Lowest weighted SSE over every split of the sorted values into ``k`` runs."""
+    ux = np.unique(x)
+    best = np.inf
+    for cuts in itertools.combinations(range(1, len(ux)), k - 1):
+        labels = np.searchsorted(ux[list(cuts)], x, side="right")
+        best = min(best, _sse(x, w, labels))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_kmeans_is_globally_optimal(seed):
+    rng = np.random.default_rng(seed)
+    n = rng.integers(4, 13)
+    x = rng.choice(rng.uniform(50, 500, 9).round(), n)          # repeated prices
+    w = rng.uniform(0, 100, n) if seed % 2 else np.ones(n)
+    k = int(rng.integers(1, min(4, len(np.unique(x))) + 1))
+
+    labels, centers = kmeans_1d(x, w, k)
+
+    assert _sse(x, w, labels) == pytest.approx(_brute_force(x, w, k), rel=1e-9, abs=1e-9)
+    # buckets are contiguous price ranges, numbered cheapest first
+    order = np.argsort(x, kind="stable")
+    assert np.all(np.diff(labels[order]) >= 0)
+    assert sorted(set(labels)) == list(range(k))
+    for b in range(k):
+        assert centers[b] == pytest.approx(np.average(x[labels == b], weights=w[labels == b]))
+
+
+def test_kmeans_caps_k_at_distinct_prices():
+    labels, centers = kmeans_1d([10, 10, 20], k=4)
+    assert labels.tolist() == [0, 0, 1]
+    assert centers.tolist() == [10, 20]
+
+
+@pytest.mark.parametrize("n_bins", [1, 3, 5])
+def test_fixed_bins_match_pd_cut(n_bins):
+    rng = np.random.default_rng(n_bins)
+    x = np.concatenate([rng.uniform(80, 240, 200).round(1), [80.0, 240.0, np.nan]])
+    idx, edges = fixed_bins(x, n_bins)
+    expected = pd.cut(x, np.linspace(np.nanmin(x), np.nanmax(x), n_bins + 1),
+                      include_lowest=True, labels=False)
+    assert np.array_equal(idx, np.nan_to_num(expected, nan=-1).astype(int))
+    assert len(edges) == n_bins + 1
+
+
+def test_fixed_bins_degenerate_input():
+    idx, edges = fixed_bins([7.0, 7.0, np.nan])
+    assert idx.tolist() == [0, 0, -1] and edges.tolist() == [7.0]
+    idx, edges = fixed_bins([np.nan, np.nan])
+    assert idx.tolist() == [-1, -1] and len(edges) == 0
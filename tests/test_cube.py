@@ -0,0 +1,74 @@
+"""KPI cube lookups against filtering and grouping the rows directly."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from kenya_dashboard.data.cube import ALL, SHARES, build_kpi_cube, by_region, kpi_cell
+from kenya_dashboard.data.mt import COMP_COL, CS_COL, SALES_COL, WS_COL
+
+BRANDS = ["Afrisense", "Fresh Fri", "Ushindi Bar"]
+REGIONS = ["Coast", "Eastern", "Nairobi", "Western"]
+
+
+def _rows(seed=0, n=300):
+    rng = np.random.default_rng(seed)
+    brand = rng.choice(BRANDS, n)
+    df = pd.DataFrame({
+        "Brand":     pd.Categorical(brand, categories=BRANDS + ["Unsold"]),
+        "Territory": pd.Categorical(rng.choice(REGIONS, n), categories=REGIONS),
+        WS_COL:      np.where(rng.random(n) < 0.1, np.nan, rng.uniform(0, 100, n)),
+        # Afrisense reports shares as fractions, the others in percent
+        CS_COL:      np.where(brand == "Afrisense", rng.uniform(0, 0.6, n), rng.uniform(0, 60, n)),
+        COMP_COL:    np.where(brand == "Afrisense", rng.uniform(0, 1, n), rng.uniform(0, 100, n)),
+        SALES_COL:   rng.integers(0, 1000, n).astype(float),
+    })
+    # a cell without rows
+    return df[~((df["Brand"] == "Fresh Fri") & (df["Territory"] == "Western"))]
+
+
+def _percent(s):
+    return (s * 100 if s.max() <= 1 else s).round(2)
+
+
+def _filtered(df, brand, region):
+    keep = pd.Series(True, index=df.index)
+    if brand != ALL:
+        keep &= df["Brand"] == brand
+    if region != ALL:
+        keep &= df["Territory"] == region
+    return df[keep]
+
+
+@pytest.mark.parametrize("brand", [ALL, *BRANDS])
+@pytest.mark.parametrize("region", [ALL, *REGIONS])
+def test_kpi_cell_matches_filtered_rows(brand, region):
+    df = _rows()
+    rows = _filtered(df, brand, region)
+    cell = kpi_cell(build_kpi_cube(df, "Territory"), brand, region)
+    if rows.empty:
+        assert cell.isna().all()
+        return
+    assert cell[WS_COL] == pytest.approx(rows[WS_COL].mean())
+    assert cell[SALES_COL] == pytest.approx(rows[SALES_COL].sum())
+    for c in SHARES:
+        assert cell[c] == pytest.approx(_percent(rows[c]).mean())
+
+
+@pytest.mark.parametrize("brand", [ALL, *BRANDS])
+def test_by_region_matches_groupby(brand):
+    df = _rows(seed=1)
+    rows = _filtered(df, brand, ALL)
+    expected = (rows.groupby("Territory", observed=True)
+                .agg({WS_COL: "mean", CS_COL: "mean", COMP_COL: "mean", SALES_COL: "sum"}))
+    for c in SHARES:
+        expected[c] = _percent(expected[c])
+    got = by_region(build_kpi_cube(df, "Territory"), brand).set_index("Territory")
+    pd.testing.assert_frame_equal(got[expected.columns], expected,
+                                  check_categorical=False, check_index_type=False)
+
+
+def test_unknown_brand_gives_empty_views():
+    cube = build_kpi_cube(_rows(), "Territory")
+    assert kpi_cell(cube, "Unsold").isna().all()
+    empty = by_region(cube, "Unsold")
+    assert empty.empty and "Territory" in empty.columns
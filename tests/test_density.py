@@ -0,0 +1,53 @@
+"""Hexagonal binning of the density layer."""
+import numpy as np
+import pytest
+
+from kenya_dashboard.density import CELL_PX, cell_size_for_zoom, hexbin
+
+
+def _points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-4.7, 4.6, n), rng.uniform(34.0, 41.8, n)
+
+
+def _centres(q, r, size):
+    return size * 1.5 * r, size * np.sqrt(3) * (q + r / 2)
+
+
+def test_cell_size_for_zoom():
+    # 256 px span 360° at zoom 0, and every zoom level halves a pixel
+    assert cell_size_for_zoom(0) == pytest.approx(CELL_PX * 360 / 256)
+    assert cell_size_for_zoom(6) == pytest.approx(cell_size_for_zoom(5) / 2)
+    assert cell_size_for_zoom(5, cell_px=8) == pytest.approx(2 * cell_size_for_zoom(5))
+
+
+@pytest.mark.parametrize("zoom", [5, 7.5, 10])
+def test_counts_sum_to_points(zoom):
+    lat, lon = _points(20_000)
+    cells = hexbin(lat, lon, cell_size_for_zoom(zoom))
+    assert cells["Weight"].sum() == len(lat)
+    assert (cells["Weight"] > 0).all()
+    assert not cells.duplicated(["Latitude", "Longitude"]).any()
+
+
+def test_weights_are_summed():
+    lat, lon = _points(5_000, seed=1)
+    w = np.random.default_rng(2).uniform(0, 10, len(lat))
+    cells = hexbin(lat, lon, 0.05, weight=w)
+    assert cells["Weight"].sum() == pytest.approx(w.sum())
+
+
+def test_each_point_lands_in_its_nearest_hexagon():
+    size = 0.1
+    lat, lon = _points(500, seed=3)
+    for y, x in zip(lat, lon):
+        (cy, cx), = hexbin([y], [x], size)[["Latitude", "Longitude"]].to_numpy()
+        # the centre of a hexagon of radius ``size`` is at most ``size`` away …
+        assert np.hypot(y - cy, x - cx) <= size + 1e-12
+        # … and no neighbouring centre is closer
+        q = round((np.sqrt(3) / 3 * cx - cy / 3) / size)
+        r = round(2 / 3 * cy / size)
+        assert _centres(q, r, size) == pytest.approx((cy, cx))
+        for dq, dr in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1)]:
+            ny, nx = _centres(q + dq, r + dr, size)
+            assert np.hypot(y - ny, x - nx) >= np.hypot(y - cy, x - cx) - 1e-12
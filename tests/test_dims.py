@@ -0,0 +1,48 @@
+"""Entity registry built on a cold start (no ``.snapshots/`` yet)."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# SNAPSHOT_DIR is read at import time, hence a fresh interpreter
+COLD_START = """
+from kenya_dashboard.data import load_gt, load_mt, load_rtm_monthly
+from kenya_dashboard.data.dims import load_dimensions
+
+dims = load_dimensions()
+assert {"county", "territory", "brand"} <= set(dims), sorted(dims)
+assert len(load_gt()) and len(load_mt()) and len(load_rtm_monthly())
+"""
+
+# one dimension per entity, whatever case a column spells it in
+SHARED_IDS = """
+from kenya_dashboard.data import entity_id, load_gt, load_rtm_monthly, load_sku_gt
+
+gt, rtm, sku = load_gt(), load_rtm_monthly(), load_sku_gt()
+brand = gt["Brand"].cat.categories.get_loc("Afrisense")
+assert rtm["BRAND"].cat.categories[brand] == "AFRISENSE"
+assert entity_id("brand", "AFRISENSE") == brand
+assert entity_id("territory", "NAIROBI") == gt["Territory"].cat.categories.get_loc("Nairobi")
+assert "NAN" not in sku["CLUSTER"].cat.categories
+assert sku["CLUSTER"].isna().sum() == gt["SKU_CLUSTER"].isna().sum()
+"""
+
+
+def _run(script, snapshots):
+    env = dict(os.environ, KENYA_SNAPSHOT_DIR=str(snapshots), PYTHONPATH=str(ROOT))
+    # unknown names fall back to a frame-local dictionary with a RuntimeWarning
+    return subprocess.run([sys.executable, "-W", "error::RuntimeWarning", "-c", script],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def test_dimensions_from_empty_snapshot_dir(tmp_path):
+    run = _run(COLD_START, tmp_path / "snapshots")
+    assert run.returncode == 0, run.stderr[-2000:]
+    assert any((tmp_path / "snapshots").glob("dimensions*"))
+
+
+def test_upper_case_columns_share_entity_ids(tmp_path):
+    run = _run(SHARED_IDS, tmp_path / "snapshots")
+    assert run.returncode == 0, run.stderr[-2000:]
@@ -0,0 +1,55 @@
+"""Byte-bounded LRU of serialised figures."""
+import plotly.graph_objects as go
+
+from kenya_dashboard.figcache import FigureCache, figure
+
+
+def test_lru_is_bounded_by_bytes():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"             # "b" is now least recently used
+    cache.put("c", b"cccc")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (b"aaaa", None, b"cccc")
+    assert (len(cache), cache.size) == (2, 8)
+
+
+def test_replacing_an_entry_updates_the_size():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aaaaaaaa")
+    assert (len(cache), cache.size) == (1, 8)
+    cache.put("b", b"bbbbbb")                    # evicts the bigger "a"
+    assert cache.get("a") is None and cache.size == 6
+
+
+def test_oversized_entries_are_not_cached():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    assert cache.get("a") == b"aaaa"
+
+
+def test_figure_builds_once_and_hands_out_copies():
+    cache, calls = FigureCache(1 << 20), []
+
+    def build(brand, region):
+        calls.append((brand, region))
+        return go.Figure(go.Bar(x=[brand], y=[len(region)]))
+
+    first = figure("main", "bars", build, "Afrisense", "Coast", cache=cache)
+    again = figure("main", "bars", build, "Afrisense", "Coast", cache=cache)
+    other = figure("main", "bars", build, "Afrisense", "Nairobi", cache=cache)
+    assert calls == [("Afrisense", "Coast"), ("Afrisense", "Nairobi")]
+    assert again.to_dict() == first.to_dict() and other.to_dict() != first.to_dict()
+
+    again.update_layout(title="mutated")
+    assert figure("main", "bars", build, "Afrisense", "Coast", cache=cache).layout.title.text is None
+
+
+def test_empty_results_are_not_cached():
+    cache, calls = FigureCache(1 << 20), []
+    for _ in range(2):
+        assert figure("main", "bars", lambda: calls.append(1), cache=cache) is None
+    assert calls == [1, 1] and len(cache) == 0
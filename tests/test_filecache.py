@@ -0,0 +1,63 @@
+"""Byte-bounded, mtime-keyed LRU of file contents."""
+import os
+
+from kenya_dashboard.filecache import DEFERRED, FileCache, download_data
+
+
+def _file(path, data, mtime_ns=None):
+    path.write_bytes(data)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_hits_share_one_object(tmp_path):
+    cache = FileCache(max_bytes=100)
+    path = _file(tmp_path / "a.pdf", b"report")
+    first = cache.get(path)
+    assert first == b"report"
+    assert cache.get(str(path)) is first
+    assert cache.size == 6
+
+
+def test_lru_is_bounded_by_bytes(tmp_path):
+    cache = FileCache(max_bytes=10)
+    a, b, c = (_file(tmp_path / f"{n}.pdf", n.encode() * 4) for n in "abc")
+    first_a = cache.get(a)
+    cache.get(b)
+    cache.get(a)                                 # "b" is now least recently used
+    cache.get(c)
+    assert cache.size == 8
+    assert cache.get(a) is first_a               # still cached
+    assert cache.get(b) == b"bbbb"               # read again, evicting "c"
+    assert cache.size == 8
+
+
+def test_edited_file_replaces_its_stale_version(tmp_path):
+    cache = FileCache(max_bytes=100)
+    path = _file(tmp_path / "a.pdf", b"v1", mtime_ns=1_000_000_000)
+    assert cache.get(path) == b"v1"
+    # same size, new mtime: a rebuilt report
+    _file(path, b"v2", mtime_ns=2_000_000_000)
+    assert cache.get(path) == b"v2"
+    assert cache.size == 2                       # "v1" was dropped
+
+
+def test_files_over_budget_are_read_but_not_cached(tmp_path):
+    cache = FileCache(max_bytes=4)
+    small = _file(tmp_path / "small.pdf", b"ok")
+    big = _file(tmp_path / "big.pdf", b"too large")
+    cache.get(small)
+    assert cache.get(big) == b"too large"
+    assert cache.get(big) is not cache.get(big)
+    assert cache.size == 2
+
+
+def test_download_data(tmp_path):
+    cache = FileCache(max_bytes=100)
+    path = _file(tmp_path / "a.pdf", b"report")
+    data = download_data(path, cache)
+    # deferred downloads read nothing until clicked
+    assert cache.size == (0 if DEFERRED else 6)
+    assert (data() if DEFERRED else data) == b"report"
+    assert cache.size == 6
@@ -0,0 +1,137 @@
+"""Simplification and shape statistics of the county / territory outlines."""
+import numpy as np
+import pytest
+
+from kenya_dashboard.geometry import (R_AUTHALIC, _seg_dist2, resolution_for_zoom,
+                                      shape_stats, shape_table, simplify)
+
+TOL = 0.01
+
+
+def _feature(key, ring):
+    return {"type": "Feature", "properties": {"KEY": key},
+            "geometry": {"type": "Polygon", "coordinates": [[list(p) for p in ring]]}}
+
+
+def _neighbours(seed=0):
+    """Two unit squares side by side, sharing a finely surveyed, wiggly border."""
+    rng = np.random.default_rng(seed)
+    ys = np.linspace(0, 1, 201)[1:-1]
+    border = [(round(1 + 0.02 * np.sin(9 * y) + rng.normal(0, 0.002), 6), round(y, 6))
+              for y in ys]
+    west = [(0, 0), (1, 0), *border, (1, 1), (0, 1), (0, 0)]
+    east = [(1, 0), (2, 0), (2, 1), (1, 1), *border[::-1], (1, 0)]
+    fc = {"type": "FeatureCollection", "features": [_feature("W", west), _feature("E", east)]}
+    return fc, [(1, 0), *border, (1, 1)]
+
+
+def _ring(feature):
+    return [tuple(p) for p in feature["geometry"]["coordinates"][0]]
+
+
+def _shared(ring):
+    """Vertices of ``ring`` on the shared border, from south to north."""
+    inner = [p for p in ring if 0.5 < p[0] < 1.5 and 0 < p[1] < 1]
+    return sorted(set(inner), key=lambda p: p[1])
+
+
+def test_shared_border_is_simplified_once():
+    fc, border = _neighbours()
+    west, east = (_ring(f) for f in simplify(fc, TOL, 6)["features"])
+
+    # both neighbours keep exactly the same border vertices: no gaps, no overlaps
+    assert _shared(west) == _shared(east)
+    kept = [(1, 0), *_shared(west), (1, 1)]
+    assert 2 < len(kept) < len(border) / 4
+    # and every surveyed point stays within the tolerance of the simplified border
+    for p in border:
+        assert min(_seg_dist2(p, a, b) for a, b in zip(kept, kept[1:])) <= TOL ** 2 + 1e-12
+
+
+def test_rings_stay_closed_and_corners_survive():
+    fc, _ = _neighbours(seed=1)
+    for feature in simplify(fc, TOL, 6)["features"]:
+        ring = _ring(feature)
+        assert ring[0] == ring[-1]
+        assert {(1.0, 0.0), (1.0, 1.0)} <= set(ring)       # junctions are never dropped
+
+
+def test_input_is_not_modified_and_properties_are_kept():
+    fc, _ = _neighbours()
+    before = _ring(fc["features"][0])
+    out = simplify(fc, TOL, 6)
+    assert _ring(fc["features"][0]) == before
+    assert [f["properties"] for f in out["features"]] == [{"KEY": "W"}, {"KEY": "E"}]
+
+
+def test_tiny_island_is_never_lost():
+    island = [(5, 5), (5.001, 5), (5.001, 5.001), (5, 5.001), (5, 5)]
+    fc = {"type": "FeatureCollection", "features": [_feature("I", island)]}
+    ring = _ring(simplify(fc, TOL, 4)["features"][0])
+    assert len(ring) >= 4 and ring[0] == ring[-1]
+
+
+def test_coordinates_are_quantised():
+    fc, _ = _neighbours()
+    for x, y in _ring(simplify(fc, TOL, 3)["features"][0]):
+        assert round(x, 3) == x and round(y, 3) == y
+
+
+@pytest.mark.parametrize("zoom, level", [(None, None), (4, "z5"), (5.75, "z5"),
+                                         (6, "z6"), (8.5, "z8"), (9, None)])
+def test_resolution_for_zoom(zoom, level):
+    assert resolution_for_zoom(zoom) == level
+
+
+# ── centroids / extents / areas ────────────────────────────────────
+def _box(lon0, lat0, lon1, lat1):
+    return [[lon0, lat0], [lon1, lat0], [lon1, lat1], [lon0, lat1], [lon0, lat0]]
+
+
+def _sphere_area(lon0, lat0, lon1, lat1):
+    """km² of a lon/lat box on the authalic sphere."""
+    return (R_AUTHALIC ** 2 * np.radians(lon1 - lon0)
+            * (np.sin(np.radians(lat1)) - np.sin(np.radians(lat0))) / 1e6)
+
+
+def test_shape_stats_of_a_box():
+    stats = shape_stats({"type": "Polygon", "coordinates": [_box(36, -1, 38, 1)]})
+    # symmetric about the equator in Mercator too
+    assert stats["lon"] == pytest.approx(37) and stats["lat"] == pytest.approx(0, abs=1e-9)
+    assert [stats[c] for c in ("min_lon", "min_lat", "max_lon", "max_lat")] == [36, -1, 38, 1]
+    assert stats["area_km2"] == pytest.approx(_sphere_area(36, -1, 38, 1), rel=1e-9)
+
+
+def test_shape_stats_ignore_winding_and_subtract_holes():
+    outer, hole = _box(36, -1, 38, 1), _box(36.5, -0.5, 37.5, 0.5)
+    ccw = shape_stats({"type": "Polygon", "coordinates": [outer, hole[::-1]]})
+    cw = shape_stats({"type": "Polygon", "coordinates": [outer[::-1], hole]})
+    assert ccw == pytest.approx(cw)
+    assert ccw["area_km2"] == pytest.approx(
+        _sphere_area(36, -1, 38, 1) - _sphere_area(36.5, -0.5, 37.5, 0.5), rel=1e-9)
+    assert (ccw["lon"], ccw["lat"]) == pytest.approx((37, 0), abs=1e-9)
+    # an open ring is closed first
+    assert shape_stats({"type": "Polygon", "coordinates": [outer[:-1]]}) == pytest.approx(
+        shape_stats({"type": "Polygon", "coordinates": [outer]}))
+
+
+def test_shape_stats_centroid_is_planar_in_mercator():
+    # north of the equator a box's Mercator centroid lies north of its mid-latitude
+    stats = shape_stats({"type": "Polygon", "coordinates": [_box(36, 0, 38, 10)]})
+    assert 5 < stats["lat"] < 5.2
+    # two equal boxes meeting at a corner: centroid at that corner
+    multi = shape_stats({"type": "MultiPolygon",
+                         "coordinates": [[_box(36, -1, 37, 0)], [_box(37, 0, 38, 1)]]})
+    assert (multi["lon"], multi["lat"]) == pytest.approx((37, 0), abs=1e-9)
+    assert (multi["min_lon"], multi["max_lat"]) == (36, 1)
+
+
+def test_shape_table_merges_features_per_key():
+    fc = {"type": "FeatureCollection", "features": [
+        _feature("B", _box(36, -1, 37, 0)), _feature("A", _box(40, 2, 41, 3)),
+        _feature("B", _box(37, 0, 38, 1)),
+        {"type": "Feature", "properties": {"KEY": "C"}, "geometry": None}]}
+    rows = shape_table(fc, "KEY")
+    assert [r["KEY"] for r in rows] == ["A", "B"]
+    assert rows[1]["area_km2"] == pytest.approx(2 * _sphere_area(36, -1, 37, 0), rel=1e-6)
+    assert (rows[1]["lon"], rows[1]["lat"]) == pytest.approx((37, 0), abs=1e-9)
@@ -0,0 +1,13 @@
+"""Report output files written by concurrent sessions / pool workers."""
+from concurrent.futures import ThreadPoolExecutor
+
+from kenya_dashboard.report_builder import _write
+
+
+def test_concurrent_writes_to_one_report(tmp_path):
+    path = tmp_path / "USHINDI BAR COAST.pdf"
+    payloads = [bytes([n]) * 4096 for n in range(8)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda data: [_write(path, data) for _ in range(25)], payloads))
+    assert path.read_bytes() in payloads
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
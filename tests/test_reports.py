@@ -0,0 +1,56 @@
+"""Brand markdown reports parsed into index records."""
+from pathlib import Path
+
+import pytest
+
+from kenya_dashboard.data.paths import MD_DIR
+from kenya_dashboard.data.reports import parse_report
+
+FIXTURE = Path(__file__).parent / "fixtures" / "brand_report.md"
+
+
+@pytest.fixture(scope="module")
+def record():
+    return parse_report(FIXTURE.read_text("utf-8"))
+
+
+def test_summary_and_metrics(record):
+    assert record["summary"].startswith("SAMPLE Laundry Bar has room to grow")
+    assert "2. Drive trial" in record["summary"]
+    assert "Territory Sections" not in record["summary"]
+    assert record["metrics"] == {
+        "columns": ["Metric", "CENTRAL", "COAST", "LAKE"],
+        "rows": [["White Space Score", "58.47", "47.45", "54.97"],
+                 ["Client Share", "3.30%", "11.80%", "n/a"]],
+    }
+
+
+def test_territory_sections(record):
+    # only upper-case headings are territories; a repeated heading is ignored
+    assert list(record["territories"]) == ["CENTRAL", "COAST", "LAKE"]
+    central, coast, lake = record["territories"].values()
+
+    assert (central["white_space"], central["client_share"]) == ("58.47 %", "3.30 %")
+    assert central["insights"] == "High white space, low share. Undersupplied vs. demand."
+    assert central["text"].startswith("### CENTRAL\n")
+    assert central["text"].endswith("Undersupplied   vs. demand.")
+
+    assert (coast["white_space"], coast["client_share"]) == ("47.45 %", "11.80 %")
+    assert "duplicate" not in coast["text"]
+    assert (lake["white_space"], lake["client_share"], lake["insights"]) == ("54.97 %", None, "")
+
+
+def test_text_without_sections():
+    assert parse_report("# Just a title\n") == {
+        "summary": "", "metrics": {"columns": [], "rows": []}, "territories": {}}
+
+
+@pytest.mark.skipif(not any(MD_DIR.glob("*.md")), reason="no brand reports bundled")
+def test_bundled_reports_agree_with_their_summary_table():
+    for path in MD_DIR.glob("*.md"):
+        record = parse_report(path.read_text("utf-8"))
+        columns, rows = record["metrics"]["columns"], record["metrics"]["rows"]
+        white_space = next(r for r in rows if r[0] == "White Space Score")
+        assert set(record["territories"]) == set(columns[1:]), path.name
+        for territory, score in zip(columns[1:], white_space[1:]):
+            assert record["territories"][territory]["white_space"] == f"{score} %"
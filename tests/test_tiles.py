@@ -0,0 +1,86 @@
+"""Vector tiles: what ``TileSet`` encodes decodes back to the input features."""
+import mapbox_vector_tile
+import pytest
+
+from kenya_dashboard.tiles import EXTENT, TileLayers, TileSet, write_tiles
+
+# a 2°-wide square around (0°, 0°) and a point north-east of it
+SQUARE = {"type": "Feature", "properties": {"name": "square", "area": 4},
+          "geometry": {"type": "Polygon",
+                       "coordinates": [[[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]]]}}
+OUTLET = {"type": "Feature", "properties": {"Distributor": "ACME"},
+          "geometry": {"type": "Point", "coordinates": [2, 2]}}
+
+
+def _tiles(**minzoom):
+    return TileSet({"areas": [SQUARE], "outlets": [OUTLET]}, minzoom=minzoom)
+
+
+def _decode(data):
+    return mapbox_vector_tile.decode(data, default_options={"y_coord_down": True})
+
+
+def test_world_tile_round_trip():
+    layers = _decode(_tiles().tile(0, 0, 0))
+    assert set(layers) == {"areas", "outlets"}
+    assert all(layer["extent"] == EXTENT for layer in layers.values())
+
+    (area,) = layers["areas"]["features"]
+    assert area["properties"] == {"name": "square", "area": 4}
+    assert area["geometry"]["type"] == "Polygon"
+    xs, ys = zip(*area["geometry"]["coordinates"][0])
+    # ±1° is ±11.4 units of the 4096-wide world tile, around its centre
+    assert min(xs) == min(ys) == EXTENT // 2 - 11
+    assert max(xs) == max(ys) == EXTENT // 2 + 11
+
+    (outlet,) = layers["outlets"]["features"]
+    assert outlet["properties"] == {"Distributor": "ACME"}
+    assert outlet["geometry"]["coordinates"] == [2071, 2025]     # y grows southwards
+
+
+def test_features_are_clipped_to_the_buffered_tile():
+    # z3 tile 4/4 starts at (0°, 0°) and is 45° wide: the square sticks out
+    # of its NW corner, the point lies 2° north, beyond the 0.7° buffer
+    layers = _decode(_tiles().tile(3, 4, 4))
+    assert set(layers) == {"areas"}
+    xs, ys = zip(*layers["areas"]["features"][0]["geometry"]["coordinates"][0])
+    assert min(xs) == min(ys) == -64                              # the BUFFER margin
+    assert max(xs) == max(ys) == 91
+
+    layers = _decode(_tiles().tile(3, 4, 3))
+    assert layers["outlets"]["features"][0]["geometry"]["coordinates"] == [182, 3914]
+
+
+def test_empty_tiles_and_layer_minzoom():
+    tiles = _tiles(outlets=3)
+    assert tiles.tile(3, 0, 0) == tiles.tile(4, 15, 0) == b""
+    assert "outlets" not in _decode(tiles.tile(2, 2, 1))
+    assert "outlets" in _decode(tiles.tile(3, 4, 3))
+    with pytest.raises(ValueError):
+        tiles.tile(2, 4, 0)
+
+
+def test_only_tiles_with_data_are_enumerated():
+    listed = list(_tiles().tiles_for(max_zoom=4))
+    assert all(_tiles().tile(*t) for t in listed)
+    assert len(listed) == 1 + 4 + 4 + 4 + 4
+    assert {t for t in listed if t[0] == 4} == {(4, 7, 7), (4, 7, 8), (4, 8, 7), (4, 8, 8)}
+    assert list(_tiles().tiles_for(max_zoom=4, min_zoom=4)) == listed[-4:]
+
+
+def test_written_tiles_feed_the_plotly_layers(tmp_path):
+    tiles = _tiles(outlets=2)
+    n = write_tiles(tiles, tmp_path, max_zoom=2)
+    assert n == len(list(tmp_path.glob(f"{tiles.version}/*/*/*.pbf"))) == 9
+    assert "outlets" in _decode((tmp_path / tiles.version / "2/2/1.pbf").read_bytes())
+
+    layers = TileLayers.load("https://maps.example/tiles/", tmp_path)
+    layer = layers.layer("outlets", type="circle", circle=dict(radius=4))
+    assert layer["source"] == [f"https://maps.example/tiles/{tiles.version}/{{z}}/{{x}}/{{y}}.pbf"]
+    assert (layer["sourcelayer"], layer["minzoom"], layer["maxzoom"]) == ("outlets", 2, 3)
+    with pytest.raises(KeyError):
+        layers.layer("wards")
+
+    # a rebuild replaces the previous version
+    write_tiles(TileSet({"areas": [SQUARE]}), tmp_path, max_zoom=1)
+    assert not (tmp_path / tiles.version).exists()
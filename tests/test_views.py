@@ -0,0 +1,50 @@
+"""``select`` / ``mask`` against plain pandas boolean indexing."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from kenya_dashboard.data.views import mask, select
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    brands = rng.choice(["Afrisense", "Fresh Fri", "Ushindi Bar"], 200)
+    return pd.DataFrame({
+        "Brand":     pd.Categorical(brands, categories=["Afrisense", "Fresh Fri",
+                                                        "Popco", "Ushindi Bar"]),
+        "Territory": rng.choice(["Coast", "Nairobi", "Western"], 200),
+        "Month":     rng.integers(1, 13, 200),
+        "Volume":    rng.uniform(0, 100, 200),
+    })
+
+
+def test_no_active_filter_returns_the_frame_itself(df):
+    assert mask(df) is None
+    assert mask(df, Brand="All", Territory="ALL", Month=None) is None
+    assert select(df, Brand="All", Territory=None) is df
+
+
+@pytest.mark.parametrize("filters", [
+    {"Brand": "Fresh Fri"},
+    {"Territory": "Coast"},
+    {"Brand": "Ushindi Bar", "Territory": "Nairobi"},
+    {"Brand": "Afrisense", "Territory": "All", "Month": 3},
+    {"Brand": "Popco"},                          # category without rows
+    {"Brand": "Unknown"},                        # not even a category
+    {"Territory": "Rift Valley", "Month": 3},
+])
+def test_select_matches_boolean_indexing(df, filters):
+    keep = pd.Series(True, index=df.index)
+    for col, value in filters.items():
+        if value not in ("All", "ALL", None):
+            keep &= df[col] == value
+    np.testing.assert_array_equal(mask(df, **filters), keep.to_numpy())
+    pd.testing.assert_frame_equal(select(df, **filters), df[keep])
+
+
+def test_missing_values_never_match(df):
+    df.loc[:9, "Brand"] = np.nan
+    df.loc[:9, "Territory"] = None
+    assert not mask(df, Brand="Afrisense")[:10].any()
+    assert not mask(df, Territory="Coast")[:10].any()